@@ -2,8 +2,16 @@
 """Debug script to simulate the exact command line parsing."""
 
 import os
+import re
 import sys
 
+# Single hashtag pattern: task references are kept in the content, directive
+# prefixes (#due:, #recur:, #depends:) are dropped, anything else is a label.
+# Task ids are ASCII so the reference branch matches ASCII-only; labels keep
+# Unicode \w to match handle_direct_task.
+_HASHTAG_OR_REF_RE = re.compile(r"#(?:(?P<ref>(?a:task\d+|ref:task\d+))|(?P<directive>(?:due|recur|depends)(?=:))|(?P<label>\w+))")
+_WHITESPACE_RE = re.compile(r"\s+")
+
 # Add the fincli module to the path
 sys.path.insert(0, "/Users/cpettet/git/chasemp/fin-cli")
 
@@ -17,32 +25,37 @@ print(f"Simulating command: fin {' '.join(repr(arg) for arg in test_args)}")
 print(f"args = {test_args}")
 
 # Simulate handle_direct_task logic
-task_content = []
 labels = []
 source = "cli"
-i = 0
 
-while i < len(test_args):
-    if test_args[i] == "--label" or test_args[i] == "-l":
-        if i + 1 < len(test_args):
-            labels.append(test_args[i + 1])
-            i += 2
-        else:
-            print("Error: --label requires a value")
-            sys.exit(1)
-    elif test_args[i] == "--source":
-        if i + 1 < len(test_args):
-            source = test_args[i + 1]
-            i += 2
+if not any(arg.startswith("-") for arg in test_args):
+    # Common case (fin "do the thing" #tag): no options, everything is content
+    task_content = list(test_args)
+else:
+    task_content = []
+    i = 0
+
+    while i < len(test_args):
+        if test_args[i] == "--label" or test_args[i] == "-l":
+            if i + 1 < len(test_args):
+                labels.append(test_args[i + 1])
+                i += 2
+            else:
+                print("Error: --label requires a value")
+                sys.exit(1)
+        elif test_args[i] == "--source":
+            if i + 1 < len(test_args):
+                source = test_args[i + 1]
+                i += 2
+            else:
+                print("Error: --source requires a value")
+                sys.exit(1)
+        elif test_args[i].startswith("-"):
+            # Skip other options for now
+            i += 1
         else:
-            print("Error: --source requires a value")
-            sys.exit(1)
-    elif test_args[i].startswith("-"):
-        # Skip other options for now
-        i += 1
-    else:
-        task_content.append(test_args[i])
-        i += 1
+            task_content.append(test_args[i])
+            i += 1
 
 print(f"task_content after parsing: {task_content}")
 
@@ -53,22 +66,26 @@ if not task_content:
 content = " ".join(task_content)
 print(f"content after joining: {repr(content)}")
 
-# Extract hashtags
-import re
+# Extract hashtags and remove them from content in one pass
+hashtags = []
+
+
+def _strip_hashtag(match):
+    if match.group("ref"):
+        return match.group(0)  # Keep task references
+    if match.group("label"):
+        hashtags.append(match.group("label"))
+    return ""
+
 
-hashtags = re.findall(r"#(?!task\d+|ref:task\d+|due:|recur:|depends:)(\w+)", content)
+content = _HASHTAG_OR_REF_RE.sub(_strip_hashtag, content)
 print(f"hashtags found: {hashtags}")
 
-for hashtag in hashtags:
-    labels.append(hashtag)
+labels.extend(hashtags)
 
 print(f"labels after adding hashtags: {labels}")
 
-# Remove hashtags from content
-content = re.sub(r"#(task\d+|ref:task\d+)", r"__TASK_REF_\1__", content)
-content = re.sub(r"#\w+", "", content)
-content = re.sub(r"__TASK_REF_(task\d+|ref:task\d+)__", r"#\1", content)
-content = re.sub(r"\s+", " ", content).strip()
+content = _WHITESPACE_RE.sub(" ", content).strip()
 
 print(f"final content: {repr(content)}")
 print(f"final labels: {labels}")
@@ -4,375 +4,446 @@ Analytics module for FinCLI
 Provides task statistics, overdue analysis, and digest generation.
 """
 
+import csv
 from datetime import date, datetime, timedelta
+import io
+import itertools
+from string import Template
+import time
 from typing import Any, Dict, List
 
 from .db import DatabaseManager
 from .tasks import TaskManager
+from .utils import parse_timestamp
+
+# CSV columns for the daily digest
+_CSV_HEADER_DAILY = (
+    "Date",
+    "Period",
+    "Total Tasks",
+    "Open Tasks",
+    "Completed Tasks",
+    "Today Created",
+    "Today Completed",
+    "Overdue 3 Days",
+    "Due Today",
+    "Overdue Due Dates",
+    "Recurring Tasks",
+)
+
+# Shared by the weekly digest and export_csv
+_CSV_HEADER_PERIOD = (
+    "Date",
+    "Period",
+    "Total Tasks",
+    "Open Tasks",
+    "Completed Tasks",
+    "Today Created",
+    "Today Completed",
+    "Overdue 3 Days",
+    "Overdue 7 Days",
+    "Overdue 30 Days",
+    "Recurring Tasks",
+)
+
+# Stats window and overdue bucket each digest period reports on
+_DIGEST_WINDOWS = {
+    "daily": ("today", "3_days"),
+    "weekly": ("this_week", "7_days"),
+    "monthly": ("this_month", "30_days"),
+}
+
+# Digest bodies keyed by (period, format), compiled once at import time.
+# CSV digests are built separately by AnalyticsManager._generate_csv_digest.
+_DIGEST_TEMPLATES = {
+    ("daily", "text"): Template(
+        """📊 Daily Digest - $date
+
+✅ $completed tasks completed today
+📝 $created new tasks added today
+🕗 $overdue tasks overdue > 3 days
+📅 $due_today tasks due today
+⏰ $due_overdue tasks overdue (due dates)
+🔁 $recurring recurring tasks flagged
+
+Top labels today:
+$labels"""
+    ),
+    ("daily", "markdown"): Template(
+        """# Daily Digest - $date
+
+## Summary
+- ✅ **$completed** tasks completed today
+- 📝 **$created** new tasks added today
+- 🕗 **$overdue** tasks overdue > 3 days
+- 📅 **$due_today** tasks due today
+- ⏰ **$due_overdue** tasks overdue (due dates)
+- 🔁 **$recurring** recurring tasks flagged
+
+## Top Labels
+$labels"""
+    ),
+    ("weekly", "text"): Template(
+        """📊 Weekly Digest - Week ending $date
+
+✅ $completed tasks completed this week
+📝 $created new tasks added this week
+🕗 $overdue tasks still open > 7 days
+📅 $due_today tasks due today
+⏰ $due_overdue tasks overdue (due dates)
+🔁 $recurring recurring tasks flagged as overdue
+
+Top labels this week:
+$labels"""
+    ),
+    ("weekly", "markdown"): Template(
+        """# Weekly Digest - Week ending $date
+
+## Summary
+- ✅ **$completed** tasks completed this week
+- 📝 **$created** new tasks added this week
+- 🕗 **$overdue** tasks still open > 7 days
+- 📅 **$due_today** tasks due today
+- ⏰ **$due_overdue** tasks overdue (due dates)
+- 🔁 **$recurring** recurring tasks flagged as overdue
+
+## Top Labels
+$labels"""
+    ),
+    ("monthly", "text"): Template(
+        """📊 Monthly Digest - $month
+
+✅ $completed tasks completed this month
+📝 $created new tasks added this month
+🕗 $overdue tasks still open > 30 days
+📅 $due_today tasks due today
+⏰ $due_overdue tasks overdue (due dates)
+🔁 $recurring recurring tasks flagged as overdue
+
+Top labels this month:
+$labels"""
+    ),
+    ("monthly", "markdown"): Template(
+        """# Monthly Digest - $month
+
+## Summary
+- ✅ **$completed** tasks completed this month
+- 📝 **$created** new tasks added this month
+- 🕗 **$overdue** tasks still open > 30 days
+- 📅 **$due_today** tasks due today
+- ⏰ **$due_overdue** tasks overdue (due dates)
+- 🔁 **$recurring** recurring tasks flagged as overdue
+
+## Top Labels
+$labels"""
+    ),
+    ("monthly", "html"): Template(
+        """<html>
+<head>
+    <title>Monthly Digest - $month</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        .summary { background: #f5f5f5; padding: 15px; border-radius: 5px; }
+        .label { color: #666; }
+    </style>
+</head>
+<body>
+    <h1>Monthly Digest - $month</h1>
+    <div class="summary">
+        <h2>Summary</h2>
+        <ul>
+            <li>✅ <strong>$completed</strong> tasks completed this month</li>
+            <li>📝 <strong>$created</strong> new tasks added this month</li>
+            <li>🕗 <strong>$overdue</strong> tasks still open > 30 days</li>
+            <li>🔁 <strong>$recurring</strong> recurring tasks flagged as overdue</li>
+        </ul>
+    </div>
+    <h2>Top Labels</h2>
+    $labels
+</body>
+</html>"""
+    ),
+}
 
 
 class AnalyticsManager:
     """Manages task analytics and digest generation."""
 
+    # Labels that mark a task as recurring
+    RECURRING_LABELS = frozenset(
+        {
+            "recurring",
+            "repeat",
+            "daily",
+            "weekly",
+            "monthly",
+            "routine",
+        }
+    )
+
+    # Seconds a get_task_counts result is reused while the database is unchanged;
+    # bounded so "today"/"overdue" windows still roll over
+    COUNTS_CACHE_TTL = 60
+
+    # Ages in days after which an open task counts as overdue
+    OVERDUE_DAYS = (3, 7, 30)
+
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
         self.task_manager = TaskManager(db_manager)
+        self._counts_cache = None  # (cache key, monotonic time computed, stats)
 
     def get_task_counts(self, days_back: int = 30) -> Dict[str, Any]:
         """Get task counts for the specified period."""
-        cutoff_date = datetime.now() - timedelta(days=days_back)
-        cutoff_str = cutoff_date.strftime("%Y-%m-%d")
+        now = datetime.now()
+        cutoff_str = (now - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        today = now.date()
+        week_ago = today - timedelta(days=7)
+        month_ago = today - timedelta(days=30)
 
         with self.db_manager.get_connection() as conn:
+            # total_changes moves with our own writes and data_version with
+            # commits from other connections, so an unchanged key means unchanged data
+            cache_key = (days_back, today, conn.total_changes, conn.execute("PRAGMA data_version").fetchone()[0])
+            if self._counts_cache is not None:
+                cached_key, computed_at, cached_stats = self._counts_cache
+                if cached_key == cache_key and time.monotonic() - computed_at < self.COUNTS_CACHE_TTL:
+                    return cached_stats
+
             cursor = conn.cursor()
 
-            # Get all tasks from the period
+            # Roll the counts up in one pass. Timestamps start with "YYYY-MM-DD",
+            # so comparing that prefix compares calendar days.
             cursor.execute(
                 """
                 SELECT
-                    id, content, created_at, completed_at, labels, source, due_date
+                    COUNT(*),
+                    COALESCE(SUM(completed_at IS NULL), 0),
+                    COALESCE(SUM(substr(created_at, 1, 10) = :today), 0),
+                    COALESCE(SUM(substr(completed_at, 1, 10) = :today), 0),
+                    COALESCE(SUM(substr(created_at, 1, 10) >= :week_ago), 0),
+                    COALESCE(SUM(substr(completed_at, 1, 10) >= :week_ago), 0),
+                    COALESCE(SUM(substr(created_at, 1, 10) >= :month_ago), 0),
+                    COALESCE(SUM(substr(completed_at, 1, 10) >= :month_ago), 0),
+                    COALESCE(SUM(due_date IS NOT NULL AND due_date != ''), 0)
                 FROM tasks
-                WHERE created_at >= ?
-                ORDER BY created_at DESC
+                WHERE created_at >= :cutoff
+            """,
+                {
+                    "cutoff": cutoff_str,
+                    "today": today.isoformat(),
+                    "week_ago": week_ago.isoformat(),
+                    "month_ago": month_ago.isoformat(),
+                },
+            )
+            (
+                total_count,
+                open_count,
+                created_today,
+                completed_today,
+                created_week,
+                completed_week,
+                created_month,
+                completed_month,
+                with_due_date_count,
+            ) = cursor.fetchone()
+
+            cursor.execute(
+                """
+                SELECT lower(task_labels.label), COUNT(*)
+                FROM task_labels JOIN tasks ON tasks.id = task_labels.task_id
+                WHERE tasks.created_at >= ?
+                GROUP BY lower(task_labels.label)
+                ORDER BY COUNT(*) DESC, MAX(tasks.created_at) DESC, MAX(tasks.id) DESC
             """,
                 (cutoff_str,),
             )
+            by_label = dict(cursor)
+
+            # Only overdue open tasks and recurring-labelled tasks are needed as rows.
+            # The age flags compare timestamps as strings so the overdue rows come
+            # straight off the idx_tasks_open_created partial index.
+            overdue_params = {f"overdue_{days}": (now - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S") for days in self.OVERDUE_DAYS}
+            recurring_params = {f"recurring_{i}": label for i, label in enumerate(self.RECURRING_LABELS)}
+            overdue_flags = ", ".join(f"completed_at IS NULL AND created_at < :{key}" for key in overdue_params)
+            recurring_placeholders = ", ".join(f":{key}" for key in recurring_params)
+            cursor.execute(
+                f"""
+                SELECT
+                    id, created_at, completed_at, labels, due_date,
+                    id IN (SELECT task_id FROM task_labels WHERE lower(label) IN ({recurring_placeholders})) AS is_recurring,
+                    {overdue_flags}
+                FROM tasks
+                WHERE created_at >= :cutoff
+                AND ((completed_at IS NULL AND created_at < :overdue_{min(self.OVERDUE_DAYS)}) OR is_recurring)
+                ORDER BY created_at DESC
+            """,
+                {"cutoff": cutoff_str, **overdue_params, **recurring_params},
+            )
 
-            tasks = []
-            for row in cursor.fetchall():
-                tasks.append(
-                    {
-                        "id": row[0],
-                        "content": row[1],
-                        "created_at": row[2],
-                        "completed_at": row[3],
-                        "labels": row[4].split(",") if row[4] else [],
-                        "source": row[5],
-                        "due_date": row[6],
-                    }
-                )
-
-        # Calculate statistics
-        today = date.today()
-        week_ago = today - timedelta(days=7)
-        month_ago = today - timedelta(days=30)
+            overdue = {f"{days}_days": [] for days in self.OVERDUE_DAYS}
+            overdue_buckets = list(overdue.values())
+            recurring = []
+            for row in cursor:
+                task = self._row_to_task(row)
+                if row[5]:
+                    recurring.append(task)
+                for bucket, is_overdue in zip(overdue_buckets, row[6:]):
+                    if is_overdue:
+                        bucket.append(task)
+
+            # Due-date buckets: open tasks due on or before a week from today, served
+            # by the idx_tasks_open_due partial index. The GLOB skips malformed dates.
+            cursor.execute(
+                """
+                SELECT
+                    id, created_at, completed_at, labels, due_date,
+                    due_date < :today, due_date = :today
+                FROM tasks
+                WHERE completed_at IS NULL AND due_date IS NOT NULL
+                AND due_date <= :due_soon
+                AND due_date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+                AND created_at >= :cutoff
+                ORDER BY created_at DESC
+            """,
+                {
+                    "cutoff": cutoff_str,
+                    "today": today.isoformat(),
+                    "due_soon": (today + timedelta(days=7)).isoformat(),
+                },
+            )
+
+            due_overdue = []
+            due_soon = []
+            due_today = []
+            for row in cursor:
+                task = self._row_to_task(row)
+                if row[5]:
+                    due_overdue.append(task)
+                else:
+                    due_soon.append(task)
+                if row[6]:
+                    due_today.append(task)
 
         stats = {
-            "total_tasks": len(tasks),
-            "open_tasks": len([t for t in tasks if not t["completed_at"]]),
-            "completed_tasks": len([t for t in tasks if t["completed_at"]]),
+            "total_tasks": total_count,
+            "open_tasks": open_count,
+            "completed_tasks": total_count - open_count,
             "today": {
-                "created": len([t for t in tasks if self._parse_date(t["created_at"]).date() == today]),
-                "completed": len([t for t in tasks if t["completed_at"] and self._parse_date(t["completed_at"]).date() == today]),
+                "created": created_today,
+                "completed": completed_today,
             },
             "this_week": {
-                "created": len([t for t in tasks if self._parse_date(t["created_at"]).date() >= week_ago]),
-                "completed": len([t for t in tasks if t["completed_at"] and self._parse_date(t["completed_at"]).date() >= week_ago]),
+                "created": created_week,
+                "completed": completed_week,
             },
             "this_month": {
-                "created": len([t for t in tasks if self._parse_date(t["created_at"]).date() >= month_ago]),
-                "completed": len([t for t in tasks if t["completed_at"] and self._parse_date(t["completed_at"]).date() >= month_ago]),
-            },
-            "overdue": {
-                "3_days": self._get_overdue_tasks(tasks, 3),
-                "7_days": self._get_overdue_tasks(tasks, 7),
-                "30_days": self._get_overdue_tasks(tasks, 30),
+                "created": created_month,
+                "completed": completed_month,
             },
+            "overdue": overdue,
             "due_dates": {
-                "overdue": self._get_due_date_overdue_tasks(tasks),
-                "due_soon": self._get_due_soon_tasks(tasks, 7),
-                "due_today": self._get_due_today_tasks(tasks),
-                "total_with_due_dates": len([t for t in tasks if t.get("due_date")]),
+                "overdue": due_overdue,
+                "due_soon": due_soon,
+                "due_today": due_today,
+                "total_with_due_dates": with_due_date_count,
             },
-            "recurring": self._get_recurring_tasks(tasks),
-            "by_label": self._get_tasks_by_label(tasks),
+            "recurring": recurring,
+            "by_label": by_label,
         }
 
+        self._counts_cache = (cache_key, time.monotonic(), stats)
         return stats
 
     def _parse_date(self, date_str: str) -> datetime:
         """Parse date string to datetime object."""
         try:
-            return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+            return parse_timestamp(date_str)
         except ValueError:
             return datetime.now()
 
-    def _get_overdue_tasks(self, tasks: List[Dict], days_threshold: int) -> List[Dict]:
-        """Get tasks that are overdue by the specified number of days (based on creation date)."""
-        cutoff_date = datetime.now() - timedelta(days=days_threshold)
-        overdue = []
-
-        for task in tasks:
-            if not task["completed_at"]:  # Only open tasks
-                created_date = self._parse_date(task["created_at"])
-                if created_date < cutoff_date:
-                    overdue.append(task)
-
-        return overdue
-
-    def _get_due_date_overdue_tasks(self, tasks: List[Dict]) -> List[Dict]:
-        """Get tasks that are overdue based on due dates."""
-        from .utils import DateParser
-
-        overdue = []
-        for task in tasks:
-            if not task["completed_at"] and task.get("due_date"):  # Only open tasks with due dates
-                if DateParser.is_overdue(task["due_date"]):
-                    overdue.append(task)
-
-        return overdue
-
-    def _get_due_soon_tasks(self, tasks: List[Dict], days: int = 7) -> List[Dict]:
-        """Get tasks that are due soon (within specified days)."""
-        from .utils import DateParser
-
-        due_soon = []
-        for task in tasks:
-            if not task["completed_at"] and task.get("due_date"):  # Only open tasks with due dates
-                if DateParser.is_due_soon(task["due_date"], days):
-                    due_soon.append(task)
-
-        return due_soon
-
-    def _get_due_today_tasks(self, tasks: List[Dict]) -> List[Dict]:
-        """Get tasks that are due today."""
-        from .utils import DateParser
-
-        due_today = []
-        today = date.today().strftime("%Y-%m-%d")
-
-        for task in tasks:
-            if not task["completed_at"] and task.get("due_date"):  # Only open tasks with due dates
-                if task["due_date"] == today:
-                    due_today.append(task)
-
-        return due_today
-
-    def _get_recurring_tasks(self, tasks: List[Dict]) -> List[Dict]:
-        """Get tasks that appear to be recurring (have recurring-related labels)."""
-        recurring_labels = {
-            "recurring",
-            "repeat",
-            "daily",
-            "weekly",
-            "monthly",
-            "routine",
+    @staticmethod
+    def _row_to_task(row: tuple) -> Dict[str, Any]:
+        """
+        Convert an analytics task row to a task dictionary.
+
+        Analytics only counts and buckets tasks, so rows carry just the
+        columns that needs; content and source are never fetched.
+        """
+        return {
+            "id": row[0],
+            "created_at": row[1],
+            "completed_at": row[2],
+            "labels": row[3].split(",") if row[3] else [],
+            "due_date": row[4],
         }
-        recurring = []
-
-        for task in tasks:
-            task_labels = set(label.lower() for label in task["labels"])
-            if task_labels.intersection(recurring_labels):
-                recurring.append(task)
-
-        return recurring
-
-    def _get_tasks_by_label(self, tasks: List[Dict]) -> Dict[str, int]:
-        """Get task counts grouped by label."""
-        label_counts = {}
-
-        for task in tasks:
-            for label in task["labels"]:
-                label_lower = label.lower()
-                label_counts[label_lower] = label_counts.get(label_lower, 0) + 1
-
-        return dict(sorted(label_counts.items(), key=lambda x: x[1], reverse=True))
 
     def generate_digest(self, period: str = "weekly", format: str = "text") -> str:
         """Generate a digest report for the specified period."""
+        if period not in _DIGEST_WINDOWS:
+            raise ValueError(f"Unknown period: {period}")
+
         stats = self.get_task_counts(30)  # Get last 30 days for context
+        today = date.today()
 
+        if format == "csv":
+            return self._generate_csv_digest(period, stats, today)
+
+        template = _DIGEST_TEMPLATES.get((period, format))
+        if template is None:
+            return ""
+
+        window, overdue_key = _DIGEST_WINDOWS[period]
+        format_labels = {
+            "text": self._format_label_summary,
+            "markdown": self._format_label_summary_md,
+            "html": self._format_label_summary_html,
+        }[format]
+        context = {
+            "date": today.strftime("%Y-%m-%d"),
+            "month": today.strftime("%Y-%m"),
+            "created": stats[window]["created"],
+            "completed": stats[window]["completed"],
+            "overdue": len(stats["overdue"][overdue_key]),
+            "due_today": len(stats["due_dates"]["due_today"]),
+            "due_overdue": len(stats["due_dates"]["overdue"]),
+            "recurring": len(stats["recurring"]),
+            "labels": format_labels(stats["by_label"]),
+        }
+        return template.substitute(context)
+
+    def _generate_csv_digest(self, period: str, stats: Dict[str, Any], today: date) -> str:
+        """Generate a CSV digest (daily and weekly only)."""
         if period == "daily":
-            return self._generate_daily_digest(stats, format)
+            header, window = _CSV_HEADER_DAILY, stats["today"]
+            tail = [len(stats["due_dates"]["due_today"]), len(stats["due_dates"]["overdue"])]
         elif period == "weekly":
-            return self._generate_weekly_digest(stats, format)
-        elif period == "monthly":
-            return self._generate_monthly_digest(stats, format)
+            header, window = _CSV_HEADER_PERIOD, stats["this_week"]
+            tail = [len(stats["overdue"]["7_days"]), len(stats["overdue"]["30_days"])]
         else:
-            raise ValueError(f"Unknown period: {period}")
-
-    def _generate_daily_digest(self, stats: Dict[str, Any], format: str) -> str:
-        """Generate daily digest."""
-        if format == "text":
-            return f"""📊 Daily Digest - {date.today().strftime('%Y-%m-%d')}
-
-✅ {stats['today']['completed']} tasks completed today
-📝 {stats['today']['created']} new tasks added today
-🕗 {len(stats['overdue']['3_days'])} tasks overdue > 3 days
-📅 {len(stats['due_dates']['due_today'])} tasks due today
-⏰ {len(stats['due_dates']['overdue'])} tasks overdue (due dates)
-🔁 {len(stats['recurring'])} recurring tasks flagged
-
-Top labels today:
-{self._format_label_summary(stats['by_label'])}"""
-
-        elif format == "markdown":
-            return f"""# Daily Digest - {date.today().strftime('%Y-%m-%d')}
-
-## Summary
-- ✅ **{stats['today']['completed']}** tasks completed today
-- 📝 **{stats['today']['created']}** new tasks added today
-- 🕗 **{len(stats['overdue']['3_days'])}** tasks overdue > 3 days
-- 📅 **{len(stats['due_dates']['due_today'])}** tasks due today
-- ⏰ **{len(stats['due_dates']['overdue'])}** tasks overdue (due dates)
-- 🔁 **{len(stats['recurring'])}** recurring tasks flagged
-
-## Top Labels
-{self._format_label_summary_md(stats['by_label'])}"""
-
-        elif format == "csv":
-            header = ",".join(
-                [
-                    "Date",
-                    "Period",
-                    "Total Tasks",
-                    "Open Tasks",
-                    "Completed Tasks",
-                    "Today Created",
-                    "Today Completed",
-                    "Overdue 3 Days",
-                    "Due Today",
-                    "Overdue Due Dates",
-                    "Recurring Tasks",
-                ]
-            )
-            row = ",".join(
-                [
-                    date.today().strftime("%Y-%m-%d"),
-                    "Daily",
-                    str(stats["total_tasks"]),
-                    str(stats["open_tasks"]),
-                    str(stats["completed_tasks"]),
-                    str(stats["today"]["created"]),
-                    str(stats["today"]["completed"]),
-                    str(len(stats["overdue"]["3_days"])),
-                    str(len(stats["due_dates"]["due_today"])),
-                    str(len(stats["due_dates"]["overdue"])),
-                    str(len(stats["recurring"])),
-                ]
-            )
-            return f"{header}\n{row}"
-
-        return ""
-
-    def _generate_weekly_digest(self, stats: Dict[str, Any], format: str) -> str:
-        """Generate weekly digest."""
-        if format == "text":
-            return f"""📊 Weekly Digest - Week ending {date.today().strftime('%Y-%m-%d')}
-
-✅ {stats['this_week']['completed']} tasks completed this week
-📝 {stats['this_week']['created']} new tasks added this week
-🕗 {len(stats['overdue']['7_days'])} tasks still open > 7 days
-📅 {len(stats['due_dates']['due_today'])} tasks due today
-⏰ {len(stats['due_dates']['overdue'])} tasks overdue (due dates)
-🔁 {len(stats['recurring'])} recurring tasks flagged as overdue
-
-Top labels this week:
-{self._format_label_summary(stats['by_label'])}"""
-
-        elif format == "markdown":
-            return f"""# Weekly Digest - Week ending {date.today().strftime('%Y-%m-%d')}
-
-## Summary
-- ✅ **{stats['this_week']['completed']}** tasks completed this week
-- 📝 **{stats['this_week']['created']}** new tasks added this week
-- 🕗 **{len(stats['overdue']['7_days'])}** tasks still open > 7 days
-- 📅 **{len(stats['due_dates']['due_today'])}** tasks due today
-- ⏰ **{len(stats['due_dates']['overdue'])}** tasks overdue (due dates)
-- 🔁 **{len(stats['recurring'])}** recurring tasks flagged as overdue
-
-## Top Labels
-{self._format_label_summary_md(stats['by_label'])}"""
-        elif format == "csv":
-            header = ",".join(
-                [
-                    "Date",
-                    "Period",
-                    "Total Tasks",
-                    "Open Tasks",
-                    "Completed Tasks",
-                    "Today Created",
-                    "Today Completed",
-                    "Overdue 3 Days",
-                    "Overdue 7 Days",
-                    "Overdue 30 Days",
-                    "Recurring Tasks",
-                ]
-            )
-            row = ",".join(
-                [
-                    date.today().strftime("%Y-%m-%d"),
-                    "Weekly",
-                    str(stats["total_tasks"]),
-                    str(stats["open_tasks"]),
-                    str(stats["completed_tasks"]),
-                    str(stats["this_week"]["created"]),
-                    str(stats["this_week"]["completed"]),
-                    str(len(stats["overdue"]["3_days"])),
-                    str(len(stats["overdue"]["7_days"])),
-                    str(len(stats["overdue"]["30_days"])),
-                    str(len(stats["recurring"])),
-                ]
-            )
-            return f"{header}\n{row}"
-
-        return ""
-
-    def _generate_monthly_digest(self, stats: Dict[str, Any], format: str) -> str:
-        """Generate monthly digest."""
-        if format == "text":
-            return f"""📊 Monthly Digest - {date.today().strftime('%Y-%m')}
-
-✅ {stats['this_month']['completed']} tasks completed this month
-📝 {stats['this_month']['created']} new tasks added this month
-🕗 {len(stats['overdue']['30_days'])} tasks still open > 30 days
-📅 {len(stats['due_dates']['due_today'])} tasks due today
-⏰ {len(stats['due_dates']['overdue'])} tasks overdue (due dates)
-🔁 {len(stats['recurring'])} recurring tasks flagged as overdue
-
-Top labels this month:
-{self._format_label_summary(stats['by_label'])}"""
-
-        elif format == "markdown":
-            return f"""# Monthly Digest - {date.today().strftime('%Y-%m')}
-
-## Summary
-- ✅ **{stats['this_month']['completed']}** tasks completed this month
-- 📝 **{stats['this_month']['created']}** new tasks added this month
-- 🕗 **{len(stats['overdue']['30_days'])}** tasks still open > 30 days
-- 📅 **{len(stats['due_dates']['due_today'])}** tasks due today
-- ⏰ **{len(stats['due_dates']['overdue'])}** tasks overdue (due dates)
-- 🔁 **{len(stats['recurring'])}** recurring tasks flagged as overdue
-
-## Top Labels
-{self._format_label_summary_md(stats['by_label'])}"""
-
-        elif format == "html":
-            return f"""<html>
-<head>
-    <title>Monthly Digest - {date.today().strftime("%Y-%m")}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; }}
-        .summary {{ background: #f5f5f5; padding: 15px; border-radius: 5px; }}
-        .label {{ color: #666; }}
-    </style>
-</head>
-<body>
-    <h1>Monthly Digest - {date.today().strftime("%Y-%m")}</h1>
-    <div class="summary">
-        <h2>Summary</h2>
-        <ul>
-            <li>✅ <strong>{stats["this_month"]["completed"]}</strong> tasks completed this month</li>
-            <li>📝 <strong>{stats["this_month"]["created"]}</strong> new tasks added this month</li>
-            <li>🕗 <strong>{len(stats["overdue"]["30_days"])}</strong> tasks still open > 30 days</li>
-            <li>🔁 <strong>{len(stats["recurring"])}</strong> recurring tasks flagged as overdue</li>
-        </ul>
-    </div>
-    <h2>Top Labels</h2>
-    {self._format_label_summary_html(stats["by_label"])}
-</body>
-</html>"""
-        return ""
+            return ""
+
+        row = [
+            today.strftime("%Y-%m-%d"),
+            period.capitalize(),
+            stats["total_tasks"],
+            stats["open_tasks"],
+            stats["completed_tasks"],
+            window["created"],
+            window["completed"],
+            len(stats["overdue"]["3_days"]),
+            *tail,
+            len(stats["recurring"]),
+        ]
+        return self._format_csv(header, row)
+
+    def _format_csv(self, header: tuple, row: list) -> str:
+        """Format a header and a single data row as CSV text (without trailing newline)."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerow(row)
+        return buffer.getvalue()[:-1]
 
     def _format_label_summary(self, label_counts: List[tuple]) -> str:
         """Format label summary for text output."""
@@ -380,7 +451,7 @@ Top labels this month:
             return "  No labels found"
 
         lines = []
-        for label, count in list(label_counts.items())[:5]:
+        for label, count in itertools.islice(label_counts.items(), 5):
             lines.append(f"  #{label}: {count} tasks")
 
         return "\n".join(lines)
@@ -391,7 +462,7 @@ Top labels this month:
             return "- No labels found"
 
         lines = []
-        for label, count in list(label_counts.items())[:5]:
+        for label, count in itertools.islice(label_counts.items(), 5):
             lines.append(f"- **#{label}**: {count} tasks")
 
         return "\n".join(lines)
@@ -402,7 +473,7 @@ Top labels this month:
             return "<p><em>No labels found</em></p>"
 
         lines = ["<ul>"]
-        for label, count in list(label_counts.items())[:5]:
+        for label, count in itertools.islice(label_counts.items(), 5):
             lines.append(f'<li><span class="label">#{label}</span>: {count} tasks</li>')
         lines.append("</ul>")
 
@@ -415,41 +486,24 @@ Top labels this month:
 
         stats = self.get_task_counts(30)
 
-        header = ",".join(
-            [
-                "Date",
-                "Period",
-                "Total Tasks",
-                "Open Tasks",
-                "Completed Tasks",
-                "Today Created",
-                "Today Completed",
-                "Overdue 3 Days",
-                "Overdue 7 Days",
-                "Overdue 30 Days",
-                "Recurring Tasks",
-            ]
-        )
-        row = ",".join(
-            [
-                date.today().strftime("%Y-%m-%d"),
-                "Daily",
-                str(stats["total_tasks"]),
-                str(stats["open_tasks"]),
-                str(stats["completed_tasks"]),
-                str(stats["today"]["created"]),
-                str(stats["today"]["completed"]),
-                str(len(stats["overdue"]["3_days"])),
-                str(len(stats["overdue"]["7_days"])),
-                str(len(stats["overdue"]["30_days"])),
-                str(len(stats["recurring"])),
-            ]
-        )
-
-        csv_content = f"{header}\n{row}\n"
+        row = [
+            date.today().strftime("%Y-%m-%d"),
+            "Daily",
+            stats["total_tasks"],
+            stats["open_tasks"],
+            stats["completed_tasks"],
+            stats["today"]["created"],
+            stats["today"]["completed"],
+            len(stats["overdue"]["3_days"]),
+            len(stats["overdue"]["7_days"]),
+            len(stats["overdue"]["30_days"]),
+            len(stats["recurring"]),
+        ]
 
         # Write to file
-        with open(filename, "w") as f:
-            f.write(csv_content)
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(_CSV_HEADER_PERIOD)
+            writer.writerow(row)
 
         return filename
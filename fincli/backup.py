@@ -3,12 +3,61 @@ Backup and recovery system for fin-cli database.
 Maintains the last 10 database states with rollback capability.
 """
 
+from contextlib import closing, nullcontext
 from datetime import datetime
+import json
 import os
 from pathlib import Path
-import shutil
 import sqlite3
-from typing import List, Optional
+from typing import ContextManager, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, where the ID counter goes unlocked
+    fcntl = None
+
+# Backup files are named backup_NNN.db with metadata in backup_NNN.meta;
+# IDs are parsed by slicing between the prefix and the database suffix
+_BACKUP_PREFIX = "backup_"
+_BACKUP_SUFFIX = ".db"
+_META_SUFFIX = ".meta"
+_ID_SLICE = slice(len(_BACKUP_PREFIX), -len(_BACKUP_SUFFIX))
+
+
+def _backup_stem(backup_id: int) -> str:
+    """File name of a backup without its suffix."""
+    return f"{_BACKUP_PREFIX}{backup_id:03d}"
+
+
+# change_summary fields in backup metadata, and the task_changes counts they come from
+_CHANGE_SUMMARY_FIELDS = (
+    ("completed", "completed_count"),
+    ("reopened", "reopened_count"),
+    ("new", "new_tasks_count"),
+    ("content_modified", "content_modified_count"),
+    ("deleted", "deleted_count"),
+)
+
+
+def _truncate(text: str, width: int = 50) -> str:
+    """Shorten text to width characters, marking any cut with an ellipsis."""
+    return text if len(text) <= width else text[:width] + "..."
+
+
+def _open_ro(path) -> sqlite3.Connection:
+    """
+    Open a database read-only, tuned for the short summary queries backups run.
+
+    Opening in mode=ro also means a missing path raises instead of leaving an
+    empty database file behind.
+    """
+    conn = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -16000")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    return conn
 
 
 class DatabaseBackup:
@@ -26,6 +75,32 @@ class DatabaseBackup:
         self.max_backups = max_backups
         self.backup_dir = self._get_backup_dir()
         self.backup_dir.mkdir(parents=True, exist_ok=True)
+        # Sorted backup IDs, valid while the directory's mtime is unchanged
+        self._backup_ids_cache: Optional[List[int]] = None
+        self._backup_ids_mtime: Optional[int] = None
+        # Metadata by backup ID; a backup's metadata never changes once written
+        self._metadata_cache: Dict[int, dict] = {}
+        # Read-only connection to the live database, opened on first use
+        self._source_conn: Optional[sqlite3.Connection] = None
+
+    def close(self):
+        """Close the read-only connection to the live database, if open."""
+        if self._source_conn is not None:
+            self._source_conn.close()
+            self._source_conn = None
+
+    def _open_for_read(self, db_path) -> ContextManager[sqlite3.Connection]:
+        """
+        Open a database for reading, as a context manager yielding the connection.
+
+        The live database is read through one connection kept for the life of
+        this instance; any other database (a backup) is closed afterwards.
+        """
+        if str(db_path) != str(self.db_path):
+            return closing(_open_ro(db_path))
+        if self._source_conn is None:
+            self._source_conn = _open_ro(self.db_path)
+        return nullcontext(self._source_conn)
 
     def _get_backup_dir(self) -> Path:
         """Get the backup directory path."""
@@ -34,11 +109,11 @@ class DatabaseBackup:
 
     def _get_backup_path(self, backup_id: int) -> Path:
         """Get path for a specific backup."""
-        return self.backup_dir / f"backup_{backup_id:03d}.db"
+        return self.backup_dir / f"{_backup_stem(backup_id)}{_BACKUP_SUFFIX}"
 
     def _get_metadata_path(self, backup_id: int) -> Path:
         """Get path for backup metadata."""
-        return self.backup_dir / f"backup_{backup_id:03d}.meta"
+        return self.backup_dir / f"{_backup_stem(backup_id)}{_META_SUFFIX}"
 
     def create_backup(self, description: str = "", task_changes: Optional[dict] = None) -> int:
         """
@@ -54,12 +129,18 @@ class DatabaseBackup:
         if not os.path.exists(self.db_path):
             return -1  # No database to backup
 
+        self._optimize_source()
+
+        # Bring the cached IDs up to date before our own writes change the
+        # directory mtime, so backups made elsewhere aren't masked
+        self._list_backup_ids()
+
         # Get next backup ID
         backup_id = self._get_next_backup_id()
 
         # Create backup
         backup_path = self._get_backup_path(backup_id)
-        shutil.copy2(self.db_path, backup_path)
+        self._snapshot(backup_path)
 
         # Create metadata with enhanced information
         metadata = {
@@ -73,47 +154,123 @@ class DatabaseBackup:
         # Add task change details if provided
         if task_changes:
             metadata["task_changes"] = task_changes
-            metadata["change_summary"] = {
-                "completed": task_changes.get("completed_count", 0),
-                "reopened": task_changes.get("reopened_count", 0),
-                "new": task_changes.get("new_tasks_count", 0),
-                "content_modified": task_changes.get("content_modified_count", 0),
-                "deleted": task_changes.get("deleted_count", 0),
-            }
+            metadata["change_summary"] = {name: task_changes.get(key, 0) for name, key in _CHANGE_SUMMARY_FIELDS}
 
         self._save_metadata(backup_id, metadata)
+        self._update_backup_ids_cache(added=backup_id)
 
         # Clean up old backups
         self._cleanup_old_backups()
 
         return backup_id
 
+    def _optimize_source(self):
+        """
+        Refresh the source database's query planner statistics if they are stale.
+
+        Both the live database and the snapshot then carry current
+        sqlite_stat1 data. Before SQLite 3.46, PRAGMA optimize has no built-in
+        bound on the work it does, so analysis_limit caps it.
+        """
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            if sqlite3.sqlite_version_info < (3, 46, 0):
+                conn.execute("PRAGMA analysis_limit = 400")
+            conn.execute("PRAGMA optimize")
+
+    def _snapshot(self, backup_path: Path):
+        """
+        Snapshot the database into backup_path with SQLite's online backup API.
+
+        The backup runs in one step under a read lock, so it is consistent even
+        while other connections write, and includes anything still in the WAL.
+        The snapshot is switched out of WAL mode so it stays a single file.
+        """
+        with self._open_for_read(self.db_path) as src, closing(sqlite3.connect(backup_path)) as dst:
+            src.backup(dst)
+            dst.execute("PRAGMA journal_mode = DELETE")
+
+    @staticmethod
+    def _copy_database(src_path, dst_path):
+        """Replace the contents of the database at dst_path with those at src_path."""
+        with closing(sqlite3.connect(src_path)) as src, closing(sqlite3.connect(dst_path)) as dst:
+            src.backup(dst)
+
     def _get_next_backup_id(self) -> int:
-        """Get the next available backup ID."""
-        existing_backups = self._list_backup_ids()
-        if not existing_backups:
-            return 1
-        return max(existing_backups) + 1
+        """
+        Issue the next backup ID.
+
+        IDs come from a counter file in the backup directory, locked so
+        concurrent fin processes never issue the same ID. A missing, damaged
+        or stale counter (e.g. from a restored backup directory) is moved
+        past the backups on disk, so an existing backup is never overwritten.
+        """
+        fd = os.open(self.backup_dir / ".next_id", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                next_id = int(os.read(fd, 32))
+            except ValueError:
+                next_id = 1
+            existing_backups = self._list_backup_ids()
+            if existing_backups:
+                next_id = max(next_id, existing_backups[-1] + 1)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, str(next_id + 1).encode())
+            os.fsync(fd)
+            return next_id
+        finally:
+            os.close(fd)  # also releases the lock
 
     def _list_backup_ids(self) -> List[int]:
-        """List all existing backup IDs."""
-        if not self.backup_dir.exists():
+        """
+        List all existing backup IDs.
+
+        The directory is only rescanned when its mtime changes, which also
+        picks up backups created or removed by other processes.
+        """
+        try:
+            mtime = os.stat(self.backup_dir).st_mtime_ns
+        except FileNotFoundError:
             return []
 
-        backup_ids = []
-        for file in self.backup_dir.glob("backup_*.db"):
-            try:
-                backup_id = int(file.stem.split("_")[1])
-                backup_ids.append(backup_id)
-            except (ValueError, IndexError):
-                continue
+        if self._backup_ids_cache is None or mtime != self._backup_ids_mtime:
+            backup_ids = []
+            with os.scandir(self.backup_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith(_BACKUP_PREFIX) and name.endswith(_BACKUP_SUFFIX):
+                        try:
+                            backup_ids.append(int(name[_ID_SLICE]))
+                        except ValueError:
+                            continue
+            backup_ids.sort()
+            self._backup_ids_cache = backup_ids
+            self._backup_ids_mtime = mtime
+
+        return self._backup_ids_cache
+
+    def _update_backup_ids_cache(self, added: Optional[int] = None, removed: Optional[int] = None):
+        """
+        Apply one of our own changes to the cached IDs instead of rescanning.
 
-        return sorted(backup_ids)
+        Only call this right after the cache was validated by _list_backup_ids,
+        so the new directory mtime doesn't mask another process's change.
+        """
+        if self._backup_ids_cache is None:
+            return
+        if added is not None and added not in self._backup_ids_cache:
+            # IDs are issued in increasing order, so the list stays sorted
+            self._backup_ids_cache.append(added)
+        if removed in self._backup_ids_cache:
+            self._backup_ids_cache.remove(removed)
+        self._backup_ids_mtime = os.stat(self.backup_dir).st_mtime_ns
 
     def _get_task_count(self, db_path: str) -> int:
         """Get the number of tasks in the database."""
         try:
-            with sqlite3.connect(db_path) as conn:
+            with self._open_for_read(db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT COUNT(*) FROM tasks")
                 return cursor.fetchone()[0]
@@ -122,25 +279,48 @@ class DatabaseBackup:
 
     def _save_metadata(self, backup_id: int, metadata: dict):
         """Save backup metadata."""
-        import json
+        # Encode up front and write in one call; the metadata isn't hand-edited,
+        # so it's stored compact rather than indented
+        data = json.dumps(metadata, separators=(",", ":")).encode()
 
+        # Write to a temporary file and rename it into place, so a crash leaves
+        # either no metadata or the complete file, never a truncated one
         meta_path = self._get_metadata_path(backup_id)
-        with open(meta_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        tmp_path = meta_path.with_suffix(f"{_META_SUFFIX}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, meta_path)
+        self._fsync_backup_dir()
 
-    def _load_metadata(self, backup_id: int) -> Optional[dict]:
-        """Load backup metadata."""
-        import json
+        self._metadata_cache[backup_id] = metadata
 
-        meta_path = self._get_metadata_path(backup_id)
-        if not meta_path.exists():
-            return None
+    def _fsync_backup_dir(self):
+        """Make renames in the backup directory durable (POSIX only)."""
+        try:
+            fd = os.open(self.backup_dir, os.O_RDONLY)
+        except OSError:
+            return  # Directories can't be opened on Windows
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _load_metadata(self, backup_id: int) -> Optional[dict]:
+        """Load backup metadata, reading each backup's file at most once."""
+        if backup_id in self._metadata_cache:
+            return self._metadata_cache[backup_id]
 
+        # A missing file raises FileNotFoundError, so no separate exists() check
         try:
-            with open(meta_path, "r") as f:
-                return json.load(f)
+            metadata = json.loads(self._get_metadata_path(backup_id).read_bytes())
         except (OSError, ValueError):
             return None
+        self._metadata_cache[backup_id] = metadata
+        return metadata
 
     def _cleanup_old_backups(self):
         """Remove old backups beyond max_backups limit."""
@@ -149,19 +329,22 @@ class DatabaseBackup:
             return
 
         # Remove oldest backups
-        to_remove = backup_ids[: -self.max_backups]
+        to_remove = backup_ids[: -self.max_backups]  # a copy, as removal updates the cache
         for backup_id in to_remove:
             self._remove_backup(backup_id)
 
     def _remove_backup(self, backup_id: int):
         """Remove a specific backup."""
-        backup_path = self._get_backup_path(backup_id)
-        meta_path = self._get_metadata_path(backup_id)
-
-        if backup_path.exists():
-            backup_path.unlink()
-        if meta_path.exists():
-            meta_path.unlink()
+        # Unlink plain string paths and ignore files that are already gone,
+        # rather than building Paths and stat-ing each one first
+        base = os.path.join(self.backup_dir, _backup_stem(backup_id))
+        for path in (f"{base}{_BACKUP_SUFFIX}", f"{base}{_META_SUFFIX}"):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        self._metadata_cache.pop(backup_id, None)
+        self._update_backup_ids_cache(removed=backup_id)
 
     def list_backups(self) -> List[dict]:
         """
@@ -188,24 +371,31 @@ class DatabaseBackup:
         Returns:
             True if rollback successful, False otherwise
         """
-        backup_path = self._get_backup_path(backup_id)
-        if not backup_path.exists():
+        # Opening the backup read-only fails if it doesn't exist, which doubles
+        # as the existence check
+        try:
+            source = _open_ro(self._get_backup_path(backup_id))
+        except sqlite3.OperationalError:
             return False
 
-        # Create a backup of current state before rollback
-        current_backup_id = self.create_backup("Auto-backup before rollback")
+        with closing(source):
+            # Create a backup of current state before rollback
+            current_backup_id = self.create_backup("Auto-backup before rollback")
 
-        try:
-            # Restore the backup
-            shutil.copy2(backup_path, self.db_path)
-            return True
-        except Exception as e:
-            # If rollback fails, try to restore the current state
-            if current_backup_id > 0:
-                current_backup_path = self._get_backup_path(current_backup_id)
-                if current_backup_path.exists():
-                    shutil.copy2(current_backup_path, self.db_path)
-            raise e
+            try:
+                # Restore the backup through SQLite, so open connections (and the
+                # live database's WAL) see the restored pages rather than a file
+                # swapped out from under them
+                with closing(sqlite3.connect(self.db_path)) as dst:
+                    source.backup(dst)
+                return True
+            except Exception as e:
+                # If rollback fails, try to restore the current state
+                if current_backup_id > 0:
+                    current_backup_path = self._get_backup_path(current_backup_id)
+                    if current_backup_path.exists():
+                        self._copy_database(current_backup_path, self.db_path)
+                raise e
 
     def get_latest_backup_id(self) -> Optional[int]:
         """Get the ID of the latest backup."""
@@ -222,14 +412,15 @@ class DatabaseBackup:
         Returns:
             Dictionary with preview information or None if backup not found
         """
-        backup_path = self._get_backup_path(backup_id)
-        if not backup_path.exists():
-            return None
+        try:
+            backup_conn = _open_ro(self._get_backup_path(backup_id))
+        except sqlite3.OperationalError:
+            return None  # No such backup
 
         try:
             # Get current task count and sample tasks
             current_tasks = self._get_task_summary(self.db_path)
-            backup_tasks = self._get_task_summary(backup_path)
+            backup_tasks = self._summarize_tasks(closing(backup_conn))
 
             # Calculate differences
             preview = {"backup_id": backup_id, "current_state": current_tasks, "backup_state": backup_tasks, "changes": {"tasks_added": backup_tasks["total"] - current_tasks["total"], "tasks_removed": current_tasks["total"] - backup_tasks["total"], "sample_current": current_tasks.get("sample_tasks", []), "sample_backup": backup_tasks.get("sample_tasks", [])}}
@@ -242,27 +433,35 @@ class DatabaseBackup:
     def _get_task_summary(self, db_path: str) -> dict:
         """Get a summary of tasks in a database."""
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
+            reader = self._open_for_read(db_path)
+        except sqlite3.Error:
+            return {"total": 0, "sample_tasks": []}
+        return self._summarize_tasks(reader)
 
-            # Get total task count
-            cursor.execute("SELECT COUNT(*) FROM tasks")
-            total_tasks = cursor.fetchone()[0]
+    def _summarize_tasks(self, reader: ContextManager[sqlite3.Connection]) -> dict:
+        """Summarize the tasks in a database opened with _open_for_read."""
+        try:
+            with reader as conn:
+                cursor = conn.cursor()
 
-            # Get sample of recent tasks
-            cursor.execute(
+                # Get the total task count alongside the most recent tasks in one
+                # statement; an empty table yields no rows at all
+                cursor.execute(
+                    """
+                    WITH recent AS (
+                        SELECT id, content, completed_at, created_at
+                        FROM tasks
+                        ORDER BY created_at DESC
+                        LIMIT 5
+                    )
+                    SELECT (SELECT COUNT(*) FROM tasks), id, content, completed_at, created_at
+                    FROM recent
                 """
-                SELECT id, content, completed_at, created_at 
-                FROM tasks 
-                ORDER BY created_at DESC 
-                LIMIT 5
-            """
-            )
-            sample_tasks = []
-            for row in cursor.fetchall():
-                sample_tasks.append({"id": row[0], "content": row[1][:50] + "..." if len(row[1]) > 50 else row[1], "completed": bool(row[2]), "created": row[3]})
-
-            conn.close()
+                )
+                rows = cursor.fetchall()
+
+            total_tasks = rows[0][0] if rows else 0
+            sample_tasks = [{"id": task_id, "content": _truncate(content), "completed": completed_at is not None, "created": created_at} for _, task_id, content, completed_at, created_at in rows]
 
             return {"total": total_tasks, "sample_tasks": sample_tasks}
 
@@ -13,47 +13,121 @@ from typing import List, Optional
 import click
 
 from fincli import __version__
-from fincli.analytics import AnalyticsManager
-from fincli.backup import DatabaseBackup
 from fincli.config import Config
 from fincli.contexts import ContextManager
 from fincli.db import DatabaseManager
-from fincli.editor import EditorManager
-from fincli.intake import import_from_source
-from fincli.labels import LabelManager
-from fincli.sheets_connector import create_sheets_reader_from_token
-from fincli.sync_engine import SyncEngine
-from fincli.sync_strategies import RemoteSystemType, SyncStrategyFactory
 from fincli.tasks import TaskManager
 from fincli.utils import (
     DateParser,
     evaluate_boolean_label_expression,
-    filter_tasks_by_date_range,
     format_task_for_display,
+    get_date_range,
     is_important_task,
     is_today_task,
+    match_label_expression,
+    parse_label_expression,
+    sort_tasks_by_priority,
 )
 
+# Hashtags in direct task content, matched in one scan: special features
+# (#due:, #recur:, #depends:), task references to keep, labels, and a bare
+# fallback for hashtags such as "#due" without a value that are just removed.
+# Task ids are ASCII, so those parts skip Unicode class lookups; labels stay
+# Unicode-aware so a hashtag like #café is not cut short
+_HASHTAG_SCAN_RE = re.compile(r"#(?:due:(?P<due>[^ ]+)|recur:(?P<recur>\w+)|depends:(?P<depends>(?a:\w+))|(?P<ref>(?a:task\d+|ref:task\d+))|(?P<label>(?!due:|recur:|depends:)\w+)|\w+)")
 
-def _get_db_manager():
+# Words reserved for label filter expressions and special hashtag patterns
+_RESERVED = frozenset({"and", "or", "ref", "due", "recur", "depends", "not"})
+_RESERVED_SORTED = ", ".join(sorted(_RESERVED))
+
+
+# Database manager reused within this process, keyed by FIN_DB_PATH (None for the default path)
+_db_managers = {}
+
+
+def _get_db_manager(verbose=False):
     """Get database manager - lazy initialization to avoid import-time connections."""
     # Check for environment variable first to ensure proper test isolation
     env_db_path = os.environ.get("FIN_DB_PATH")
+
+    # FIN_VERBOSE=1 in the environment also shows the path; a new DatabaseManager prints it itself
+    env_verbose = os.environ.get("FIN_VERBOSE") == "1"
+
+    # Reuse the manager from an earlier command as long as its database file still exists
+    db_manager = _db_managers.get(env_db_path)
+    if db_manager is not None and db_manager.db_path.exists():
+        if verbose or env_verbose:
+            print("DatabaseManager using path:", db_manager.db_path)
+        return db_manager
+
     if env_db_path:
-        return DatabaseManager(env_db_path)
+        db_manager = DatabaseManager(env_db_path)
     else:
-        return DatabaseManager()
+        db_manager = DatabaseManager()
+    if verbose and not env_verbose:
+        print("DatabaseManager using path:", db_manager.db_path)
+    # Only the most recent manager is kept; close the ones it replaces
+    for old_manager in _db_managers.values():
+        old_manager.close()
+    _db_managers.clear()
+    _db_managers[env_db_path] = db_manager
+    return db_manager
+
+
+# Config reused within this process, keyed by config directory, with the
+# config file's mtime at load so edits made outside this process are picked up
+_configs = {}
+
+
+def _get_config():
+    """Get the configuration, reusing the one loaded earlier in this process."""
+    config_dir = os.environ.get("FIN_CONFIG_DIR") or os.path.expanduser("~/fin")
+
+    cached = _configs.get(config_dir)
+    if cached is not None:
+        config, mtime_ns = cached
+        try:
+            if config.config_file.stat().st_mtime_ns == mtime_ns:
+                return config
+        except OSError:
+            pass
+
+    config = Config(config_dir)
+    try:
+        mtime_ns = config.config_file.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    # Only the most recent config is kept
+    _configs.clear()
+    _configs[config_dir] = (config, mtime_ns)
+    return config
+
+
+def _validate_labels(labels):
+    """Exit with an error if any of the labels is a reserved word."""
+    invalid_labels = [label for label in labels if label and label.lower() in _RESERVED]
+    if invalid_labels:
+        click.echo(f"❌ Error: Cannot use reserved words as labels: {', '.join(invalid_labels)}")
+        click.echo(f"   Reserved words: {_RESERVED_SORTED}")
+        click.echo("   Use complex filtering instead: fin list -l 'work and urgent'")
+        click.echo("   Use special patterns: #due:06/17, #due:2025-08-10, #recur:daily, #depends:task123")
+        click.echo("   Use NOT logic: fin list -l 'NOT urgent' or 'work AND NOT urgent'")
+        sys.exit(1)
+
+
+def _status_wants(status_list):
+    """Return (want_open, want_completed) for fine/fins status values, accepting shorthand letters."""
+    want_all = "all" in status_list or "a" in status_list
+    want_open = want_all or "open" in status_list or "o" in status_list
+    want_completed = want_all or any(status in ("completed", "done", "d") for status in status_list)
+    return want_open, want_completed
 
 
 def add_task(content: str, labels: tuple, source: str = "cli", due_date: str = None):
     """Add a task to the database."""
     # Only create database connection when function is called, not at import time
     # Check for environment variable first to ensure proper test isolation
-    env_db_path = os.environ.get("FIN_DB_PATH")
-    if env_db_path:
-        db_manager = DatabaseManager(env_db_path)
-    else:
-        db_manager = _get_db_manager()
+    db_manager = _get_db_manager()
 
     task_manager = TaskManager(db_manager)
     # config = Config()  # Temporarily disabled to debug hanging issue
@@ -62,15 +136,7 @@ def add_task(content: str, labels: tuple, source: str = "cli", due_date: str = N
     labels_list = list(labels) if labels else []
 
     # Validate labels for reserved words
-    reserved_words = {"and", "or", "ref", "due", "recur", "depends", "not"}
-    invalid_labels = [label for label in labels_list if label.lower() in reserved_words]
-    if invalid_labels:
-        click.echo(f"❌ Error: Cannot use reserved words as labels: {', '.join(invalid_labels)}")
-        click.echo(f"   Reserved words: {', '.join(sorted(reserved_words))}")
-        click.echo("   Use complex filtering instead: fin list -l 'work and urgent'")
-        click.echo("   Use special patterns: #due:06/17, #due:2025-08-10, #recur:daily, #depends:task123")
-        click.echo("   Use NOT logic: fin list -l 'NOT urgent' or 'work AND NOT urgent'")
-        sys.exit(1)
+    _validate_labels(labels_list)
 
     # Check if this is an important task and auto-add today label if configured
     # Temporarily disabled to debug hanging issue
@@ -81,18 +147,11 @@ def add_task(content: str, labels: tuple, source: str = "cli", due_date: str = N
     # Get current context
     current_context = ContextManager.get_current_context()
 
-    # Add the task with due date, labels, and context (TaskManager handles normalization)
-    task_manager.add_task(content, labels_list, source, due_date, current_context)
+    # Normalize labels once, as stored, so the display matches the database
+    normalized_labels = TaskManager.normalize_labels(labels_list)
 
-    # Get normalized labels for display (sorted alphabetically)
-    normalized_labels = []
-    if labels_list:
-        # Simple normalization for display: lowercase and trim, then sort
-        for label in labels_list:
-            if label:
-                normalized_labels.append(label.lower().strip())
-        # Sort alphabetically to match test expectations
-        normalized_labels.sort()
+    # Add the task with due date, labels, and context
+    task_manager.add_task(content, normalized_labels, source, due_date, current_context)
 
     # Format output to match test expectations
     due_date_display = ""
@@ -112,33 +171,35 @@ def handle_direct_task(args):
         sys.exit(1)
 
     # Parse arguments for labels
-    task_content = []
     labels = []
     source = "cli"  # Default source
-    i = 0
 
-    while i < len(args):
-        if args[i] == "--label" or args[i] == "-l":
-            if i + 1 < len(args):
-                labels.append(args[i + 1])
-                i += 2
-            else:
-                click.echo("Error: --label requires a value")
-                sys.exit(1)
-        elif args[i] == "--source":
-            if i + 1 < len(args):
+    if not any(arg.startswith("-") for arg in args):
+        # Common case (fin "do the thing" #tag): no options, everything is content
+        task_content = list(args)
+    else:
+        task_content = []
+        tokens = iter(args)
+
+        for arg in tokens:
+            if arg == "--label" or arg == "-l":
+                value = next(tokens, None)
+                if value is None:
+                    click.echo("Error: --label requires a value")
+                    sys.exit(1)
+                labels.append(value)
+            elif arg == "--source":
+                value = next(tokens, None)
+                if value is None:
+                    click.echo("Error: --source requires a value")
+                    sys.exit(1)
                 # source variable is used for add_task call
-                source = args[i + 1]
-                i += 2
+                source = value
+            elif arg.startswith("-"):
+                # Skip other options for now
+                continue
             else:
-                click.echo("Error: --source requires a value")
-                sys.exit(1)
-        elif args[i].startswith("-"):
-            # Skip other options for now
-            i += 1
-        else:
-            task_content.append(args[i])
-            i += 1
+                task_content.append(arg)
 
     if not task_content:
         click.echo("Missing task content")
@@ -146,21 +207,29 @@ def handle_direct_task(args):
 
     content = " ".join(task_content)
 
-    # Extract special features first (due dates, recurring, dependencies)
+    # Extract special features (due dates, recurring, dependencies) and hashtag
+    # labels, removing them from the content in the same pass; task references
+    # like #task23 and #ref:task23 are kept in place
+    found = {"due": [], "recur": [], "depends": [], "label": []}
+
+    def _collect_hashtag(match):
+        kind = match.lastgroup
+        if kind == "ref":
+            return match.group(0)
+        if kind is not None:
+            found[kind].append(match.group(kind))
+        return ""
+
+    # Most tasks carry no hashtags at all, so skip the scan unless one can match
+    if "#" in content:
+        content = _HASHTAG_SCAN_RE.sub(_collect_hashtag, content)
+
+    # Parse the first due date: #due:MM/DD or #due:YYYY-MM-DD or #due:MM/DD/YYYY
     due_date = None
-    recurring = None
-    dependencies = []
-
-    # Extract due date: #due:MM/DD or #due:YYYY-MM-DD or #due:MM/DD/YYYY
-    due_match = re.search(r"#due:([^ ]+)", content)
-    if due_match:
-        due_date_raw = due_match.group(1)
-        # Parse the due date using DateParser
+    if found["due"]:
+        due_date_raw = found["due"][0]
         due_date = DateParser.parse_due_date(due_date_raw)
-        if due_date:
-            # Remove the due date from content
-            content = re.sub(r"#due:[^ ]+", "", content)
-        else:
+        if not due_date:
             click.echo(f"❌ Error: Invalid due date format: {due_date_raw}")
             click.echo("   Supported formats:")
             click.echo("   - MM/DD")
@@ -168,47 +237,18 @@ def handle_direct_task(args):
             click.echo("   - MM/DD/YYYY")
             sys.exit(1)
 
-    # Extract recurring: #recur:daily, #recur:weekly, etc.
-    recur_match = re.search(r"#recur:(\w+)", content)
-    if recur_match:
-        recurring = recur_match.group(1)
-        content = re.sub(r"#recur:\w+", "", content)
-
-    # Extract dependencies: #depends:task123
-    dep_matches = re.findall(r"#depends:(\w+)", content)
-    if dep_matches:
-        dependencies = dep_matches
-        content = re.sub(r"#depends:\w+", "", content)
-
-    # Extract hashtags from content and add them as labels
-    # Exclude task reference patterns like #task23, #ref:task23, etc.
-    # Also exclude special patterns like #due:, #recur:, #depends:
-    hashtags = re.findall(r"#(?!task\d+|ref:task\d+|due:|recur:|depends:)(\w+)", content)
+    # Recurring: #recur:daily, #recur:weekly, etc.; dependencies: #depends:task123
+    recurring = found["recur"][0] if found["recur"] else None
+    dependencies = found["depends"]
+    hashtags = found["label"]
 
     # Validate hashtags for reserved words
-    reserved_words = {"and", "or", "ref", "due", "recur", "depends", "not"}
-    invalid_hashtags = [tag for tag in hashtags if tag.lower() in reserved_words]
-    if invalid_hashtags:
-        click.echo(f"❌ Error: Cannot use reserved words as labels: {', '.join(invalid_hashtags)}")
-        click.echo(f"   Reserved words: {', '.join(sorted(reserved_words))}")
-        click.echo("   Use complex filtering instead: fin list -l 'work and urgent'")
-        click.echo("   Use special patterns: #due:2025-08-10, #recur:daily, #depends:task123")
-        click.echo("   Use NOT logic: fin list -l 'NOT urgent' or 'work AND NOT urgent'")
-        sys.exit(1)
+    _validate_labels(hashtags)
 
-    for hashtag in hashtags:
-        labels.append(hashtag)
-
-    # Remove hashtags from content (but preserve task references)
-    # First, temporarily replace task references
-    content = re.sub(r"#(task\d+|ref:task\d+)", r"__TASK_REF_\1__", content)
-    # Remove other hashtags
-    content = re.sub(r"#\w+", "", content)
-    # Restore task references
-    content = re.sub(r"__TASK_REF_(task\d+|ref:task\d+)__", r"#\1", content)
+    labels.extend(hashtags)
 
     # Clean up extra whitespace
-    content = re.sub(r"\s+", " ", content).strip()
+    content = " ".join(content.split())
 
     if not content:
         click.echo("Error: Task content cannot be empty after removing hashtags")
@@ -294,9 +334,10 @@ def init(db_path: str):
 
 def _list_tasks_impl(days, label, status, today=False, due=None, verbose=False):
     """Implementation for listing tasks."""
-    db_manager = _get_db_manager()
+    db_manager = _get_db_manager(verbose)
     task_manager = TaskManager(db_manager)
-    config = Config()
+    config = _get_config()
+    weekdays_only = config.get_weekdays_only_lookback()
 
     # Get current context first (needed for verbose output and filtering)
     current_context = ContextManager.get_current_context()
@@ -320,7 +361,6 @@ def _list_tasks_impl(days, label, status, today=False, due=None, verbose=False):
                 click.echo(f"   • Default label filter: {default_label_filter}")
         if due:
             click.echo(f"   • Due date: {due}")
-        weekdays_only = config.get_weekdays_only_lookback()
         if weekdays_only:
             click.echo("   • Weekdays only: True (Mon-Fri)")
         else:
@@ -330,76 +370,61 @@ def _list_tasks_impl(days, label, status, today=False, due=None, verbose=False):
         click.echo(f"   • Context: {current_context}")
         click.echo()
 
-    # Get tasks (include completed tasks for status filtering, filtered by context)
-    tasks = task_manager.list_tasks(include_completed=True, context=current_context)
-
-    # Apply date filtering first
+    # Apply date and status filtering in the query itself; for "all" or "a"
+    # we keep all tasks (open and completed)
+    include_completed = status not in ["open", "o"]
+    completed_only = status in ["completed", "done", "d"]
     if today:
         # Override to show only today's tasks
         today_date = date.today()
-        filtered_tasks = []
-        for task in tasks:
-            if task["completed_at"]:
-                # For completed tasks (including dismissed), check if completed today
-                completed_dt = datetime.fromisoformat(task["completed_at"].replace("Z", "+00:00"))
-                if completed_dt.date() == today_date:
-                    filtered_tasks.append(task)
-            else:
-                # For open tasks, check if created today
-                created_dt = datetime.fromisoformat(task["created_at"].replace("Z", "+00:00"))
-                if created_dt.date() == today_date:
-                    filtered_tasks.append(task)
-        tasks = filtered_tasks
-    elif days is not None:
-        # Apply days filtering only if days is specified
-        weekdays_only = config.get_weekdays_only_lookback()
-        tasks = filter_tasks_by_date_range(tasks, days=days, weekdays_only=weekdays_only)
+        tasks = task_manager.list_tasks(
+            include_completed=include_completed,
+            context=current_context,
+            since=today_date,
+            until=today_date,
+            completed_only=completed_only,
+        )
     else:
-        # Default behavior: show open tasks from today and yesterday (2 days)
-        weekdays_only = config.get_weekdays_only_lookback()
-        tasks = filter_tasks_by_date_range(tasks, days=2, weekdays_only=weekdays_only)
-
-    # Apply status filtering
-    if status in ["open", "o"]:
-        tasks = [task for task in tasks if task["completed_at"] is None]
-    elif status in ["completed", "done", "d"]:
-        tasks = [task for task in tasks if task["completed_at"] is not None]
-    # For "all" or "a", we keep all tasks (open and completed)
+        # Apply days filtering if specified, else default to today and yesterday (2 days)
+        today_date, lookback_date = get_date_range(days if days is not None else 2, weekdays_only)
+        tasks = task_manager.list_tasks(
+            include_completed=include_completed,
+            context=current_context,
+            since=lookback_date,
+            until=today_date if lookback_date else None,
+            completed_only=completed_only,
+        )
+        sort_tasks_by_priority(tasks)
 
     # Filter out tasks with filtering labels unless explicitly requested with label filter
     # Note: Task filtering is now handled by the configuration-based default label filter below
 
     # Apply label filtering if requested
     if label:
+        # Parse the label criteria once rather than for every task
+        criteria = [parse_label_expression(label_criteria) for label_criteria in label]
         filtered_tasks = []
         for task in tasks:
             if task.get("labels"):
                 # Clean up labels - remove empty strings and whitespace
-                task_labels = [label.strip().lower() for label in task["labels"] if label.strip()]
+                task_labels = frozenset(label.strip().lower() for label in task["labels"] if label.strip())
 
                 # Check if task matches any of the label criteria using boolean logic
-                task_matches = False
-                for label_criteria in label:
-                    if evaluate_boolean_label_expression(task_labels, label_criteria):
-                        task_matches = True
-                        break
-
-                if task_matches:
+                if any(match_label_expression(task_labels, parsed) for parsed in criteria):
                     filtered_tasks.append(task)
         tasks = filtered_tasks
     else:
         # Apply default label filter for current context if no explicit labels provided
         default_label_filter = config.get_context_default_label_filter(current_context)
         if default_label_filter:
+            parsed = parse_label_expression(default_label_filter)
             filtered_tasks = []
             for task in tasks:
-                task_labels = []
-                if task.get("labels"):
-                    # Clean up labels - remove empty strings and whitespace
-                    task_labels = [label.strip().lower() for label in task["labels"] if label.strip()]
+                # Clean up labels - remove empty strings and whitespace
+                task_labels = frozenset(label.strip().lower() for label in task.get("labels") or () if label.strip())
 
                 # Apply the default label filter
-                if evaluate_boolean_label_expression(task_labels, default_label_filter):
+                if match_label_expression(task_labels, parsed):
                     filtered_tasks.append(task)
             tasks = filtered_tasks
 
@@ -444,89 +469,63 @@ def _list_tasks_impl(days, label, status, today=False, due=None, verbose=False):
         click.echo("📝 No tasks found matching your criteria.")
         return
 
-    # Organize tasks into sections
-    # Important tasks (with #i) go in Important section, regardless of #t
-    important_tasks = [task for task in tasks if is_important_task(task)]
-    # Today tasks (with #t but not #i) go in Today section
-    today_tasks = [task for task in tasks if is_today_task(task) and not is_important_task(task)]
-
-    # Due date sections (only for open tasks)
-
+    # Organize tasks into sections in a single pass
+    important_tasks = []
+    today_tasks = []
     overdue_tasks = []
     due_soon_tasks = []
     due_today_tasks = []
+    open_tasks = []
+    completed_tasks = []
+    today_str = date.today().strftime("%Y-%m-%d")
 
     for task in tasks:
-        if not task["completed_at"] and task.get("due_date"):  # Only open tasks with due dates
+        if is_important_task(task):
+            # Important tasks (with #i) go in Important section, regardless of #t
+            important_tasks.append(task)
+        elif is_today_task(task):
+            # Today tasks (with #t but not #i) go in Today section
+            today_tasks.append(task)
+        elif task["completed_at"]:
+            # Completed tasks go in Completed section
+            completed_tasks.append(task)
+        elif not task.get("due_date"):
+            # Regular tasks (no #i or #t) go in Open section, except those with
+            # due dates (they go in due date sections)
+            open_tasks.append(task)
+
+        # Due date sections (only for open tasks)
+        if not task["completed_at"] and task.get("due_date"):
             if DateParser.is_overdue(task["due_date"]):
                 overdue_tasks.append(task)
-            elif task["due_date"] == date.today().strftime("%Y-%m-%d"):
+            elif task["due_date"] == today_str:
                 due_today_tasks.append(task)
             elif DateParser.is_due_soon(task["due_date"], days=3):
                 due_soon_tasks.append(task)
 
-    # Regular tasks (no #i or #t) go in Open section
-    open_tasks = [task for task in tasks if not task["completed_at"] and not is_important_task(task) and not is_today_task(task) and not task.get("due_date")]  # Exclude tasks with due dates (they go in due date sections)
-
-    # Completed tasks go in Completed section
-    completed_tasks = [task for task in tasks if task["completed_at"] and not is_important_task(task) and not is_today_task(task)]
-
     # Note: Task filtering information is now shown in the main verbose output above
 
-    # Display Important section
-    if important_tasks:
-        click.echo("Important")
-        for i, task in enumerate(important_tasks, 1):
-            formatted_task = format_task_for_display(task, config, verbose)
-            click.echo(f"{formatted_task}")
-        click.echo()
-
-    # Display Today section
-    if today_tasks:
-        click.echo("Today")
-        for i, task in enumerate(today_tasks, 1):
-            formatted_task = format_task_for_display(task, config, verbose)
-            click.echo(f"{formatted_task}")
-        click.echo()
-
-    # Display Overdue section
-    if overdue_tasks:
-        click.echo("🚨 Overdue")
-        for task in overdue_tasks:
-            formatted_task = format_task_for_display(task, config, verbose)
-            click.echo(formatted_task)
-        click.echo()
-
-    # Display Due Soon section
-    if due_soon_tasks:
-        click.echo("⏰ Due Soon")
-        for task in due_soon_tasks:
-            formatted_task = format_task_for_display(task, config, verbose)
-            click.echo(formatted_task)
-        click.echo()
-
-    # Display Due Today section
-    if due_today_tasks:
-        click.echo("📅 Due Today")
-        for task in due_today_tasks:
-            formatted_task = format_task_for_display(task, config, verbose)
-            click.echo(formatted_task)
-        click.echo()
-
-    # Display Open section
-    if open_tasks:
-        click.echo("Open")
-        for i, task in enumerate(open_tasks, 1):
-            formatted_task = format_task_for_display(task, config, verbose)
-            click.echo(f"{formatted_task}")
-        click.echo()
-
-    # Display Completed section
+    # Display the sections, buffered into a single write
+    sections = (
+        ("Important", important_tasks),
+        ("Today", today_tasks),
+        ("🚨 Overdue", overdue_tasks),
+        ("⏰ Due Soon", due_soon_tasks),
+        ("📅 Due Today", due_today_tasks),
+        ("Open", open_tasks),
+        ("Completed", completed_tasks),
+    )
+    lines = []
+    for title, section_tasks in sections:
+        if section_tasks:
+            lines.append(title)
+            lines.extend(format_task_for_display(task, config, verbose) for task in section_tasks)
+            lines.append("")
+    # The Completed section is not followed by a blank line
     if completed_tasks:
-        click.echo("Completed")
-        for task in completed_tasks:
-            formatted_task = format_task_for_display(task, config, verbose)
-            click.echo(formatted_task)
+        lines.pop()
+    if lines:
+        click.echo("\n".join(lines))
 
 
 @cli.command(name="list-tasks")
@@ -559,9 +558,6 @@ def list_tasks(days, label, today, status, due, verbose):
         click.echo("   Use either --today or --days N, but not both")
         return
 
-    # Set verbose environment variable for DatabaseManager
-    if verbose:
-        os.environ["FIN_VERBOSE"] = "1"
     _list_tasks_impl(days, label, status, today, due, verbose)
 
 
@@ -595,9 +591,6 @@ def list_tasks_alias(days, label, today, status, due, verbose):
         click.echo("   Use either --today or --days N, but not both")
         return
 
-    # Set verbose environment variable for DatabaseManager
-    if verbose:
-        os.environ["FIN_VERBOSE"] = "1"
     # Call the underlying implementation function
     _list_tasks_impl(days, label, status, today, due, verbose)
 
@@ -609,6 +602,7 @@ def list_tasks_alias(days, label, today, status, due, verbose):
 @click.option("--dry-run", is_flag=True, help="Show what would be edited without opening editor")
 def open_editor(label, date, all_tasks, dry_run):
     """Open tasks in your editor for editing completion status."""
+    from fincli.editor import EditorManager
 
     db_manager = _get_db_manager()
     editor_manager = EditorManager(db_manager)
@@ -638,9 +632,10 @@ def open_editor(label, date, all_tasks, dry_run):
 
     # Only open editor at the very last moment when user explicitly requests it
     try:
-        # Get the state before editing for comparison
-        original_tasks = editor_manager.get_tasks_for_editing(label=label_filter, target_date=date, all_tasks=all_tasks)
-        original_completed = [t for t in original_tasks if t.get("completed_at")]
+        # Snapshot the state before editing for comparison; the tasks fetched
+        # above are edited directly rather than being queried again
+        original_completed_ids = frozenset(t["id"] for t in tasks if t.get("completed_at"))
+        max_id_before = editor_manager.task_manager.get_max_task_id()
 
         (
             completed_count,
@@ -649,68 +644,72 @@ def open_editor(label, date, all_tasks, dry_run):
             content_modified_count,
             deleted_count,
             dismissed_count,
-        ) = editor_manager.edit_tasks(label=label_filter, target_date=date, all_tasks=all_tasks)
-
-        # Get the state after editing for detailed comparison
-        updated_tasks = editor_manager.get_tasks_for_editing(label=label_filter, target_date=date, all_tasks=all_tasks)
-        updated_completed = [t for t in updated_tasks if t.get("completed_at")]
-        updated_open = [t for t in updated_tasks if not t.get("completed_at")]
+        ) = editor_manager.edit_tasks_with_tasks(tasks)
 
         changes_made = completed_count > 0 or reopened_count > 0 or new_tasks_count > 0 or content_modified_count > 0 or deleted_count > 0 or dismissed_count > 0
 
+        # Only the completed, reopened and dismissed sections list individual
+        # tasks, so the state after editing is reloaded only when one is shown
+        updated_tasks = []
+        newly_completed = []
+        newly_reopened = []
+        if completed_count > 0 or reopened_count > 0 or dismissed_count > 0:
+            updated_tasks = editor_manager.get_tasks_for_editing(label=label_filter, target_date=date, all_tasks=all_tasks)
+            # Split the edited tasks against the snapshot in a single pass
+            for t in updated_tasks:
+                if t.get("completed_at"):
+                    if t["id"] not in original_completed_ids:
+                        newly_completed.append(t)
+                elif t["id"] in original_completed_ids:
+                    newly_reopened.append(t)
+
         if changes_made:
-            click.echo("\n📊 Summary of Changes:")
-            click.echo("=" * 40)
+            # Buffer the summary and write it out once
+            lines = ["", "📊 Summary of Changes:", "=" * 40]
 
             # Show completed tasks
             if completed_count > 0:
-                click.echo(f"✅ Completed ({completed_count}):")
-                original_completed_ids = {t["id"] for t in original_completed}
-                newly_completed = [t for t in updated_completed if t["id"] not in original_completed_ids]
+                lines.append(f"✅ Completed ({completed_count}):")
                 for task in newly_completed:
-                    click.echo(f"  • {task['content']}")
-                click.echo()
+                    lines.append(f"  • {task['content']}")
+                lines.append("")
 
             # Show reopened tasks
             if reopened_count > 0:
-                click.echo(f"🔄 Reopened ({reopened_count}):")
-                newly_reopened = [t for t in updated_open if t["id"] in original_completed_ids]
+                lines.append(f"🔄 Reopened ({reopened_count}):")
                 for task in newly_reopened:
-                    click.echo(f"  • {task['content']}")
-                click.echo()
+                    lines.append(f"  • {task['content']}")
+                lines.append("")
 
             # Show new tasks
             if new_tasks_count > 0:
-                click.echo(f"📝 Added ({new_tasks_count}):")
-                # Get the most recent tasks that weren't in the original list
-                all_tasks = editor_manager.task_manager.list_tasks(include_completed=True)
-                original_ids = {t["id"] for t in original_tasks}
-                new_tasks = [t for t in all_tasks if t["id"] not in original_ids]
-                # Sort by creation time (newest first) and take the most recent ones
-                new_tasks.sort(key=lambda x: x["created_at"], reverse=True)
-                for task in new_tasks[:new_tasks_count]:
+                lines.append(f"📝 Added ({new_tasks_count}):")
+                # Tasks added in the editor are the ones with IDs past the pre-edit maximum
+                new_tasks = editor_manager.task_manager.list_tasks_since_max_id(max_id_before, new_tasks_count)
+                for task in new_tasks:
                     labels_str = f" [{', '.join(task['labels'])}]" if task["labels"] else ""
-                    click.echo(f"  • {task['content']}{labels_str}")
-                click.echo()
+                    lines.append(f"  • {task['content']}{labels_str}")
+                lines.append("")
 
             # Show dismissed tasks
             if dismissed_count > 0:
-                click.echo(f"🚫 Dismissed ({dismissed_count}):")
+                lines.append(f"🚫 Dismissed ({dismissed_count}):")
                 # Get dismissed tasks from updated tasks
                 dismissed_tasks = [t for t in updated_tasks if t.get("dismissed_at")]
                 for task in dismissed_tasks:
-                    click.echo(f"  • {task['content']}")
-                click.echo()
+                    lines.append(f"  • {task['content']}")
+                lines.append("")
 
             # Show deleted tasks
             if deleted_count > 0:
-                click.echo(f"🗑️  Deleted ({deleted_count}):")
-                click.echo(f"  • {deleted_count} tasks removed from database")
-                click.echo()
+                lines.append(f"🗑️  Deleted ({deleted_count}):")
+                lines.append(f"  • {deleted_count} tasks removed from database")
+                lines.append("")
 
             # Show overall summary
             total_changes = completed_count + reopened_count + new_tasks_count + deleted_count + dismissed_count
-            click.echo(f"📈 Total changes: {total_changes}")
+            lines.append(f"📈 Total changes: {total_changes}")
+            click.echo("\n".join(lines))
 
         else:
             click.echo("📝 No changes were made to tasks.")
@@ -781,12 +780,10 @@ def fine_command():
         With -s done: Shows completed tasks instead of open ones
         With -s done,open: Shows both completed and open tasks
         """
-        # Set verbose environment variable for DatabaseManager
-        if verbose:
-            os.environ["FIN_VERBOSE"] = "1"
+        from fincli.editor import EditorManager
 
         # Call the original open_editor function directly
-        db_manager = _get_db_manager()
+        db_manager = _get_db_manager(verbose)
         editor_manager = EditorManager(db_manager)
 
         # Validate conflicting time filters
@@ -829,81 +826,63 @@ def fine_command():
         # Get tasks for editing
         label_filter = label[0] if label else None
 
-        # Get all tasks first, then apply status filtering
-        all_tasks = editor_manager.task_manager.list_tasks(include_completed=True)
-
-        # Apply status filtering first
-        filtered_tasks = []
-        for task in all_tasks:
-            # Normalize status values to handle shorthand letters
-            normalized_status_list = []
-            for status in status_list:
-                if status in ["o", "open"]:
-                    normalized_status_list.append("open")
-                elif status in ["d", "done"]:
-                    normalized_status_list.append("done")
-                elif status in ["a", "all"]:
-                    normalized_status_list.append("all")
-                elif status == "completed":
-                    normalized_status_list.append("completed")
-                else:
-                    normalized_status_list.append(status)
-
-            if "open" in normalized_status_list and task["completed_at"] is None:
-                filtered_tasks.append(task)
-            elif "completed" in normalized_status_list and task["completed_at"] is not None:
-                filtered_tasks.append(task)
-            elif "done" in normalized_status_list and task["completed_at"] is not None:
-                filtered_tasks.append(task)
-            elif "all" in normalized_status_list:
-                filtered_tasks.append(task)
-
-        # Now apply additional filters
+        # Resolve the date window and label up front so they are applied in SQL
+        since = until = None
+        label_filters = None
         if today:
             # Override to show only today's tasks
-            today_date = date.today()
-            today_filtered_tasks = []
-            for task in filtered_tasks:
-                if task["completed_at"]:
-                    # For completed tasks, check if completed today
-                    completed_dt = datetime.fromisoformat(task["completed_at"].replace("Z", "+00:00"))
-                    if completed_dt.date() == today_date:
-                        today_filtered_tasks.append(task)
-                else:
-                    # For open tasks, check if created today
-                    created_dt = datetime.fromisoformat(task["created_at"].replace("Z", "+00:00"))
-                    if created_dt.date() == today_date:
-                        today_filtered_tasks.append(task)
-            filtered_tasks = today_filtered_tasks
+            since = until = datetime.now().date()
         elif date:
-            # For date-based filtering, filter by date after status filtering
-            from fincli.utils import filter_tasks_by_date_range
-
-            filtered_tasks = filter_tasks_by_date_range(filtered_tasks, target_date=date)
+            try:
+                since = until = datetime.strptime(date, "%Y-%m-%d").date()
+            except ValueError:
+                click.echo(f"❌ Error: Invalid date format '{date}'. Use YYYY-MM-DD")
+                return
         elif label:
-            # For label-based filtering, filter by label after status filtering
-            label_filter = label[0] if label else None
-            if label_filter:
-                filtered_tasks = [t for t in filtered_tasks if t.get("labels") and label_filter in t["labels"]]
+            # Label-based filtering does not restrict the date window
+            label_filters = [label_filter] if label_filter else None
         elif days is not None:
-            # For days-based filtering, apply date filtering after status filtering
-            from fincli.utils import filter_tasks_by_date_range
-
             # Get weekdays_only configuration
-            config = Config()
+            config = _get_config()
             weekdays_only = config.get_weekdays_only_lookback()
 
-            # Convert days to integer (Click passes it as string)
-            days_int = int(days)
+            # Convert days to integer (Click passes it as string); 0 means all time
+            until, since = get_date_range(int(days), weekdays_only)
+            if since is None:
+                until = None
+
+        want_open, want_completed = _status_wants(status_list)
+
+        # Days-based windows keep the priority ordering, so they can only be
+        # cut to max_limit after sorting; otherwise the query's newest-first
+        # order is final and the limit is applied in SQL (one extra row tells
+        # whether anything was cut)
+        sort_by_priority = not (today or date or label) and days is not None and since is not None
+        query_limit = None if sort_by_priority else max_limit + 1
+
+        # Date window, labels and status are all applied by the query
+        if want_open or want_completed:
+            filtered_tasks = editor_manager.task_manager.list_tasks(
+                include_completed=want_completed,
+                since=since,
+                until=until,
+                labels=label_filters,
+                completed_only=not want_open,
+                limit=query_limit,
+            )
+        else:
+            filtered_tasks = []
 
-            if days_int != 0:
-                # Apply date filtering (days > 0)
-                filtered_tasks = filter_tasks_by_date_range(filtered_tasks, days=days_int, weekdays_only=weekdays_only)
+        if sort_by_priority:
+            sort_tasks_by_priority(filtered_tasks)
 
         # Apply max limit
         if len(filtered_tasks) > max_limit:
             if verbose:
-                click.echo(f"⚠️  Warning: Found {len(filtered_tasks)} tasks, showing first {max_limit} due to max_limit")
+                if query_limit is None:
+                    click.echo(f"⚠️  Warning: Found {len(filtered_tasks)} tasks, showing first {max_limit} due to max_limit")
+                else:
+                    click.echo(f"⚠️  Warning: Found more than {max_limit} tasks, showing first {max_limit} due to max_limit")
             filtered_tasks = filtered_tasks[:max_limit]
 
         tasks = filtered_tasks
@@ -931,9 +910,9 @@ def fine_command():
         # NOTE: Tests should NEVER reach this point - they should use dry-run or test
         # the parsing logic directly with parse_edited_content
         try:
-            # Get the state before editing for comparison
-            original_tasks = tasks.copy()
-            original_completed = [t for t in original_tasks if t.get("completed_at")]
+            # Snapshot the state before editing for comparison
+            original_completed_ids = frozenset(t["id"] for t in tasks if t.get("completed_at"))
+            max_id_before = editor_manager.task_manager.get_max_task_id()
 
             # Pass the already filtered tasks directly to avoid re-filtering
             (
@@ -948,8 +927,15 @@ def fine_command():
             # Get the state after editing for detailed comparison
             # Use the same filtered tasks to maintain consistency with what was edited
             updated_tasks = tasks
-            updated_completed = [t for t in updated_tasks if t.get("completed_at")]
-            updated_open = [t for t in updated_tasks if not t.get("completed_at")]
+            # Split the edited tasks against the snapshot in a single pass
+            newly_completed = []
+            newly_reopened = []
+            for t in updated_tasks:
+                if t.get("completed_at"):
+                    if t["id"] not in original_completed_ids:
+                        newly_completed.append(t)
+                elif t["id"] in original_completed_ids:
+                    newly_reopened.append(t)
 
             changes_made = completed_count > 0 or reopened_count > 0 or new_tasks_count > 0 or content_modified_count > 0 or deleted_count > 0 or dismissed_count > 0
 
@@ -960,8 +946,6 @@ def fine_command():
                 # Show completed tasks
                 if completed_count > 0:
                     click.echo(f"✅ Completed ({completed_count}):")
-                    original_completed_ids = {t["id"] for t in original_completed}
-                    newly_completed = [t for t in updated_completed if t["id"] not in original_completed_ids]
                     for task in newly_completed:
                         click.echo(f"  • {task['content']}")
                     click.echo()
@@ -969,7 +953,6 @@ def fine_command():
                 # Show reopened tasks
                 if reopened_count > 0:
                     click.echo(f"🔄 Reopened ({reopened_count}):")
-                    newly_reopened = [t for t in updated_open if t["id"] in original_completed_ids]
                     for task in newly_reopened:
                         click.echo(f"  • {task['content']}")
                     click.echo()
@@ -983,13 +966,9 @@ def fine_command():
                 # Show new tasks
                 if new_tasks_count > 0:
                     click.echo(f"📝 Added ({new_tasks_count}):")
-                    # Get the most recent tasks that weren't in the original list
-                    all_tasks = editor_manager.task_manager.list_tasks(include_completed=True)
-                    original_ids = {t["id"] for t in original_tasks}
-                    new_tasks = [t for t in all_tasks if t["id"] not in original_ids]
-                    # Sort by creation time (newest first) and take the most recent ones
-                    new_tasks.sort(key=lambda x: x["created_at"], reverse=True)
-                    for task in new_tasks[:new_tasks_count]:
+                    # Tasks added in the editor are the ones with IDs past the pre-edit maximum
+                    new_tasks = editor_manager.task_manager.list_tasks_since_max_id(max_id_before, new_tasks_count)
+                    for task in new_tasks:
                         labels_str = f" [{', '.join(task['labels'])}]" if task["labels"] else ""
                         click.echo(f"  • {task['content']}{labels_str}")
                     click.echo()
@@ -1073,10 +1052,6 @@ def fins_command():
     )
     def fins_cli(content, days, max_limit, label, today, status, due, verbose):
         """Query and display completed tasks, or add completed tasks."""
-        # Set verbose environment variable for DatabaseManager
-        if verbose:
-            os.environ["FIN_VERBOSE"] = "1"
-
         # Parse status parameter (allow comma-separated values with flexible spacing)
         status_list = []
         if status:
@@ -1089,7 +1064,7 @@ def fins_command():
         # If content is provided, add it as a completed task
         if content:
             task_content = " ".join(content)
-            db_manager = _get_db_manager()
+            db_manager = _get_db_manager(verbose)
             task_manager = TaskManager(db_manager)
 
             # Add the task as completed
@@ -1107,8 +1082,9 @@ def fins_command():
             return
 
         # Otherwise, show tasks (existing behavior)
-        db_manager = _get_db_manager()
+        db_manager = _get_db_manager(verbose)
         task_manager = TaskManager(db_manager)
+        weekdays_only = _get_config().get_weekdays_only_lookback()
 
         # Only show verbose information about filtering criteria when -v flag is used
         if verbose:
@@ -1131,98 +1107,52 @@ def fins_command():
                 click.echo(f"   • Due date: {due}")
 
             # Show weekday configuration information
-            config = Config()
-            weekdays_only = config.get_weekdays_only_lookback()
             if weekdays_only:
                 click.echo("   • Weekdays only: True (Mon-Fri)")
             else:
                 click.echo("   • Weekdays only: False (all days)")
             click.echo()
 
-        # Get tasks (include completed tasks for status filtering)
-        tasks = task_manager.list_tasks(include_completed=True)
-
-        # Apply date filtering first
+        # Apply date and status filtering in the query itself
+        want_open, want_completed = _status_wants(status_list)
         if today:
             # Override to show only today's tasks
             # Filter to only tasks completed today (not from last 1 day)
-            today_date = date.today()
-            filtered_tasks = []
-            for task in tasks:
-                if task["completed_at"]:
-                    # For completed tasks, check if completed today
-                    completed_dt = datetime.fromisoformat(task["completed_at"].replace("Z", "+00:00"))
-                    if completed_dt.date() == today_date:
-                        filtered_tasks.append(task)
-                else:
-                    # For open tasks, check if created today
-                    created_dt = datetime.fromisoformat(task["created_at"].replace("Z", "+00:00"))
-                    if created_dt.date() == today_date:
-                        filtered_tasks.append(task)
-            tasks = filtered_tasks
-        elif days is not None:
-            # User specified days
-            days_int = int(days)
-            config = Config()
-            weekdays_only = config.get_weekdays_only_lookback()
-
-            if days_int == 0:
-                # -d 0 means all time, no date filtering
-                pass  # Keep all tasks
-            else:
-                # Apply date filtering
-                tasks = filter_tasks_by_date_range(tasks, days=days_int, weekdays_only=weekdays_only)
+            since = until = date.today()
+            sort_by_priority = False
         else:
-            # Default: show tasks from past 2 days
-            config = Config()
-            weekdays_only = config.get_weekdays_only_lookback()
-            tasks = filter_tasks_by_date_range(tasks, days=2, weekdays_only=weekdays_only)
-
-        # Apply status filtering
-        filtered_tasks = []
-        for task in tasks:
-            # Normalize status values to handle shorthand letters
-            normalized_status_list = []
-            for status in status_list:
-                if status in ["o", "open"]:
-                    normalized_status_list.append("open")
-                elif status in ["d", "done"]:
-                    normalized_status_list.append("done")
-                elif status in ["a", "all"]:
-                    normalized_status_list.append("all")
-                elif status == "completed":
-                    normalized_status_list.append("completed")
-                else:
-                    normalized_status_list.append(status)
-
-            if "open" in normalized_status_list and task["completed_at"] is None:
-                filtered_tasks.append(task)
-            elif "completed" in normalized_status_list and task["completed_at"] is not None:
-                filtered_tasks.append(task)
-            elif "done" in normalized_status_list and task["completed_at"] is not None:
-                filtered_tasks.append(task)
-            elif "all" in normalized_status_list:
-                filtered_tasks.append(task)
+            # User specified days, default: show tasks from past 2 days
+            days_int = int(days) if days is not None else 2
+
+            # -d 0 means all time, no date filtering
+            today_date, since = get_date_range(days_int, weekdays_only)
+            until = today_date if since else None
+            sort_by_priority = since is not None
+
+        # Priority-sorted windows can only be cut after sorting; otherwise the
+        # limit goes into the query, with one extra row to tell if it was hit
+        query_limit = None if sort_by_priority else max_limit + 1
+        if want_open or want_completed:
+            filtered_tasks = task_manager.list_tasks(include_completed=want_completed, since=since, until=until, completed_only=not want_open, limit=query_limit)
+        else:
+            filtered_tasks = []
+        if sort_by_priority:
+            sort_tasks_by_priority(filtered_tasks)
 
         # Apply max limit
-        total_tasks = len(filtered_tasks)
-        if total_tasks > max_limit:
+        if len(filtered_tasks) > max_limit:
             if verbose:
-                click.echo(f"⚠️  Warning: Found {total_tasks} tasks, showing first {max_limit} due to max_limit")
+                if query_limit is None:
+                    click.echo(f"⚠️  Warning: Found {len(filtered_tasks)} tasks, showing first {max_limit} due to max_limit")
+                else:
+                    click.echo(f"⚠️  Warning: Found more than {max_limit} tasks, showing first {max_limit} due to max_limit")
             filtered_tasks = filtered_tasks[:max_limit]
 
         # Apply label filtering if requested
         if label:
-            # Simple label filtering - could be enhanced
-            label_filtered_tasks = []
-            for task in filtered_tasks:
-                if task.get("labels"):
-                    task_labels = [label.lower() for label in task["labels"]]
-                    for requested_label in label:
-                        if requested_label.lower() in task_labels:
-                            label_filtered_tasks.append(task)
-                            break
-            filtered_tasks = label_filtered_tasks
+            # Keep tasks carrying any of the requested labels
+            requested = {requested_label.lower() for requested_label in label}
+            filtered_tasks = [task for task in filtered_tasks if task.get("labels") and not requested.isdisjoint(task_label.lower() for task_label in task["labels"])]
 
         # Apply due date filtering if requested
         if due:
@@ -1278,12 +1208,8 @@ def fins_command():
                 # Add completion date for completed tasks
                 date_display = ""
                 if task.get("completed_at"):
-                    try:
-                        completed_dt = datetime.fromisoformat(task["completed_at"].replace("Z", "+00:00"))
-                        date_display = f" {completed_dt.strftime('%Y-%m-%d')}"
-                    except (ValueError, TypeError):
-                        # Fallback if date parsing fails
-                        date_display = ""
+                    # Stored timestamps start with the ISO date
+                    date_display = f" {task['completed_at'][:10]}"
 
                 labels_display = ""
                 if task.get("labels"):
@@ -1292,8 +1218,7 @@ def fins_command():
 
                     visible_labels = filter_hidden_labels(task["labels"], verbose=False)
                     if visible_labels:
-                        hashtags = [f"#{label}" for label in visible_labels]
-                        labels_display = f"  {','.join(hashtags)}"
+                        labels_display = "  " + ",".join(f"#{label}" for label in visible_labels)
 
                 click.echo(f"{status_symbol}{date_display} {content}{labels_display}")
 
@@ -1301,6 +1226,50 @@ def fins_command():
     fins_cli()
 
 
+def _lookup_tasks(task_manager, task_identifier, messages):
+    """Yield (task_id, task) for each task ID argument, adding a message for invalid or missing IDs."""
+    # Parse every argument first so all the tasks can be fetched in one query
+    parsed = []
+    for identifier in task_identifier:
+        try:
+            parsed.append((identifier, int(identifier)))
+        except ValueError:
+            parsed.append((identifier, None))
+    tasks_by_id = task_manager.get_tasks_by_ids(task_id for _, task_id in parsed if task_id is not None)
+
+    for identifier, task_id in parsed:
+        if task_id is None:
+            messages.append(f"❌ Error: '{identifier}' is not a valid task ID (must be a number)")
+            continue
+
+        task = tasks_by_id.get(task_id)
+        if task:
+            yield task_id, task
+        else:
+            messages.append(f"❌ Task {task_id} not found")
+
+
+def _toggle_tasks(task_manager, task_identifier):
+    """Toggle the completion status of the given task IDs in one transaction and report the results."""
+    messages = []
+    # Completion state per task as of this command, so repeated IDs keep toggling
+    states = {}
+    toggled_count = 0
+    for task_id, task in _lookup_tasks(task_manager, task_identifier, messages):
+        new_status = not states.get(task_id, bool(task["completed_at"]))
+        states[task_id] = new_status
+        status_text = "completed" if new_status else "reopened"
+        messages.append(f"✅ {status_text.title()} task {task_id}: {task['content']}")
+        toggled_count += 1
+
+    task_manager.bulk_update_completion(states.items())
+    if messages:
+        click.echo("\n".join(messages))
+
+    if toggled_count > 0:
+        click.echo(f"🎉 Toggled {toggled_count} task(s)")
+
+
 @cli.command(name="close")
 @click.argument("task_identifier", nargs=-1)
 @click.option("--verbose", "-v", is_flag=True, help="Show verbose output")
@@ -1312,38 +1281,25 @@ def close_task(task_identifier, verbose):
         click.echo("            fin close 1 2 3")
         return
 
-    # Set verbose environment variable for DatabaseManager
-    if verbose:
-        os.environ["FIN_VERBOSE"] = "1"
-
-    db_manager = _get_db_manager()
+    db_manager = _get_db_manager(verbose)
     task_manager = TaskManager(db_manager)
 
-    # Get all tasks to search through
-    all_tasks = task_manager.list_tasks(include_completed=True)
+    messages = []
+    completed_ids = []
+    for task_id, task in _lookup_tasks(task_manager, task_identifier, messages):
+        if task["completed_at"] or task_id in completed_ids:
+            messages.append(f"⚠️  Task {task_id} is already completed")
+        else:
+            completed_ids.append(task_id)
+            messages.append(f"✅ Marked task {task_id} as completed: {task['content']}")
 
-    completed_count = 0
+    # Apply all changes in one transaction, then report
+    task_manager.bulk_update_completion((task_id, True) for task_id in completed_ids)
+    if messages:
+        click.echo("\n".join(messages))
 
-    for identifier in task_identifier:
-        # Try to parse as integer (task ID)
-        try:
-            task_id = int(identifier)
-            # Find task by ID
-            task = next((task for task in all_tasks if task["id"] == task_id), None)
-            if task:
-                if task["completed_at"]:
-                    click.echo(f"⚠️  Task {task_id} is already completed")
-                else:
-                    task_manager.update_task_completion(task_id, True)
-                    click.echo(f"✅ Marked task {task_id} as completed: {task['content']}")
-                    completed_count += 1
-            else:
-                click.echo(f"❌ Task {task_id} not found")
-        except ValueError:
-            click.echo(f"❌ Error: '{identifier}' is not a valid task ID (must be a number)")
-
-    if completed_count > 0:
-        click.echo(f"🎉 Completed {completed_count} task(s)")
+    if completed_ids:
+        click.echo(f"🎉 Completed {len(completed_ids)} task(s)")
 
 
 @cli.command(name="dismiss")
@@ -1357,44 +1313,29 @@ def dismiss_task(task_identifier, verbose):
         click.echo("            fin dismiss 1 2 3")
         return
 
-    # Set verbose environment variable for DatabaseManager
-    if verbose:
-        os.environ["FIN_VERBOSE"] = "1"
-
-    db_manager = _get_db_manager()
+    db_manager = _get_db_manager(verbose)
     task_manager = TaskManager(db_manager)
 
-    # Get all tasks to search through
-    all_tasks = task_manager.list_tasks(include_completed=True)
-
-    dismissed_count = 0
+    messages = []
+    dismissed = {}
+    for task_id, task in _lookup_tasks(task_manager, task_identifier, messages):
+        # Check if already dismissed (has dismissed label)
+        if task_id in dismissed or "dismissed" in [label.lower() for label in task.get("labels", [])]:
+            messages.append(f"⚠️  Task {task_id} is already dismissed")
+        else:
+            dismissed[task_id] = task
+            messages.append(f"🚫 Dismissed task {task_id}: {task['content']}")
 
-    for identifier in task_identifier:
-        # Try to parse as integer (task ID)
-        try:
-            task_id = int(identifier)
-            # Find task by ID
-            task = next((task for task in all_tasks if task["id"] == task_id), None)
-            if task:
-                # Check if already dismissed (has dismissed label)
-                if "dismissed" in [label.lower() for label in task.get("labels", [])]:
-                    click.echo(f"⚠️  Task {task_id} is already dismissed")
-                else:
-                    # Mark as completed
-                    task_manager.update_task_completion(task_id, True)
-                    # Add dismissed label
-                    current_labels = task.get("labels", [])
-                    new_labels = current_labels + ["dismissed"]
-                    task_manager.update_task_labels(task_id, new_labels)
-                    click.echo(f"🚫 Dismissed task {task_id}: {task['content']}")
-                    dismissed_count += 1
-            else:
-                click.echo(f"❌ Task {task_id} not found")
-        except ValueError:
-            click.echo(f"❌ Error: '{identifier}' is not a valid task ID (must be a number)")
+    # Mark as completed and add the dismissed label in one transaction
+    task_manager.bulk_update_completion(
+        ((task_id, True) for task_id in dismissed),
+        label_updates={task_id: task.get("labels", []) + ["dismissed"] for task_id, task in dismissed.items()},
+    )
+    if messages:
+        click.echo("\n".join(messages))
 
-    if dismissed_count > 0:
-        click.echo(f"🎉 Dismissed {dismissed_count} task(s)")
+    if dismissed:
+        click.echo(f"🎉 Dismissed {len(dismissed)} task(s)")
 
 
 @cli.command(name="toggle")
@@ -1408,37 +1349,10 @@ def toggle_task(task_identifier, verbose):
         click.echo("            fin toggle 1 2 3")
         return
 
-    # Set verbose environment variable for DatabaseManager
-    if verbose:
-        os.environ["FIN_VERBOSE"] = "1"
-
-    db_manager = _get_db_manager()
+    db_manager = _get_db_manager(verbose)
     task_manager = TaskManager(db_manager)
 
-    # Get all tasks to search through
-    all_tasks = task_manager.list_tasks(include_completed=True)
-
-    toggled_count = 0
-
-    for identifier in task_identifier:
-        # Try to parse as integer (task ID)
-        try:
-            task_id = int(identifier)
-            # Find task by ID
-            task = next((task for task in all_tasks if task["id"] == task_id), None)
-            if task:
-                new_status = not task["completed_at"]
-                task_manager.update_task_completion(task_id, new_status)
-                status_text = "completed" if new_status else "reopened"
-                click.echo(f"✅ {status_text.title()} task {task_id}: {task['content']}")
-                toggled_count += 1
-            else:
-                click.echo(f"❌ Task {task_id} not found")
-        except ValueError:
-            click.echo(f"❌ Error: '{identifier}' is not a valid task ID (must be a number)")
-
-    if toggled_count > 0:
-        click.echo(f"🎉 Toggled {toggled_count} task(s)")
+    _toggle_tasks(task_manager, task_identifier)
 
 
 @cli.command(name="t")
@@ -1453,42 +1367,17 @@ def toggle_alias(task_identifier, verbose):
         click.echo("            fin t 1 2 3")
         return
 
-    # Set verbose environment variable for DatabaseManager
-    if verbose:
-        os.environ["FIN_VERBOSE"] = "1"
-
-    db_manager = _get_db_manager()
+    db_manager = _get_db_manager(verbose)
     task_manager = TaskManager(db_manager)
 
-    # Get all tasks to search through
-    all_tasks = task_manager.list_tasks(include_completed=True)
-
-    toggled_count = 0
-
-    for identifier in task_identifier:
-        # Parse as integer (task ID)
-        try:
-            task_id = int(identifier)
-            # Find task by ID
-            task = next((task for task in all_tasks if task["id"] == task_id), None)
-            if task:
-                new_status = not task["completed_at"]
-                task_manager.update_task_completion(task_id, new_status)
-                status_text = "completed" if new_status else "reopened"
-                click.echo(f"✅ {status_text.title()} task {task_id}: {task['content']}")
-                toggled_count += 1
-            else:
-                click.echo(f"❌ Task {task_id} not found")
-        except ValueError:
-            click.echo(f"❌ Error: '{identifier}' is not a valid task ID (must be a number)")
-
-    if toggled_count > 0:
-        click.echo(f"🎉 Toggled {toggled_count} task(s)")
+    _toggle_tasks(task_manager, task_identifier)
 
 
 @cli.command(name="list-labels")
 def list_labels():
     """List all known labels with task counts."""
+    from fincli.labels import LabelManager
+
     db_manager = _get_db_manager()
     label_manager = LabelManager(db_manager)
 
@@ -1511,6 +1400,8 @@ def list_labels():
 @click.option("--description", "-d", help="Description of what changed")
 def create_backup(description):
     """Create a backup of the current database."""
+    from fincli.backup import DatabaseBackup
+
     db_manager = _get_db_manager()
     backup_manager = DatabaseBackup(db_manager.db_path)
 
@@ -1525,6 +1416,8 @@ def create_backup(description):
 @cli.command(name="list-backups")
 def list_backups():
     """List all available backups."""
+    from fincli.backup import DatabaseBackup
+
     db_manager = _get_db_manager()
     backup_manager = DatabaseBackup(db_manager.db_path)
 
@@ -1548,6 +1441,8 @@ def list_backups():
 @click.option("--yes", "-y", is_flag=True, help="Skip confirmation prompt (alias for --force)")
 def restore_backup(backup_id, force, yes):
     """Restore database from a backup."""
+    from fincli.backup import DatabaseBackup
+
     db_manager = _get_db_manager()
     backup_manager = DatabaseBackup(db_manager.db_path)
 
@@ -1571,6 +1466,8 @@ def restore_backup(backup_id, force, yes):
 @click.option("--yes", "-y", is_flag=True, help="Skip confirmation prompt (alias for --force)")
 def restore_latest_backup(force, yes):
     """Restore database from the latest backup."""
+    from fincli.backup import DatabaseBackup
+
     db_manager = _get_db_manager()
     backup_manager = DatabaseBackup(db_manager.db_path)
 
@@ -1672,22 +1569,23 @@ def export_tasks(file_path, format, include_completed):
     db_manager = _get_db_manager()
     task_manager = TaskManager(db_manager)
 
-    # Get all tasks
-    tasks = task_manager.list_tasks(include_completed=include_completed)
+    # Count up front so the tasks themselves can be streamed to the file
+    task_count = task_manager.count_tasks(include_completed=include_completed)
 
-    if not tasks:
+    if not task_count:
         click.echo("📝 No tasks found to export.")
         return
 
     try:
+        tasks = task_manager.iter_tasks(include_completed=include_completed)
         if format == "csv":
             _export_csv(tasks, file_path)
         elif format == "json":
             _export_json(tasks, file_path)
         elif format == "txt":
-            _export_txt(tasks, file_path)
+            _export_txt(tasks, file_path, task_count)
 
-        click.echo(f"✅ Exported {len(tasks)} tasks to {file_path}")
+        click.echo(f"✅ Exported {task_count} tasks to {file_path}")
 
     except Exception as e:
         click.echo(f"❌ Export failed: {e}")
@@ -1732,25 +1630,26 @@ def _export_json(tasks, file_path):
     """Export tasks to JSON format."""
     import json
 
-    # Convert tasks to serializable format
-    export_data = []
-    for task in tasks:
-        export_task = {
-            "id": task["id"],
-            "content": task["content"],
-            "status": "completed" if task["completed_at"] else "open",
-            "created_at": task["created_at"],
-            "completed_at": task["completed_at"],
-            "labels": task.get("labels", []),
-            "source": task.get("source", "cli"),
-        }
-        export_data.append(export_task)
-
+    # Write the array one task at a time, laid out as json.dump(..., indent=2) would
     with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(export_data, f, indent=2, ensure_ascii=False)
-
-
-def _export_txt(tasks, file_path):
+        separator = "[\n"
+        for task in tasks:
+            export_task = {
+                "id": task["id"],
+                "content": task["content"],
+                "status": "completed" if task["completed_at"] else "open",
+                "created_at": task["created_at"],
+                "completed_at": task["completed_at"],
+                "labels": task.get("labels", []),
+                "source": task.get("source", "cli"),
+            }
+            f.write(separator)
+            f.write("  " + json.dumps(export_task, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+            separator = ",\n"
+        f.write("[]" if separator == "[\n" else "\n]")
+
+
+def _export_txt(tasks, file_path, task_count):
     """Export tasks to plain text format using editor format."""
     from fincli.editor import EditorManager
 
@@ -1758,7 +1657,7 @@ def _export_txt(tasks, file_path):
     editor_manager = EditorManager(db_manager)
 
     with open(file_path, "w", encoding="utf-8") as f:
-        f.write(f"# FinCLI Task Export - {len(tasks)} tasks\n")
+        f.write(f"# FinCLI Task Export - {task_count} tasks\n")
         f.write(f"# Exported on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
 
         for task in tasks:
@@ -1918,7 +1817,7 @@ def _import_csv(task_manager, file_path, additional_labels):
     """Import tasks from CSV format."""
     import csv
 
-    imported_count = 0
+    pending_tasks = []
 
     with open(file_path, "r", newline="", encoding="utf-8") as csvfile:
         reader = csv.DictReader(csvfile)
@@ -1936,18 +1835,18 @@ def _import_csv(task_manager, file_path, additional_labels):
             # Add additional labels
             labels.extend(additional_labels)
 
-            # Add task
-            task_manager.add_task(content, labels, source="csv-import")
-            imported_count += 1
+            pending_tasks.append({"content": content, "labels": labels, "source": "csv-import"})
 
-    return imported_count
+    # Add all tasks in one transaction
+    return len(task_manager.add_tasks(pending_tasks))
 
 
 def _import_json(task_manager, file_path, additional_labels):
     """Import tasks from JSON format."""
     import json
 
-    imported_count = 0
+    pending_tasks = []
+    completed = []
 
     with open(file_path, "r", encoding="utf-8") as f:
         data = json.load(f)
@@ -1961,15 +1860,16 @@ def _import_json(task_manager, file_path, additional_labels):
         labels = task_data.get("labels", [])
         labels.extend(additional_labels)
 
-        # Add task
-        task_id = task_manager.add_task(content, labels, source="json-import")
-        imported_count += 1
+        pending_tasks.append({"content": content, "labels": labels, "source": "json-import"})
 
         # Mark as completed if it was completed in the export
-        if task_data.get("status") == "completed" and task_data.get("completed_at"):
-            task_manager.update_task_completion(task_id, True)
+        completed.append(task_data.get("status") == "completed" and bool(task_data.get("completed_at")))
 
-    return imported_count
+    # Add all tasks in one transaction, then complete the ones that were completed
+    task_ids = task_manager.add_tasks(pending_tasks)
+    task_manager.bulk_update_completion((task_id, True) for task_id, is_completed in zip(task_ids, completed) if is_completed)
+
+    return len(task_ids)
 
 
 def _import_txt(task_manager, file_path, additional_labels):
@@ -1979,7 +1879,8 @@ def _import_txt(task_manager, file_path, additional_labels):
     db_manager = _get_db_manager()
     editor_manager = EditorManager(db_manager)
 
-    imported_count = 0
+    pending_tasks = []
+    completed = []
 
     with open(file_path, "r", encoding="utf-8") as f:
         for line_num, line in enumerate(f, 1):
@@ -2002,15 +1903,16 @@ def _import_txt(task_manager, file_path, additional_labels):
             labels = task_info.get("labels", [])
             labels.extend(additional_labels)
 
-            # Add task
-            task_id = task_manager.add_task(task_info["content"], labels, source="txt-import")
-            imported_count += 1
+            pending_tasks.append({"content": task_info["content"], "labels": labels, "source": "txt-import"})
 
             # Mark as completed if it was completed in the export
-            if task_info["is_completed"]:
-                task_manager.update_task_completion(task_id, True)
+            completed.append(task_info["is_completed"])
+
+    # Add all tasks in one transaction, then complete the ones that were completed
+    task_ids = task_manager.add_tasks(pending_tasks)
+    task_manager.bulk_update_completion((task_id, True) for task_id, is_completed in zip(task_ids, completed) if is_completed)
 
-    return imported_count
+    return len(task_ids)
 
 
 @cli.command(name="digest")
@@ -2029,6 +1931,8 @@ def _import_txt(task_manager, file_path, additional_labels):
 )
 def digest(output_format, period):
     """Generate a digest report."""
+    from fincli.analytics import AnalyticsManager
+
     db_manager = _get_db_manager()
     analytics_manager = AnalyticsManager(db_manager)
 
@@ -2054,6 +1958,8 @@ def digest(output_format, period):
 @click.option("--overdue", is_flag=True, help="Show only overdue tasks")
 def report(output_format, period, output, overdue):
     """Generate a detailed analytics report."""
+    from fincli.analytics import AnalyticsManager
+
     db_manager = _get_db_manager()
     analytics_manager = AnalyticsManager(db_manager)
 
@@ -2137,13 +2043,16 @@ def context_command(action, name, description, force):
             click.echo("❌ Context name is required for show")
             sys.exit(1)
         task_manager = TaskManager(db_manager)
-        tasks = task_manager.list_tasks(include_completed=True, context=name)
+        # Only counts are needed, so stream the tasks instead of building a list
+        total_count = completed_count = 0
+        for task in task_manager.iter_tasks(include_completed=True, context=name):
+            total_count += 1
+            if task["completed_at"]:
+                completed_count += 1
         click.echo(f"📁 Context: {name}")
-        click.echo(f"📊 Total tasks: {len(tasks)}")
-        open_tasks = [t for t in tasks if not t["completed_at"]]
-        click.echo(f"📝 Open tasks: {len(open_tasks)}")
-        completed_tasks = [t for t in tasks if t["completed_at"]]
-        click.echo(f"✅ Completed tasks: {len(completed_tasks)}")
+        click.echo(f"📊 Total tasks: {total_count}")
+        click.echo(f"📝 Open tasks: {total_count - completed_count}")
+        click.echo(f"✅ Completed tasks: {completed_count}")
 
 
 @cli.command(name="context-label-filter")
@@ -2152,7 +2061,7 @@ def context_command(action, name, description, force):
 @click.option("--filter", help="Label filter expression (e.g., 'NOT backlog')")
 def context_label_filter_command(action, context, filter):
     """Manage default label filters for contexts."""
-    config = Config()
+    config = _get_config()
 
     if action == "set":
         if not context or not filter:
@@ -2231,7 +2140,7 @@ def config_command(
     task_date_format,
 ):
     """Manage FinCLI configuration."""
-    config = Config()
+    config = _get_config()
 
     if auto_today is not None:
         config.set_auto_today_for_important(auto_today)
@@ -2358,12 +2267,9 @@ def main():
 
     # If no arguments provided or only verbose/days/label flags, default to list behavior
     if not args or (args and all(arg in ["--verbose", "-v"] for arg in args)) or label_args:
-        if verbose:
-            os.environ["FIN_VERBOSE"] = "1"
-
-        db_manager = _get_db_manager()
+        db_manager = _get_db_manager(verbose)
         task_manager = TaskManager(db_manager)
-        config = Config()
+        config = _get_config()
 
         # Determine whether to show all open tasks or just recent ones
         show_all_open = config.get_show_all_open_by_default()
@@ -2452,8 +2358,9 @@ def main():
             # Show recent open tasks (default behavior or days-specified)
             days = days_arg if days_arg is not None else config.get_default_days()
             weekdays_only = config.get_weekdays_only_lookback()
-            tasks = task_manager.list_tasks(include_completed=True)
-            tasks = filter_tasks_by_date_range(tasks, days=days, weekdays_only=weekdays_only)
+            today_date, lookback_date = get_date_range(days, weekdays_only)
+            tasks = task_manager.list_tasks(include_completed=True, since=lookback_date, until=today_date if lookback_date else None)
+            sort_tasks_by_priority(tasks)
             tasks = [task for task in tasks if task["completed_at"] is None]
 
             # Apply label filtering (explicit labels override default filter)
@@ -2615,6 +2522,10 @@ def main():
 def sync_sheets_command(sheet_name, dry_run, purge_after_import, token_path, sheet_id, verbose):
     """Sync tasks from Google Sheets."""
     try:
+        from fincli.sheets_connector import create_sheets_reader_from_token
+        from fincli.sync_engine import SyncEngine
+        from fincli.sync_strategies import RemoteSystemType, SyncStrategyFactory
+
         # Get sheet ID from environment or parameter
         sheet_id = sheet_id or os.environ.get("SHEET_ID")
         if not sheet_id:
@@ -2730,6 +2641,8 @@ def hidden_labels_command():
 def sync_status_command(source, verbose):
     """Show sync status for remote tasks."""
     try:
+        from fincli.sync_engine import SyncEngine
+
         db_manager = _get_db_manager()
         task_manager = TaskManager(db_manager)
         sync_engine = SyncEngine(db_manager, task_manager)
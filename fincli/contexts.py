@@ -59,7 +59,7 @@ class ContextManager:
 
             # Get unique contexts from tasks table
             cursor.execute("SELECT DISTINCT context FROM tasks WHERE context IS NOT NULL ORDER BY context")
-            contexts = [row[0] for row in cursor.fetchall()]
+            contexts = [row[0] for row in cursor]
 
             # Always include default context
             if cls.DEFAULT_CONTEXT not in contexts:
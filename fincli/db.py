@@ -4,15 +4,49 @@ Database module for FinCLI
 Handles SQLite connection and schema management.
 """
 
+import contextlib
 import os
 from pathlib import Path
 import sqlite3
+import threading
 from typing import Optional
 
 
+def _split_labels_cte(source: str) -> str:
+    """
+    Build a WITH clause that splits comma-separated labels into rows.
+
+    The split walks the CSV with instr/substr, so any label text survives
+    it unchanged. The resulting label_split(task_id, value) rows include an
+    empty seed value per task, which callers filter out.
+
+    Args:
+        source: SQL query yielding (task_id, labels) rows, e.g.
+            "SELECT NEW.id AS task_id, NEW.labels AS labels"
+
+    Returns:
+        SQL WITH clause defining label_split
+    """
+    return f"""
+        WITH RECURSIVE label_split(task_id, value, rest) AS (
+            SELECT task_id, '', labels || ',' FROM ({source})
+            UNION ALL
+            SELECT task_id, substr(rest, 1, instr(rest, ',') - 1), substr(rest, instr(rest, ',') + 1) FROM label_split WHERE rest != ''
+        )
+    """
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so value is matched literally (with ESCAPE '\\')."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 class DatabaseManager:
     """Manages SQLite database connection and schema."""
 
+    # Bump whenever _init_database changes so existing databases get migrated
+    SCHEMA_VERSION = 6
+
     def __init__(self, db_path: Optional[str] = None):
         """
         Initialize database manager.
@@ -34,18 +68,48 @@ class DatabaseManager:
         # Ensure directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Initialize database
+        # Open the shared connection and initialize database
+        self._connect()
         self._init_database()
 
         # Only print path if verbose mode is enabled
         if os.environ.get("FIN_VERBOSE") == "1":
             print("DatabaseManager using path:", self.db_path)
 
+    def _connect(self):
+        """
+        Open the connection shared by every get_connection() call.
+
+        Opening a connection costs far more than the short queries fin runs,
+        so one connection is kept for the life of the manager. The lock
+        serializes its use, since a transaction belongs to the connection
+        rather than to the thread that started it.
+
+        The database runs in WAL mode, where a commit appends to the log
+        instead of rewriting pages, so synchronous=NORMAL is still crash-safe.
+        Backups go through SQLite's backup API, which sees the WAL as well.
+        """
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("PRAGMA temp_store = MEMORY")
+        self._conn.execute("PRAGMA cache_size = -20000")
+        self._lock = threading.RLock()
+
+    def close(self):
+        """Close the shared connection."""
+        self._conn.close()
+
     def _init_database(self):
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._conn as conn:
             cursor = conn.cursor()
 
+            # Skip the schema checks entirely when the database is already current
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] >= self.SCHEMA_VERSION:
+                return
+
             # Create tasks table if it doesn't exist
             cursor.execute(
                 """
@@ -134,29 +198,147 @@ class DatabaseManager:
             if "last_synced_at" not in columns:
                 cursor.execute("ALTER TABLE tasks ADD COLUMN last_synced_at TIMESTAMP")
 
+            # Generated columns are hidden from table_info, so check table_xinfo
+            cursor.execute("PRAGMA table_xinfo(tasks)")
+            if "display_at" not in [column[1] for column in cursor.fetchall()]:
+                # When the task is shown in date views: completion time, else creation time
+                cursor.execute("ALTER TABLE tasks ADD COLUMN display_at TIMESTAMP GENERATED ALWAYS AS (COALESCE(completed_at, created_at)) VIRTUAL")
+
             # Create indexes for performance (if they don't exist)
             try:
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_completed_at ON tasks(completed_at)")
 
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at)")
+                # Open tasks newest first is the default listing; the partial index
+                # serves it in order without touching completed tasks
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_open_created ON tasks(created_at) WHERE completed_at IS NULL")
+                # Due-date buckets (overdue, due soon, due today) only look at open tasks with a due date
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_open_due ON tasks(due_date) WHERE completed_at IS NULL AND due_date IS NOT NULL")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_labels ON tasks(labels)")
+                # Backs date-window queries in TaskManager.list_tasks
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_display_at ON tasks(display_at)")
             except sqlite3.OperationalError:
                 # Indexes might already exist
                 pass
 
+            self._init_labels_table(cursor)
+            self._init_task_labels_table(cursor)
+
+            # Gather planner statistics for the indexes above
+            cursor.execute("ANALYZE")
+
+            cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
             conn.commit()
 
+    def _init_labels_table(self, cursor):
+        """
+        Create the labels side table and the triggers that keep it in sync.
+
+        labels holds one row per distinct label with the number of tasks
+        carrying it, so listing labels doesn't have to split every task's
+        comma-separated labels column.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'labels'")
+        needs_backfill = cursor.fetchone() is None
+
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS labels (
+                name TEXT PRIMARY KEY,
+                ref_count INTEGER NOT NULL DEFAULT 0
+            )
+        """
+        )
+
+        add_labels = f"""
+            INSERT INTO labels (name, ref_count)
+            {_split_labels_cte("SELECT NEW.id AS task_id, NEW.labels AS labels")}
+            SELECT DISTINCT trim(value), 1 FROM label_split WHERE trim(value) != ''
+            ON CONFLICT(name) DO UPDATE SET ref_count = ref_count + 1;
+        """
+        remove_labels = f"""
+            UPDATE labels SET ref_count = ref_count - 1
+            WHERE name IN ({_split_labels_cte("SELECT OLD.id AS task_id, OLD.labels AS labels")} SELECT trim(value) FROM label_split);
+            DELETE FROM labels WHERE ref_count <= 0;
+        """
+
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_tasks_labels_insert AFTER INSERT ON tasks WHEN NEW.labels IS NOT NULL BEGIN {add_labels} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_tasks_labels_delete AFTER DELETE ON tasks WHEN OLD.labels IS NOT NULL BEGIN {remove_labels} END")
+        # NULL labels split into no rows, so the update trigger needs no NULL guards
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_tasks_labels_update AFTER UPDATE OF labels ON tasks WHEN OLD.labels IS NOT NEW.labels BEGIN {remove_labels} {add_labels} END")
+
+        if needs_backfill:
+            # Populate from tasks that existed before the table did
+            cursor.execute(
+                f"""
+                INSERT INTO labels (name, ref_count)
+                {_split_labels_cte("SELECT id AS task_id, labels FROM tasks WHERE labels IS NOT NULL")}
+                SELECT trim(value), COUNT(DISTINCT task_id)
+                FROM label_split
+                WHERE trim(value) != ''
+                GROUP BY trim(value)
+            """
+            )
+
+    def _init_task_labels_table(self, cursor):
+        """
+        Create the task_labels link table and the triggers that keep it in sync.
+
+        task_labels holds one (label, task_id) row per label on a task, so
+        finding the tasks carrying a label is an index probe instead of a
+        scan over every task's comma-separated labels column.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_labels'")
+        needs_backfill = cursor.fetchone() is None
+
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS task_labels (
+                label TEXT NOT NULL,
+                task_id INTEGER NOT NULL,
+                PRIMARY KEY (label, task_id)
+            ) WITHOUT ROWID
+        """
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_labels_task_id ON task_labels(task_id)")
+
+        link_labels = f"""
+            INSERT OR IGNORE INTO task_labels (label, task_id)
+            {_split_labels_cte("SELECT NEW.id AS task_id, NEW.labels AS labels")}
+            SELECT trim(value), task_id FROM label_split WHERE trim(value) != '';
+        """
+        unlink_labels = "DELETE FROM task_labels WHERE task_id = OLD.id;"
+
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_tasks_task_labels_insert AFTER INSERT ON tasks WHEN NEW.labels IS NOT NULL BEGIN {link_labels} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_tasks_task_labels_delete AFTER DELETE ON tasks BEGIN {unlink_labels} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_tasks_task_labels_update AFTER UPDATE OF labels ON tasks WHEN OLD.labels IS NOT NEW.labels BEGIN {unlink_labels} {link_labels} END")
+
+        if needs_backfill:
+            # Populate from tasks that existed before the table did
+            cursor.execute(
+                f"""
+                INSERT OR IGNORE INTO task_labels (label, task_id)
+                {_split_labels_cte("SELECT id AS task_id, labels FROM tasks WHERE labels IS NOT NULL")}
+                SELECT trim(value), task_id FROM label_split WHERE trim(value) != ''
+            """
+            )
+
     def get_connection(self):
-        """Get a database connection."""
-        import contextlib
+        """
+        Get the database connection.
+
+        The connection stays open after the block; anything the caller
+        left uncommitted is rolled back, as closing it used to do.
+        """
 
         @contextlib.contextmanager
         def connection_context():
-            conn = sqlite3.connect(self.db_path)
-            try:
-                yield conn
-            finally:
-                conn.close()
+            with self._lock:
+                try:
+                    yield self._conn
+                finally:
+                    if self._conn.in_transaction:
+                        self._conn.rollback()
 
         return connection_context()
 
@@ -164,6 +346,10 @@ class DatabaseManager:
         """Helper method for testing - initialize with custom path."""
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Close any connection from an earlier initialization before replacing it
+        if getattr(self, "_conn", None) is not None:
+            self._conn.close()
+        self._connect()
         self._init_database()
 
         # Only print path if verbose mode is enabled
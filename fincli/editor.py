@@ -7,17 +7,49 @@ This module is designed to be safe and only trigger editor opening when explicit
 
 from datetime import datetime
 import hashlib
+import itertools
 import os
 import re
 import subprocess
 import tempfile
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
 
 from .backup import DatabaseBackup
 from .db import DatabaseManager
 from .labels import LabelManager
 from .tasks import TaskManager
-from .utils import filter_tasks_by_date_range, format_task_for_display, get_editor
+from .utils import format_task_for_display, get_date_range, get_editor, sort_tasks_by_priority
+
+# Task line patterns, compiled once at import and tried in this order by parse_task_line
+# Format: 1 [ ] 2024-01-01 10:00  Task content  #labels  due:YYYY-MM-DD  #ref:task_123
+_TASK_LINE_WITH_REF_AND_ID_RE = re.compile(r"^(\d+) (\[ \]|\[x\]|\[d\]|\[b\]) (\d{4}-\d{2}-\d{2} \d{2}:\d{2})  (.+?)" r"(  #.+)?(  due:[^ ]+)?  #ref:([^ ]+)$")
+_TASK_LINE_WITH_ID_NO_REF_RE = re.compile(r"^(\d+) (\[ \]|\[x\]|\[d\]|\[b\]) (\d{4}-\d{2}-\d{2} \d{2}:\d{2})  (.+?)" r"(  #.+)?(  due:[^ ]+)?$")
+_TASK_LINE_OLD_FORMAT_WITH_REF_RE = re.compile(r"^(\[ \]|\[x\]|\[d\]|\[b\]) (\d{4}-\d{2}-\d{2} \d{2}:\d{2})  (.+?)" r"(  #.+)?(  due:[^ ]+)?  #ref:([^ ]+)$")
+_TASK_LINE_OLD_FORMAT_NO_REF_RE = re.compile(r"^(\[ \]|\[x\]|\[d\]|\[b\]) (\d{4}-\d{2}-\d{2} \d{2}:\d{2})  (.+?)" r"(  #.+)?(  due:[^ ]+)?$")
+_TASK_LINE_NEW_TASK_RE = re.compile(r"^(\[ \]|\[\]|\[x\]) (.+?)((?: +#[^ ]+)*?)((?: +due:[^ ]+)?)$")
+_HASHTAG_RE = re.compile(r"#([^,#]+)")
+_DUE_DATE_RE = re.compile(r"due:([^ ]+)")
+
+# Instructions header written once at the top of every editor buffer
+_EDIT_FILE_HEADER = "\n".join(
+    (
+        "# Fin Tasks - Edit and save to update completion status",
+        "# Changes tracked:",
+        "#   • Checkbox changes ([ ] ↔ [x]) - mark complete/incomplete",
+        "#   • Content changes - reword tasks (keeps same task ID)",
+        "#   • Due date changes - edit due:YYYY-MM-DD at end of line",
+        "#   • New tasks - add lines without #ref:task_XXX",
+        "#   • Task deletion - remove lines to delete tasks",
+        "# Lines starting with # are ignored",
+        "# DO NOT modify the #ref:task_XXX part - it's used to track changes",
+        "#",
+        "# Due date examples:",
+        "#   • due:2025-06-17 (specific date)",
+        "#   • due:06/17 (current/next year)",
+        "#   • Remove due: to remove due date",
+        "",
+    )
+)
 
 
 class EditorManager:
@@ -75,12 +107,9 @@ class EditorManager:
         Returns:
             Dictionary with task info or None if not a valid task line
         """
-        # Match task line pattern: task_id [ ] or [x] or [d] followed by timestamp,
-        # content, labels, due date, and optional reference
-        # Format: 1 [ ] 2024-01-01 10:00  Task content  #labels  due:YYYY-MM-DD  #ref:task_123
-        # First, try to match with reference and task_id
-        pattern_with_ref_and_id = r"^(\d+) (\[ \]|\[x\]|\[d\]|\[b\]) (\d{4}-\d{2}-\d{2} \d{2}:\d{2})  (.+?)" r"(  #.+)?(  due:[^ ]+)?  #ref:([^ ]+)$"
-        match = re.match(pattern_with_ref_and_id, line.strip())
+        # Match task line patterns, most specific first
+        line = line.strip()
+        match = _TASK_LINE_WITH_REF_AND_ID_RE.match(line)
 
         if match:
             # Line has a reference and task_id
@@ -93,8 +122,7 @@ class EditorManager:
             reference_part = match.group(7) or ""
         else:
             # Try to match with task_id but without reference
-            pattern_with_id_no_ref = r"^(\d+) (\[ \]|\[x\]|\[d\]|\[b\]) (\d{4}-\d{2}-\d{2} \d{2}:\d{2})  (.+?)" r"(  #.+)?(  due:[^ ]+)?$"
-            match = re.match(pattern_with_id_no_ref, line.strip())
+            match = _TASK_LINE_WITH_ID_NO_REF_RE.match(line)
 
             if match:
                 # Line has task_id but no reference
@@ -107,8 +135,7 @@ class EditorManager:
                 reference_part = ""
             else:
                 # Try to match old format without task_id (for backward compatibility)
-                pattern_old_format_with_ref = r"^(\[ \]|\[x\]|\[d\]|\[b\]) (\d{4}-\d{2}-\d{2} \d{2}:\d{2})  (.+?)" r"(  #.+)?(  due:[^ ]+)?  #ref:([^ ]+)$"
-                match = re.match(pattern_old_format_with_ref, line.strip())
+                match = _TASK_LINE_OLD_FORMAT_WITH_REF_RE.match(line)
 
                 if match:
                     # Line has reference but no task_id (old format)
@@ -121,8 +148,7 @@ class EditorManager:
                     reference_part = match.group(6) or ""
                 else:
                     # Try to match old format without reference
-                    pattern_old_format_no_ref = r"^(\[ \]|\[x\]|\[d\]|\[b\]) (\d{4}-\d{2}-\d{2} \d{2}:\d{2})  (.+?)" r"(  #.+)?(  due:[^ ]+)?$"
-                    match = re.match(pattern_old_format_no_ref, line.strip())
+                    match = _TASK_LINE_OLD_FORMAT_NO_REF_RE.match(line)
 
                     if match:
                         # Line has no task_id and no reference (old format)
@@ -135,8 +161,7 @@ class EditorManager:
                         reference_part = ""
                     else:
                         # Try to match new tasks without timestamp (just checkbox and content)
-                        pattern_new_task = r"^(\[ \]|\[\]|\[x\]) (.+?)((?: +#[^ ]+)*?)((?: +due:[^ ]+)?)$"
-                        match = re.match(pattern_new_task, line.strip())
+                        match = _TASK_LINE_NEW_TASK_RE.match(line)
 
                         if not match:
                             return None
@@ -152,13 +177,13 @@ class EditorManager:
         # Extract labels from hashtags (excluding the reference)
         labels = []
         if labels_part:
-            hashtags = re.findall(r"#([^,#]+)", labels_part)
+            hashtags = _HASHTAG_RE.findall(labels_part)
             labels = [tag.strip() for tag in hashtags]
 
         # Extract due date
         due_date = None
         if due_date_part:
-            due_match = re.search(r"due:([^ ]+)", due_date_part)
+            due_match = _DUE_DATE_RE.search(due_date_part)
             if due_match:
                 due_date_raw = due_match.group(1)
                 # Parse the due date using DateParser
@@ -191,16 +216,21 @@ class EditorManager:
             "task_id": final_task_id,  # None for new tasks
         }
 
-    def find_matching_task(self, task_info: Dict[str, Any]) -> Optional[int]:
+    def find_matching_task(self, task_info: Dict[str, Any], tasks_by_id: Optional[Dict[int, Dict[str, Any]]] = None) -> Optional[int]:
         """
         Find a matching task in the database based on reference ID.
 
         Args:
             task_info: Parsed task information
+            tasks_by_id: Optional prefetched index of tasks (see TaskManager.get_tasks_by_ids);
+                when given, it is used instead of querying the database
 
         Returns:
             Task ID if found, None otherwise
         """
+        if tasks_by_id is not None:
+            return task_info.get("task_id") if task_info.get("task_id") in tasks_by_id else None
+
         # If we have a task_id from the reference, use it directly
         if task_info.get("task_id") is not None:
             # Verify the task still exists
@@ -242,33 +272,18 @@ class EditorManager:
         if not target_date:
             # Only get open tasks by default (not completed ones)
             # This prevents the fine command from showing too many completed tasks
-            open_tasks = self.task_manager.list_tasks(include_completed=False)
-            return filter_tasks_by_date_range(open_tasks, days=1)
+            today, lookback_date = get_date_range(days=1)
+            open_tasks = self.task_manager.list_tasks(include_completed=False, since=lookback_date, until=today)
+            return sort_tasks_by_priority(open_tasks)
         else:
-            all_tasks = self.task_manager.list_tasks(include_completed=True)
-            filtered_tasks = []
-
-            for task in all_tasks:
-                task_date = None
-
-                if task["completed_at"]:
-                    # For completed tasks, use completion date
-                    completed_dt = datetime.fromisoformat(task["completed_at"].replace("Z", "+00:00"))
-                    task_date = completed_dt.date()
-                else:
-                    # For open tasks, use creation date
-                    created_dt = datetime.fromisoformat(task["created_at"].replace("Z", "+00:00"))
-                    task_date = created_dt.date()
-
-                try:
-                    target_dt = datetime.strptime(target_date, "%Y-%m-%d").date()
-                    if task_date == target_dt:
-                        filtered_tasks.append(task)
-                except ValueError:
-                    # Invalid date format, skip this filter
-                    pass
+            try:
+                target_dt = datetime.strptime(target_date, "%Y-%m-%d").date()
+            except ValueError:
+                # Invalid date format, nothing matches
+                return []
 
-            return filtered_tasks
+            # Completed tasks match on completion date, open tasks on creation date
+            return self.task_manager.list_tasks(include_completed=True, since=target_dt, until=target_dt)
 
     def create_edit_file_content(self, tasks: List[Dict[str, Any]]) -> str:
         """
@@ -284,29 +299,7 @@ class EditorManager:
         if not tasks:
             return ""
 
-        content_lines = [
-            "# Fin Tasks - Edit and save to update completion status",
-            "# Changes tracked:",
-            "#   • Checkbox changes ([ ] ↔ [x]) - mark complete/incomplete",
-            "#   • Content changes - reword tasks (keeps same task ID)",
-            "#   • Due date changes - edit due:YYYY-MM-DD at end of line",
-            "#   • New tasks - add lines without #ref:task_XXX",
-            "#   • Task deletion - remove lines to delete tasks",
-            "# Lines starting with # are ignored",
-            "# DO NOT modify the #ref:task_XXX part - it's used to track changes",
-            "#",
-            "# Due date examples:",
-            "#   • due:2025-06-17 (specific date)",
-            "#   • due:06/17 (current/next year)",
-            "#   • Remove due: to remove due date",
-            "",
-        ]
-
-        for task in tasks:
-            task_line = self._format_task_with_reference(task)
-            content_lines.append(task_line)
-
-        return "\n".join(content_lines)
+        return _EDIT_FILE_HEADER + "\n" + "\n".join(self._format_task_with_reference(task) for task in tasks)
 
     def _format_task_with_reference(self, task: Dict[str, Any]) -> str:
         """
@@ -329,7 +322,7 @@ class EditorManager:
 
     def parse_edited_content(
         self,
-        content: str,
+        content: Union[str, Iterable[str]],
         original_task_ids: Optional[Set[int]] = None,
         original_tasks: Optional[List[Dict[str, Any]]] = None,
     ) -> tuple:
@@ -338,7 +331,7 @@ class EditorManager:
         This method is safe and doesn't open any external processes.
 
         Args:
-            content: The edited file content as a string
+            content: The edited file content as a string, or an iterable of its lines (e.g. an open file)
             original_task_ids: Set of task IDs that were in the original file (for deletion tracking)
             original_tasks: List of original tasks to compare content changes
 
@@ -351,75 +344,76 @@ class EditorManager:
         content_modified_count = 0
         dismissed_count = 0
         processed_task_ids = set()
-
-        # Create a mapping of task_id to original content for comparison
-        original_content_map = {}
-        if original_tasks:
-            original_content_map = {task["id"]: task["content"] for task in original_tasks}
-
-        for line in content.splitlines():
-            # Skip header lines and empty lines
-            if line.startswith("#") or line.strip() == "":
-                continue
-
-            # Parse the task line
-            task_info = self.parse_task_line(line)
-            if not task_info:
-                continue
-
-            # Handle new tasks (those without a reference ID)
-            if task_info["task_id"] is None:
-                # This is a new task
-                if task_info["content"].strip():  # Only add if content is not empty
-                    # Add current timestamp for new tasks that don't have one
-                    current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
-
-                    # Add the task to the database
-                    task_id = self.task_manager.add_task(
-                        task_info["content"],
-                        labels=task_info["labels"] if task_info["labels"] else None,
-                        due_date=task_info.get("due_date"),
-                    )
-                    new_tasks_count += 1
-
-                    # Update the task with the current timestamp if it didn't have one
-                    if not task_info.get("timestamp"):
-                        with self.db_manager.get_connection() as conn:
-                            cursor = conn.cursor()
-                            cursor.execute(
-                                "UPDATE tasks SET created_at = ?, modified_at = ? WHERE id = ?",
-                                (current_time, current_time, task_id),
-                            )
-                            conn.commit()
-                continue
-
-            # Handle existing tasks
-            task_id = self.find_matching_task(task_info)
-            if not task_id:
-                continue
-
-            # Track that we've processed this task
-            processed_task_ids.add(task_id)
-
-            # Check for content changes
-            if original_content_map and task_id in original_content_map:
-                original_content = original_content_map[task_id]
-                if task_info["content"] != original_content:
+        completion_updates = {}  # task_id -> desired completion status
+
+        # Index the original tasks by id for comparison
+        original_tasks_by_id = {task["id"]: task for task in original_tasks or []}
+
+        # Parse and apply the file a chunk of lines at a time, fetching each
+        # chunk's referenced tasks in one query, so only one chunk is held at once
+        lines = content.splitlines() if isinstance(content, str) else content
+        parsed_lines = filter(None, (self.parse_task_line(line) for line in lines if not line.startswith("#") and line.strip()))
+        was_completed = {}  # task_id -> completion status before this edit
+
+        while True:
+            chunk = list(itertools.islice(parsed_lines, self.task_manager.ID_BATCH_SIZE))
+            if not chunk:
+                break
+
+            tasks_by_id = self.task_manager.get_tasks_by_ids(task_info["task_id"] for task_info in chunk if task_info["task_id"] is not None)
+            for task_id, task in tasks_by_id.items():
+                was_completed.setdefault(task_id, task["completed_at"] is not None)
+
+            for task_info in chunk:
+                # Handle new tasks (those without a reference ID)
+                if task_info["task_id"] is None:
+                    # This is a new task
+                    if task_info["content"].strip():  # Only add if content is not empty
+                        # Add current timestamp for new tasks that don't have one
+                        current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+                        # Add the task to the database
+                        task_id = self.task_manager.add_task(
+                            task_info["content"],
+                            labels=task_info["labels"] if task_info["labels"] else None,
+                            due_date=task_info.get("due_date"),
+                        )
+                        new_tasks_count += 1
+
+                        # Update the task with the current timestamp if it didn't have one
+                        if not task_info.get("timestamp"):
+                            with self.db_manager.get_connection() as conn:
+                                cursor = conn.cursor()
+                                cursor.execute(
+                                    "UPDATE tasks SET created_at = ?, modified_at = ? WHERE id = ?",
+                                    (current_time, current_time, task_id),
+                                )
+                                conn.commit()
+                    continue
+
+                # Handle existing tasks
+                task_id = self.find_matching_task(task_info, tasks_by_id)
+                if not task_id:
+                    continue
+
+                # Track that we've processed this task
+                processed_task_ids.add(task_id)
+
+                original_task = original_tasks_by_id.get(task_id)
+
+                # Check for content changes
+                if original_task and task_info["content"] != original_task["content"]:
                     # Content was modified
-                    if self.task_manager.update_task_content(task_id, task_info["content"]):
+                    if self.task_manager.update_task_content(task_id, task_info["content"], task=tasks_by_id[task_id]):
                         content_modified_count += 1
 
-            # Check for due date changes
-            if original_tasks:
-                original_task = next((t for t in original_tasks if t["id"] == task_id), None)
+                # Check for due date changes
                 if original_task and task_info.get("due_date") != original_task.get("due_date"):
                     # Due date was modified
-                    if self.task_manager.update_task_due_date(task_id, task_info.get("due_date")):
+                    if self.task_manager.update_task_due_date(task_id, task_info.get("due_date"), task=tasks_by_id[task_id]):
                         content_modified_count += 1
 
-            # Check for label changes
-            if original_tasks:
-                original_task = next((t for t in original_tasks if t["id"] == task_id), None)
+                # Check for label changes
                 if original_task:
                     original_labels = original_task.get("labels", [])
                     new_labels = task_info.get("labels", [])
@@ -433,16 +427,16 @@ class EditorManager:
                         if self.task_manager.update_task_labels(task_id, new_labels):
                             content_modified_count += 1
 
-            # Update completion status if changed
-            if self.task_manager.update_task_completion(task_id, task_info["is_completed"]):
-                if task_info["is_completed"]:
-                    completed_count += 1
-                else:
-                    reopened_count += 1
+                # Update completion status if changed (written in one batch after the loop)
+                current_completed = completion_updates.get(task_id, was_completed[task_id])
+                if task_info["is_completed"] != current_completed:
+                    completion_updates[task_id] = task_info["is_completed"]
+                    if task_info["is_completed"]:
+                        completed_count += 1
+                    else:
+                        reopened_count += 1
 
-            # Update dismissed status if changed (using label-based approach)
-            if original_tasks:
-                original_task = next((t for t in original_tasks if t["id"] == task_id), None)
+                # Update dismissed status if changed (using label-based approach)
                 if original_task:
                     original_labels = original_task.get("labels", [])
                     was_dismissed = "dismissed" in [label.lower() for label in original_labels]
@@ -452,7 +446,7 @@ class EditorManager:
                         if task_info["is_dismissed"]:
                             # Mark as dismissed: ensure completed and add dismissed label
                             if not task_info["is_completed"]:
-                                self.task_manager.update_task_completion(task_id, True)
+                                completion_updates[task_id] = True
                             if "dismissed" not in [label.lower() for label in current_labels]:
                                 current_labels.append("dismissed")
                                 self.task_manager.update_task_labels(task_id, current_labels)
@@ -463,9 +457,7 @@ class EditorManager:
                             self.task_manager.update_task_labels(task_id, current_labels)
                             dismissed_count += 1
 
-            # Update backlog status if changed (using label-based approach)
-            if original_tasks:
-                original_task = next((t for t in original_tasks if t["id"] == task_id), None)
+                # Update backlog status if changed (using label-based approach)
                 if original_task:
                     original_labels = original_task.get("labels", [])
                     was_backlog = "backlog" in [label.lower() for label in original_labels]
@@ -475,7 +467,7 @@ class EditorManager:
                         if task_info["is_backlog"]:
                             # Mark as backlog: ensure not completed and add backlog label
                             if task_info["is_completed"]:
-                                self.task_manager.update_task_completion(task_id, False)
+                                completion_updates[task_id] = False
                             if "backlog" not in [label.lower() for label in current_labels]:
                                 current_labels.append("backlog")
                                 self.task_manager.update_task_labels(task_id, current_labels)
@@ -484,6 +476,9 @@ class EditorManager:
                             current_labels = [label for label in current_labels if label.lower() != "backlog"]
                             self.task_manager.update_task_labels(task_id, current_labels)
 
+        # Apply all completion changes in a single transaction
+        self.task_manager.bulk_update_completion((task_id, is_completed) for task_id, is_completed in completion_updates.items() if is_completed != was_completed[task_id])
+
         # Handle task deletions if we have the original task IDs
         deleted_count = 0
         if original_task_ids:
@@ -555,19 +550,16 @@ class EditorManager:
             # Reset the flag after editor closes
             self._editor_opened = False
 
-            # Read the edited content
+            # Parse the edited content, streaming lines from the file
             with open(temp_file_path, "r") as f:
-                edited_content = f.read()
-
-            # Parse the edited content
-            (
-                completed_count,
-                reopened_count,
-                new_tasks_count,
-                content_modified_count,
-                deleted_count,
-                dismissed_count,
-            ) = self.parse_edited_content(edited_content, original_task_ids, tasks)
+                (
+                    completed_count,
+                    reopened_count,
+                    new_tasks_count,
+                    content_modified_count,
+                    deleted_count,
+                    dismissed_count,
+                ) = self.parse_edited_content(f, original_task_ids, tasks)
 
             # Create a backup after editing with change details
             task_changes = {
@@ -666,19 +658,16 @@ class EditorManager:
             # Reset the flag after editor closes
             self._editor_opened = False
 
-            # Read the edited content
+            # Parse the edited content, streaming lines from the file
             with open(temp_file_path, "r") as f:
-                edited_content = f.read()
-
-            # Parse the edited content
-            (
-                completed_count,
-                reopened_count,
-                new_tasks_count,
-                content_modified_count,
-                deleted_count,
-                dismissed_count,
-            ) = self.parse_edited_content(edited_content, original_task_ids, tasks)
+                (
+                    completed_count,
+                    reopened_count,
+                    new_tasks_count,
+                    content_modified_count,
+                    deleted_count,
+                    dismissed_count,
+                ) = self.parse_edited_content(f, original_task_ids, tasks)
 
             # Create a backup after editing with change details
             task_changes = {
@@ -729,15 +718,16 @@ class EditorManager:
             Tuple of (completed_count, reopened_count, new_tasks_count)
         """
         # Extract original task IDs from the original content for deletion tracking
-        original_task_ids = set()
+        referenced_ids = []
         for line in original_content.splitlines():
             if line.startswith("#") or line.strip() == "":
                 continue
             task_info = self.parse_task_line(line)
             if task_info and task_info["task_id"] is not None:
-                task_id = self.find_matching_task(task_info)
-                if task_id:
-                    original_task_ids.add(task_id)
+                referenced_ids.append(task_info["task_id"])
+
+        # Keep only the references that still exist in the database
+        original_task_ids = set(self.task_manager.get_tasks_by_ids(referenced_ids))
 
         # Parse the modified content to get completion statistics
         return self.parse_edited_content(modified_content, original_task_ids)
@@ -49,6 +49,7 @@ def import_csv_tasks(file_path: str = None, db_manager: Optional[DatabaseManager
     imported_count = 0
     skipped_count = 0
     errors = []
+    pending_tasks = []
 
     try:
         with open(file_path, "r", newline="", encoding="utf-8") as csvfile:
@@ -72,14 +73,15 @@ def import_csv_tasks(file_path: str = None, db_manager: Optional[DatabaseManager
                     # Add source label
                     labels.append("source:csv")
 
-                    # Add task to database
-                    task_manager.add_task(task_content, labels, source="csv-import")
-                    imported_count += 1
+                    pending_tasks.append({"content": task_content, "labels": labels, "source": "csv-import"})
 
                 except Exception as e:
                     errors.append(f"Row {row_num}: {str(e)}")
                     skipped_count += 1
 
+        # Add all tasks to the database in one transaction
+        imported_count = len(task_manager.add_tasks(pending_tasks))
+
         # Optionally remove the CSV file after successful import
         if imported_count > 0 and kwargs.get("delete_after_import", False):
             try:
@@ -55,6 +55,7 @@ def import_json_tasks(file_path: str = None, db_manager: Optional[DatabaseManage
     imported_count = 0
     skipped_count = 0
     errors = []
+    pending_tasks = []
 
     try:
         with open(file_path, "r", encoding="utf-8") as jsonfile:
@@ -92,14 +93,15 @@ def import_json_tasks(file_path: str = None, db_manager: Optional[DatabaseManage
                 # Add source label
                 labels.append("source:json")
 
-                # Add task to database
-                task_manager.add_task(task_content, labels, source="json-import")
-                imported_count += 1
+                pending_tasks.append({"content": task_content, "labels": labels, "source": "json-import"})
 
             except Exception as e:
                 errors.append(f"Item {item_num}: {str(e)}")
                 skipped_count += 1
 
+        # Add all tasks to the database in one transaction
+        imported_count = len(task_manager.add_tasks(pending_tasks))
+
         # Optionally remove the JSON file after successful import
         if imported_count > 0 and kwargs.get("delete_after_import", False):
             try:
@@ -52,6 +52,7 @@ def import_text_tasks(file_path: str = None, db_manager: DatabaseManager = None,
     imported_count = 0
     skipped_count = 0
     errors = []
+    pending_tasks = []
 
     try:
         with open(file_path, "r", encoding="utf-8") as textfile:
@@ -83,14 +84,15 @@ def import_text_tasks(file_path: str = None, db_manager: DatabaseManager = None,
                     # Add source label
                     labels.append("source:text")
 
-                    # Add task to database
-                    task_manager.add_task(task_content, labels, source="text-import")
-                    imported_count += 1
+                    pending_tasks.append({"content": task_content, "labels": labels, "source": "text-import"})
 
                 except Exception as e:
                     errors.append(f"Line {line_num}: {str(e)}")
                     skipped_count += 1
 
+        # Add all tasks to the database in one transaction
+        imported_count = len(task_manager.add_tasks(pending_tasks))
+
         # Optionally remove the text file after successful import
         if imported_count > 0 and kwargs.get("delete_after_import", False):
             try:
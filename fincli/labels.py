@@ -4,9 +4,9 @@ Labels module for FinCLI
 Handles label management and filtering.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
-from .db import DatabaseManager
+from .db import DatabaseManager, escape_like
 
 
 class LabelManager:
@@ -31,20 +31,10 @@ class LabelManager:
         with self.db_manager.get_connection() as conn:
             cursor = conn.cursor()
 
-            cursor.execute(
-                """
-                SELECT labels FROM tasks WHERE labels IS NOT NULL AND labels != ''
-            """
-            )
+            # The labels table is kept in sync with tasks.labels by triggers
+            cursor.execute("SELECT name FROM labels ORDER BY name")
 
-            all_labels = []
-            for row in cursor.fetchall():
-                if row[0]:
-                    labels = row[0].split(",")
-                    all_labels.extend([label.strip() for label in labels if label.strip()])
-
-            # Remove duplicates and sort
-            return sorted(list(set(all_labels)))
+            return [row[0] for row in cursor]
 
     def filter_tasks_by_label(self, label: str, include_completed: bool = True) -> List[Dict[str, Any]]:
         """
@@ -57,13 +47,33 @@ class LabelManager:
         Returns:
             List of tasks that match the label
         """
+        return list(self.iter_tasks_by_label(label, include_completed))
+
+    def iter_tasks_by_label(self, label: str, include_completed: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over tasks matching a label (case-insensitive, partial match).
+
+        Rows are streamed from the cursor; see TaskManager.iter_tasks.
+
+        Args:
+            label: Label to filter by (case-insensitive)
+            include_completed: Whether to include completed tasks
+
+        Yields:
+            Tasks that match the label, newest first
+        """
         with self.db_manager.get_connection() as conn:
             cursor = conn.cursor()
 
+            # Match against the (small) labels table, then probe task_labels by
+            # label for the tasks carrying any of the matching labels
             query = """
                 SELECT id, content, created_at, completed_at, labels, source
                 FROM tasks
-                WHERE labels LIKE ?
+                WHERE id IN (
+                    SELECT task_id FROM task_labels
+                    WHERE label IN (SELECT name FROM labels WHERE name LIKE ? ESCAPE '\\')
+                )
             """
 
             if not include_completed:
@@ -71,27 +81,19 @@ class LabelManager:
 
             query += " ORDER BY created_at DESC"
 
-            # Use case-insensitive pattern matching
-            pattern = f"%{str(label).lower()}%"
+            # LIKE is case-insensitive, giving a case-insensitive partial match
+            pattern = f"%{escape_like(str(label).lower())}%"
             cursor.execute(query, (pattern,))
 
-            tasks = []
-            for row in cursor.fetchall():
-                task_labels = row[4].split(",") if row[4] else []
-                # Additional check for exact label match (case-insensitive)
-                if any(str(label).lower() in task_label.lower() for task_label in task_labels):
-                    tasks.append(
-                        {
-                            "id": row[0],
-                            "content": row[1],
-                            "created_at": row[2],
-                            "completed_at": row[3],
-                            "labels": task_labels,
-                            "source": row[5],
-                        }
-                    )
-
-            return tasks
+            for row in cursor:
+                yield {
+                    "id": row[0],
+                    "content": row[1],
+                    "created_at": row[2],
+                    "completed_at": row[3],
+                    "labels": row[4].split(",") if row[4] else [],
+                    "source": row[5],
+                }
 
     def get_label_counts(self) -> Dict[str, Dict[str, int]]:
         """
@@ -104,28 +106,18 @@ class LabelManager:
         with self.db_manager.get_connection() as conn:
             cursor = conn.cursor()
 
+            # task_labels already holds one trimmed row per label on each task
             cursor.execute(
                 """
-                SELECT labels, completed_at FROM tasks 
-                WHERE labels IS NOT NULL AND labels != ''
+                SELECT task_labels.label, SUM(tasks.completed_at IS NULL), SUM(tasks.completed_at IS NOT NULL), COUNT(*)
+                FROM task_labels JOIN tasks ON tasks.id = task_labels.task_id
+                GROUP BY task_labels.label
+                ORDER BY task_labels.label
                 """
             )
 
             label_counts = {}
-            for row in cursor.fetchall():
-                labels_str, completed_at = row
-                if labels_str:
-                    labels = [label.strip() for label in labels_str.split(",") if label.strip()]
-                    is_completed = completed_at is not None
-
-                    for label in labels:
-                        if label not in label_counts:
-                            label_counts[label] = {"open": 0, "completed": 0, "total": 0}
-
-                        if is_completed:
-                            label_counts[label]["completed"] += 1
-                        else:
-                            label_counts[label]["open"] += 1
-                        label_counts[label]["total"] += 1
+            for label, open_count, completed_count, total_count in cursor:
+                label_counts[label] = {"open": open_count, "completed": completed_count, "total": total_count}
 
             return label_counts
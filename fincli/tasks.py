@@ -4,15 +4,28 @@ Tasks module for FinCLI
 Handles CRUD operations for tasks.
 """
 
+from datetime import date, timedelta
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from .db import DatabaseManager
+from .db import DatabaseManager, escape_like
+
+# Statements are kept as constants so each call passes the identical SQL
+# text and hits the connection's prepared-statement cache
+_TASK_COLUMNS = "id, content, created_at, modified_at, completed_at, labels, source, due_date, context"
+_SQL_INSERT_TASK = "INSERT INTO tasks (content, labels, source, due_date, context) VALUES (?, ?, ?, ?, ?)"
+_SQL_GET_TASK = f"SELECT {_TASK_COLUMNS} FROM tasks WHERE id = ?"
+
+# Separators accepted between labels in a single label argument
+_LABEL_SPLIT_RE = re.compile(r"[, ]+")
 
 
 class TaskManager:
     """Manages task CRUD operations."""
 
+    # Maximum number of IDs bound in a single "WHERE id IN (...)" query
+    ID_BATCH_SIZE = 500
+
     def __init__(self, db_manager: DatabaseManager):
         """
         Initialize task manager.
@@ -43,42 +56,71 @@ class TaskManager:
         Returns:
             The ID of the newly created task
         """
-        # Normalize labels
-        labels_str = None
-        if labels:
-            # Normalize labels: split on comma or space, lowercase, trim whitespace
-            all_labels = []
-            for label_group in labels:
-                if label_group:
-                    # Split on comma or space, then normalize each label
-                    split_labels = re.split(r"[, ]+", label_group.strip())
-                    for label in split_labels:
-                        if label.strip():
-                            all_labels.append(label.strip().lower())
-
-            # Remove duplicates and sort
-            unique_labels = sorted(list(set(all_labels)))
-            labels_str = ",".join(unique_labels) if unique_labels else None
-
-        # Set default context if none provided
-        if context is None:
-            context = "default"
+        return self.add_tasks(
+            [
+                {
+                    "content": content,
+                    "labels": labels,
+                    "source": source,
+                    "due_date": due_date,
+                    "context": context,
+                }
+            ]
+        )[0]
+
+    def add_tasks(self, tasks: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Add several tasks in a single transaction.
+
+        Args:
+            tasks: Task dictionaries with a "content" key and optional "labels",
+                "source", "due_date" and "context" keys, as accepted by add_task
+
+        Returns:
+            The IDs of the newly created tasks, in input order
+        """
+        rows = []
+        for task in tasks:
+            # Set default context if none provided
+            context = task.get("context")
+            if context is None:
+                context = "default"
+            rows.append((task["content"], self._normalize_labels(task.get("labels")), task.get("source", "cli"), task.get("due_date"), context))
+
+        if not rows:
+            return []
 
         with self.db_manager.get_connection() as conn:
             cursor = conn.cursor()
 
-            cursor.execute(
-                """
-                INSERT INTO tasks (content, labels, source, due_date, context)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (content, labels_str, source, due_date, context),
-            )
-
-            task_id = cursor.lastrowid
+            # Take the write lock up front so the batch commits once and its
+            # AUTOINCREMENT IDs are consecutive
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.executemany(_SQL_INSERT_TASK, rows)
+            cursor.execute("SELECT last_insert_rowid()")
+            last_id = cursor.fetchone()[0]
             conn.commit()
 
-            return task_id
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    @staticmethod
+    def normalize_labels(labels: Optional[List[str]]) -> List[str]:
+        """Split on comma or space, lowercase, dedupe and sort labels as add_task stores them."""
+        if not labels:
+            return []
+        return sorted({label.strip().lower() for label_group in labels if label_group for label in _LABEL_SPLIT_RE.split(label_group.strip()) if label.strip()})
+
+    @staticmethod
+    def _normalize_labels(labels: Optional[List[str]]) -> Optional[str]:
+        """Normalize labels into the stored comma-separated form."""
+        unique_labels = TaskManager.normalize_labels(labels)
+        return ",".join(unique_labels) if unique_labels else None
+
+    @staticmethod
+    def _labels_csv(labels: Optional[List[str]]) -> Optional[str]:
+        """Lowercase, trim, dedupe and sort whole labels into the stored comma-separated form."""
+        unique_labels = sorted({label.strip().lower() for label in labels or () if label.strip()})
+        return ",".join(unique_labels) if unique_labels else None
 
     def get_task(self, task_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -93,96 +135,231 @@ class TaskManager:
         with self.db_manager.get_connection() as conn:
             cursor = conn.cursor()
 
-            cursor.execute(
-                """
-                SELECT id, content, created_at, modified_at, completed_at, labels, source, due_date, context
-                FROM tasks WHERE id = ?
-            """,
-                (task_id,),
-            )
+            cursor.execute(_SQL_GET_TASK, (task_id,))
 
             row = cursor.fetchone()
             if not row:
                 return None
 
-            return {
-                "id": row[0],
-                "content": row[1],
-                "created_at": row[2],
-                "modified_at": row[3],
-                "completed_at": row[4],
-                "labels": row[5].split(",") if row[5] else [],
-                "source": row[6],
-                "due_date": row[7],
-                "context": row[8] or "default",
-            }
+            return self._row_to_task(row)
 
-    def list_tasks(self, include_completed: bool = False, context: Optional[str] = None) -> List[Dict[str, Any]]:
+    def list_tasks(
+        self,
+        include_completed: bool = False,
+        context: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        labels: Optional[List[str]] = None,
+        completed_only: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
         """
         List all tasks, optionally including completed ones.
 
+        Takes the same arguments as iter_tasks.
+
+        Returns:
+            List of task dictionaries
+        """
+        return list(self.iter_tasks(include_completed, context, since, until, labels, completed_only, limit))
+
+    def iter_tasks(
+        self,
+        include_completed: bool = False,
+        context: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        labels: Optional[List[str]] = None,
+        completed_only: bool = False,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over tasks, optionally including completed ones.
+
+        Rows are streamed from the cursor, and the database connection is held
+        until the iterator is exhausted or closed, so consume it promptly and
+        don't write to the database while iterating.
+
         Args:
             include_completed: Whether to include completed tasks
             context: Optional context to filter by
+            since: Optional first day (inclusive) of the activity window
+            until: Optional last day (inclusive) of the activity window
+            labels: Optional labels; tasks carrying any of them (exact, case-insensitive) match
+            completed_only: Whether to return only completed tasks (implies include_completed)
+            limit: Optional maximum number of tasks to return
 
-        Returns:
-            List of task dictionaries
+        The activity date of a task is its completion date if completed,
+        otherwise its creation date (see filter_tasks_by_date_range).
+
+        Yields:
+            Task dictionaries, newest first
         """
         with self.db_manager.get_connection() as conn:
             cursor = conn.cursor()
 
-            query = """
-                SELECT id, content, created_at, modified_at, completed_at, labels, source, due_date, context
-                FROM tasks
-            """
+            query = f"SELECT {_TASK_COLUMNS} FROM tasks"
 
             where_conditions = []
-            if not include_completed:
+            params = []
+            if completed_only:
+                where_conditions.append("completed_at IS NOT NULL")
+            elif not include_completed:
                 where_conditions.append("completed_at IS NULL")
 
             if context:
                 where_conditions.append("context = ?")
+                params.append(context)
+
+            # Timestamps are stored as "YYYY-MM-DD ..." so comparing against
+            # ISO dates filters on the calendar day, served by idx_tasks_display_at
+            if since:
+                where_conditions.append("display_at >= ?")
+                params.append(since.isoformat())
+
+            if until:
+                where_conditions.append("display_at < ?")
+                params.append((until + timedelta(days=1)).isoformat())
+
+            if labels:
+                # Match the requested labels against the (small) labels table, then
+                # probe task_labels for the tasks carrying them, as LabelManager does.
+                # LIKE without wildcards is a case-insensitive exact match.
+                label_conditions = []
+                for label in labels:
+                    label_conditions.append("name LIKE ? ESCAPE '\\'")
+                    params.append(escape_like(label.strip().lower()))
+                where_conditions.append("id IN (SELECT task_id FROM task_labels WHERE label IN (SELECT name FROM labels WHERE " + " OR ".join(label_conditions) + "))")
 
             if where_conditions:
                 query += " WHERE " + " AND ".join(where_conditions)
 
             query += " ORDER BY created_at DESC"
 
-            if context:
-                cursor.execute(query, (context,))
-            else:
-                cursor.execute(query)
-
-            tasks = []
-            for row in cursor.fetchall():
-                tasks.append(
-                    {
-                        "id": row[0],
-                        "content": row[1],
-                        "created_at": row[2],
-                        "modified_at": row[3],
-                        "completed_at": row[4],
-                        "labels": row[5].split(",") if row[5] else [],
-                        "source": row[6],
-                        "due_date": row[7],
-                        "context": row[8] or "default",
-                    }
-                )
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+
+            cursor.execute(query, params)
+
+            for row in cursor:
+                yield self._row_to_task(row)
+
+    def count_tasks(self, include_completed: bool = False) -> int:
+        """
+        Count tasks, optionally including completed ones.
+
+        Args:
+            include_completed: Whether to include completed tasks
+
+        Returns:
+            Number of matching tasks
+        """
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            query = "SELECT COUNT(*) FROM tasks"
+            if not include_completed:
+                query += " WHERE completed_at IS NULL"
+            cursor.execute(query)
+            return cursor.fetchone()[0]
+
+    def get_max_task_id(self) -> int:
+        """
+        Get the highest task ID currently in use.
+
+        Returns:
+            The largest task ID, or 0 if there are no tasks
+        """
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM tasks")
+            return cursor.fetchone()[0]
+
+    def list_tasks_since_max_id(self, max_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        List tasks created after a known highest ID.
+
+        IDs are AUTOINCREMENT, so with max_id taken from get_max_task_id
+        this returns exactly the tasks added since.
+
+        Args:
+            max_id: Highest task ID before the tasks of interest were added
+            limit: Optional maximum number of tasks to return
+
+        Returns:
+            List of task dictionaries, newest first
+        """
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = f"SELECT {_TASK_COLUMNS} FROM tasks WHERE id > ? ORDER BY created_at DESC"
+            params = [max_id]
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
 
-            return tasks
+            cursor.execute(query, params)
+            return [self._row_to_task(row) for row in cursor]
 
-    def update_task_content(self, task_id: int, new_content: str) -> bool:
+    def get_tasks_by_ids(self, task_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several tasks by ID with as few queries as possible.
+
+        Args:
+            task_ids: Task IDs to retrieve
+
+        Returns:
+            Dictionary mapping task ID to task dictionary; missing IDs are omitted
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        tasks_by_id = {}
+
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(task_ids), self.ID_BATCH_SIZE):
+                batch = task_ids[start : start + self.ID_BATCH_SIZE]
+                # Pad to a power of two by repeating the last ID, so only a few
+                # distinct statements are ever prepared
+                slots = min(self.ID_BATCH_SIZE, 1 << (len(batch) - 1).bit_length())
+                batch += [batch[-1]] * (slots - len(batch))
+                placeholders = ",".join("?" * slots)
+                cursor.execute(f"SELECT {_TASK_COLUMNS} FROM tasks WHERE id IN ({placeholders})", batch)
+                for row in cursor:
+                    tasks_by_id[row[0]] = self._row_to_task(row)
+
+        return tasks_by_id
+
+    @staticmethod
+    def _row_to_task(row: tuple) -> Dict[str, Any]:
+        """Convert a task row (in list_tasks column order) to a task dictionary."""
+        return {
+            "id": row[0],
+            "content": row[1],
+            "created_at": row[2],
+            "modified_at": row[3],
+            "completed_at": row[4],
+            "labels": row[5].split(",") if row[5] else [],
+            "source": row[6],
+            "due_date": row[7],
+            "context": row[8] or "default",
+        }
+
+    def update_task_content(self, task_id: int, new_content: str, task: Optional[Dict[str, Any]] = None) -> bool:
         """
         Update task content and set modified_at timestamp.
 
         Args:
             task_id: Task ID to update
             new_content: New content for the task
+            task: Optional already-fetched task, to skip looking it up again
 
         Returns:
             True if updated, False if not found or no change
         """
-        task = self.get_task(task_id)
+        if task is None:
+            task = self.get_task(task_id)
         if not task:
             return False
 
@@ -201,18 +378,20 @@ class TaskManager:
 
         return True
 
-    def update_task_completion(self, task_id: int, is_completed: bool) -> bool:
+    def update_task_completion(self, task_id: int, is_completed: bool, task: Optional[Dict[str, Any]] = None) -> bool:
         """
         Update task completion status and set modified_at timestamp.
 
         Args:
             task_id: Task ID to update
             is_completed: Whether the task should be marked as completed
+            task: Optional already-fetched task, to skip looking it up again
 
         Returns:
             True if updated, False if no change needed
         """
-        task = self.get_task(task_id)
+        if task is None:
+            task = self.get_task(task_id)
         if not task:
             return False
 
@@ -240,18 +419,64 @@ class TaskManager:
 
         return True
 
-    def update_task_due_date(self, task_id: int, due_date: Optional[str]) -> bool:
+    def bulk_update_completion(self, updates: Iterable[Tuple[int, bool]], label_updates: Optional[Dict[int, Optional[List[str]]]] = None) -> int:
+        """
+        Update the completion status of several tasks in a single transaction.
+
+        Args:
+            updates: (task_id, is_completed) pairs
+            label_updates: Optional new labels per task ID, written in the same transaction
+                (as update_task_labels would)
+
+        Returns:
+            Number of tasks whose completion status actually changed
+        """
+        to_complete = []
+        to_reopen = []
+        for task_id, is_completed in updates:
+            if is_completed:
+                to_complete.append((task_id,))
+            else:
+                to_reopen.append((task_id,))
+        to_relabel = [(self._labels_csv(labels), task_id) for task_id, labels in (label_updates or {}).items()]
+
+        if not to_complete and not to_reopen and not to_relabel:
+            return 0
+
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+
+            # Guard on the current state so unchanged tasks keep their timestamps
+            cursor.executemany(
+                "UPDATE tasks SET completed_at = CURRENT_TIMESTAMP, modified_at = CURRENT_TIMESTAMP WHERE id = ? AND completed_at IS NULL",
+                to_complete,
+            )
+            changed = cursor.rowcount
+            cursor.executemany(
+                "UPDATE tasks SET completed_at = NULL, modified_at = CURRENT_TIMESTAMP WHERE id = ? AND completed_at IS NOT NULL",
+                to_reopen,
+            )
+            changed += cursor.rowcount
+            cursor.executemany("UPDATE tasks SET labels = ?, modified_at = CURRENT_TIMESTAMP WHERE id = ?", to_relabel)
+
+            conn.commit()
+
+        return changed
+
+    def update_task_due_date(self, task_id: int, due_date: Optional[str], task: Optional[Dict[str, Any]] = None) -> bool:
         """
         Update task due date and set modified_at timestamp.
 
         Args:
             task_id: Task ID to update
             due_date: New due date in YYYY-MM-DD format, or None to remove due date
+            task: Optional already-fetched task, to skip looking it up again
 
         Returns:
             True if updated, False if not found or no change
         """
-        task = self.get_task(task_id)
+        if task is None:
+            task = self.get_task(task_id)
         if not task:
             return False
 
@@ -285,22 +510,9 @@ class TaskManager:
         try:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
-
-                # Convert labels list to comma-separated string
-                labels_str = None
-                if labels:
-                    # Normalize labels: lowercase, trim whitespace, remove duplicates
-                    normalized_labels = []
-                    for label in labels:
-                        if label.strip():
-                            normalized_labels.append(label.strip().lower())
-                    # Remove duplicates and sort
-                    unique_labels = sorted(list(set(normalized_labels)))
-                    labels_str = ",".join(unique_labels) if unique_labels else None
-
                 cursor.execute(
                     "UPDATE tasks SET labels = ?, modified_at = CURRENT_TIMESTAMP WHERE id = ?",
-                    (labels_str, task_id),
+                    (self._labels_csv(labels), task_id),
                 )
                 conn.commit()
                 return True
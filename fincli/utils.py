@@ -5,9 +5,11 @@ Contains date/time helpers, formatting, and utility functions.
 """
 
 from datetime import date, datetime, timedelta
+import functools
 import os
 import re
-from typing import Any, Dict, List, Optional
+import shutil
+from typing import AbstractSet, Any, Dict, FrozenSet, List, Optional, Tuple
 
 # Configuration for labels that should be hidden from display by default
 # These labels contain metadata that's not typically needed in normal task viewing
@@ -252,6 +254,63 @@ def wrap_text(text: str, max_width: int, prefix: str = "", is_task_wrapping: boo
         return "\n".join(result)
 
 
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parse a stored ISO timestamp.
+
+    Python < 3.11 rejects a trailing "Z", so it is rewritten as "+00:00";
+    SQLite's own timestamps never carry one and are parsed as-is.
+
+    Args:
+        value: Timestamp string from the database
+
+    Returns:
+        Parsed datetime
+    """
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _ts_prefix(value: str) -> str:
+    """
+    Format a stored timestamp as "YYYY-MM-DD HH:MM".
+
+    Timestamps written by SQLite or the editor already start with that
+    prefix, so they are sliced instead of parsed and re-formatted.
+
+    Args:
+        value: Timestamp string from the database
+
+    Returns:
+        Timestamp truncated to minutes
+    """
+    if len(value) >= 16 and value[10] == " ":
+        return value[:16]
+    return parse_timestamp(value).strftime("%Y-%m-%d %H:%M")
+
+
+def get_task_display_datetime(task: Dict[str, Any]) -> datetime:
+    """
+    Get the primary display datetime of a task.
+
+    This is completed_at for completed tasks and created_at otherwise. The
+    parsed value is cached on the task dictionary under "_display_dt" so
+    sorting and display only parse each timestamp once.
+
+    Args:
+        task: Task dictionary from database
+
+    Returns:
+        Parsed datetime
+    """
+    display_dt = task.get("_display_dt")
+    if display_dt is None:
+        display_dt = parse_timestamp(task["completed_at"] or task["created_at"])
+        task["_display_dt"] = display_dt
+    return display_dt
+
+
 def format_task_for_display(task: Dict[str, Any], config=None, verbose: bool = False) -> str:
     """
     Format a task for display in syslog-like Markdown format.
@@ -278,32 +337,22 @@ def format_task_for_display(task: Dict[str, Any], config=None, verbose: bool = F
     else:
         status = "[ ]"
 
-    # Format primary timestamp
-    if task["completed_at"]:
-        # Use completed_at for completed tasks (including dismissed)
-        primary_timestamp = datetime.fromisoformat(task["completed_at"].replace("Z", "+00:00"))
-        if config and hasattr(config, "get_task_date_format"):
-            primary_time_str = format_date_by_format(primary_timestamp, config.get_task_date_format())
-        else:
-            primary_time_str = primary_timestamp.strftime("%Y-%m-%d %H:%M")
+    # Format primary timestamp: completed_at for completed tasks (including dismissed), else created_at
+    if config and hasattr(config, "get_task_date_format"):
+        primary_time_str = format_date_by_format(get_task_display_datetime(task), config.get_task_date_format())
     else:
-        # Use created_at for open tasks
-        primary_timestamp = datetime.fromisoformat(task["created_at"].replace("Z", "+00:00"))
-        if config and hasattr(config, "get_task_date_format"):
-            primary_time_str = format_date_by_format(primary_timestamp, config.get_task_date_format())
-        else:
-            primary_time_str = primary_timestamp.strftime("%Y-%m-%d %H:%M")
+        primary_time_str = _ts_prefix(task["completed_at"] or task["created_at"])
 
     # Check if task was modified after creation/completion (only show with verbose mode)
     modification_label = None
 
     if verbose and task.get("modified_at"):
-        modified_timestamp = datetime.fromisoformat(task["modified_at"].replace("Z", "+00:00"))
+        primary_timestamp = get_task_display_datetime(task)
+        modified_timestamp = parse_timestamp(task["modified_at"])
 
         if task["completed_at"]:
             # For completed tasks (including dismissed), check if modified after completion
-            completed_timestamp = datetime.fromisoformat(task["completed_at"].replace("Z", "+00:00"))
-            if modified_timestamp > completed_timestamp:
+            if modified_timestamp > primary_timestamp:
                 if config and hasattr(config, "get_task_date_format"):
                     mod_time_str = format_date_by_format(modified_timestamp, config.get_task_date_format())
                 else:
@@ -325,8 +374,7 @@ def format_task_for_display(task: Dict[str, Any], config=None, verbose: bool = F
     if task["labels"]:
         visible_labels = filter_hidden_labels(task["labels"], verbose)
         if visible_labels:
-            hashtags = [f"#{label}" for label in visible_labels]
-            labels_display = f"  {','.join(hashtags)}"
+            labels_display = "  " + ",".join(f"#{label}" for label in visible_labels)
 
     # Add modification label if present (only in verbose mode)
     if verbose and modification_label:
@@ -411,34 +459,50 @@ def filter_tasks_by_date_range(tasks: List[Dict[str, Any]], days: int = 1, weekd
         # Filter tasks based on criteria
         filtered_tasks = []
 
-        for task in tasks:
-            task_date = None
+        # ISO dates compare correctly as strings, and every stored timestamp starts with one
+        lookback_str = lookback_date.isoformat()
+        today_str = today.isoformat()
 
-            # Determine the relevant date for filtering
-            if task["completed_at"]:
-                # For completed tasks (including dismissed), use completion date
-                completed_dt = datetime.fromisoformat(task["completed_at"].replace("Z", "+00:00"))
-                task_date = completed_dt.date()
-            else:
-                # For open tasks, use creation date
-                created_dt = datetime.fromisoformat(task["created_at"].replace("Z", "+00:00"))
-                task_date = created_dt.date()
+        for task in tasks:
+            # Completed tasks (including dismissed) use their completion date, open tasks their creation date
+            task_date = (task["completed_at"] or task["created_at"])[:10]
 
             # Include tasks from the lookback period
-            if lookback_date <= task_date <= today:
+            if lookback_str <= task_date <= today_str:
                 filtered_tasks.append(task)
 
-    # Sort by priority first, then by created_at descending (most recent first)
-    # Important tasks (#i) come first, then today tasks (#t), then regular tasks by recency
-    filtered_tasks.sort(
+    return sort_tasks_by_priority(filtered_tasks)
+
+
+def sort_tasks_by_priority(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Sort tasks in place by display priority.
+
+    Important tasks (#i) come first, then today tasks (#t), then regular
+    tasks by recency (created_at descending).
+
+    Args:
+        tasks: List of task dictionaries
+
+    Returns:
+        The same list, sorted
+    """
+
+    def created_timestamp(task: Dict[str, Any]) -> float:
+        # Open tasks display their creation time, so share the cached parse with display
+        if not task["completed_at"]:
+            return get_task_display_datetime(task).timestamp()
+        return parse_timestamp(task["created_at"]).timestamp()
+
+    tasks.sort(
         key=lambda x: (
             not is_important_task(x),  # Important tasks first
             not is_today_task(x),  # Then today tasks
-            -datetime.fromisoformat(x["created_at"].replace("Z", "+00:00")).timestamp(),  # Then by creation date descending
+            -created_timestamp(x),  # Then by creation date descending
         )
     )
 
-    return filtered_tasks
+    return tasks
 
 
 def get_editor() -> str:
@@ -448,15 +512,26 @@ def get_editor() -> str:
     Returns:
         Editor command string
     """
-    import subprocess
-
     editor = os.environ.get("EDITOR")
     if editor:
         return editor
 
+    return _find_fallback_editor()
+
+
+@functools.lru_cache(maxsize=1)
+def _find_fallback_editor() -> str:
+    """
+    Find the first available fallback editor on PATH.
+
+    The PATH scan runs in-process and is cached for the life of the process.
+
+    Returns:
+        Editor command string
+    """
     # Fallback editors
     for fallback in ["nano", "vim", "code"]:
-        if subprocess.run(["which", fallback], capture_output=True).returncode == 0:
+        if shutil.which(fallback):
             return fallback
 
     # Final fallback
@@ -577,85 +652,95 @@ class DateParser:
             return False
 
 
-def evaluate_boolean_label_expression(task_labels: List[str], expression: str) -> bool:
+def parse_label_expression(expression: str) -> Tuple[bool, FrozenSet[str], FrozenSet[str]]:
     """
-    Evaluate a boolean label expression for a task.
-
-    Supports AND, OR, and NOT logic with JQL-inspired syntax.
+    Parse a boolean label expression once, for matching against many tasks.
 
     Args:
-        task_labels: List of labels for the task (normalized to lowercase)
-        expression: Boolean expression string (e.g., "work AND urgent", "family OR personal", "NOT urgent")
+        expression: Boolean expression string (see evaluate_boolean_label_expression)
 
     Returns:
-        True if the task matches the expression, False otherwise
-
-    Examples:
-        - "work" -> True if task has #work label
-        - "work AND urgent" -> True if task has both #work AND #urgent labels
-        - "work OR personal" -> True if task has either #work OR #personal label
-        - "NOT urgent" -> True if task does NOT have #urgent label
-        - "work AND NOT urgent" -> True if task has #work but NOT #urgent
-        - "family AND work AND NOT love" -> True if task has #family AND #work but NOT #love
+        Tuple of (match_any, labels, excluded_labels). With match_any False a task
+        must have every label and none of the excluded ones (AND); with match_any
+        True one present label or one missing excluded label is enough (OR).
     """
+    always = (False, frozenset(), frozenset())
+
     if not expression or not expression.strip():
-        return True
+        return always
 
     # Handle "NOT" alone (no space after, case insensitive) before conversion
     if expression.strip() in ["NOT", "not"]:
-        return True
+        return always
 
     expression = expression.strip().lower()
 
-    # Normalize task labels to lowercase for case-insensitive matching
-    normalized_task_labels = [label.lower() for label in task_labels]
-
-    # Normalize AND/OR operators to lowercase with spaces for consistent parsing
-    expression = expression.replace(" AND ", " and ").replace(" OR ", " or ")
-
-    # Check for operators after normalization
     has_and = " and " in expression
     has_or = " or " in expression
-    has_not = expression.startswith("not ")
 
-    # Handle simple single label (no operators)
-    if not has_and and not has_or and not has_not:
-        return expression in normalized_task_labels
-
-    # Handle NOT expressions (but only if they don't contain AND/OR)
-    if has_not and not has_and and not has_or:
-        label_to_exclude = expression[4:].strip()
-        if not label_to_exclude:  # "NOT" with no label
-            return True
-        return label_to_exclude not in normalized_task_labels
+    # A single label or NOT label is an AND of one part
+    if has_and:
+        parts = expression.split(" and ")
+    elif has_or:
+        parts = expression.split(" or ")
+    else:
+        parts = [expression]
 
-    # Helper function to evaluate a single part (label or NOT label)
-    def evaluate_part(part: str) -> bool:
+    labels = set()
+    excluded_labels = set()
+    for part in parts:
         part = part.strip()
         if part.startswith("not "):
             label_to_exclude = part[4:].strip()
-            if not label_to_exclude:  # "NOT" with no label
-                return True
-            return label_to_exclude not in normalized_task_labels
+            if not label_to_exclude:  # "NOT" with no label always matches
+                if has_or and not has_and:
+                    return always
+                continue
+            excluded_labels.add(label_to_exclude)
         else:
-            return part in normalized_task_labels
+            labels.add(part)
+
+    return has_or and not has_and, frozenset(labels), frozenset(excluded_labels)
 
-    # Handle AND expressions
-    if has_and:
-        parts = [part.strip() for part in expression.split(" and ")]
-        for part in parts:
-            part_result = evaluate_part(part)
-            if not part_result:
-                return False
-        return True
-
-    # Handle OR expressions
-    if has_or:
-        parts = [part.strip() for part in expression.split(" or ")]
-        for part in parts:
-            if evaluate_part(part):
-                return True
-        return False
 
-    # Fallback: simple label match
-    return expression in normalized_task_labels
+def match_label_expression(task_labels: AbstractSet[str], parsed: Tuple[bool, FrozenSet[str], FrozenSet[str]]) -> bool:
+    """
+    Check a task's labels against an expression from parse_label_expression.
+
+    Args:
+        task_labels: Set of labels for the task (normalized to lowercase)
+        parsed: Parsed expression
+
+    Returns:
+        True if the task matches the expression, False otherwise
+    """
+    match_any, labels, excluded_labels = parsed
+    if match_any:
+        return not labels.isdisjoint(task_labels) or not excluded_labels <= task_labels
+    return labels <= task_labels and excluded_labels.isdisjoint(task_labels)
+
+
+def evaluate_boolean_label_expression(task_labels: List[str], expression: str) -> bool:
+    """
+    Evaluate a boolean label expression for a task.
+
+    Supports AND, OR, and NOT logic with JQL-inspired syntax.
+
+    Args:
+        task_labels: List of labels for the task (normalized to lowercase)
+        expression: Boolean expression string (e.g., "work AND urgent", "family OR personal", "NOT urgent")
+
+    Returns:
+        True if the task matches the expression, False otherwise
+
+    Examples:
+        - "work" -> True if task has #work label
+        - "work AND urgent" -> True if task has both #work AND #urgent labels
+        - "work OR personal" -> True if task has either #work OR #personal label
+        - "NOT urgent" -> True if task does NOT have #urgent label
+        - "work AND NOT urgent" -> True if task has #work but NOT #urgent
+        - "family AND work AND NOT love" -> True if task has #family AND #work but NOT #love
+    """
+    # Normalize task labels to lowercase for case-insensitive matching
+    normalized_task_labels = {label.lower() for label in task_labels}
+    return match_label_expression(normalized_task_labels, parse_label_expression(expression))
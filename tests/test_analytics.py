@@ -4,7 +4,7 @@ Analytics tests for FinCLI
 Tests for task analytics, digest generation, and reporting functionality.
 """
 
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 import os
 import tempfile
 
@@ -82,6 +82,107 @@ class TestAnalyticsManager:
         assert "urgent" in stats["by_label"]
         assert "recurring" in stats["by_label"]
 
+    def test_get_task_counts_rollup(self, analytics_manager):
+        """Test the period roll-up against tasks with known timestamps."""
+        today = datetime.now()
+        ten_days_ago = (today - timedelta(days=10)).strftime("%Y-%m-%d %H:%M:%S")
+        forty_days_ago = (today - timedelta(days=40)).strftime("%Y-%m-%d %H:%M:%S")
+        now_str = today.strftime("%Y-%m-%d %H:%M:%S")
+
+        with analytics_manager.db_manager.get_connection() as conn:
+            conn.execute("INSERT INTO tasks (content, created_at, labels) VALUES ('Old open', ?, 'work')", (ten_days_ago,))
+            conn.execute("INSERT INTO tasks (content, created_at, completed_at, labels) VALUES ('Done today', ?, ?, 'Work,home')", (ten_days_ago, now_str))
+            conn.execute("INSERT INTO tasks (content, created_at, completed_at, labels) VALUES ('Done routine', ?, ?, 'daily')", (now_str, now_str))
+            conn.execute("INSERT INTO tasks (content, created_at, due_date) VALUES ('Due', ?, '2000-01-01')", (now_str,))
+            conn.execute("INSERT INTO tasks (content, created_at, labels) VALUES ('Too old', ?, 'work')", (forty_days_ago,))
+            conn.commit()
+
+        stats = analytics_manager.get_task_counts(30)
+
+        assert stats["total_tasks"] == 4
+        assert stats["open_tasks"] == 2
+        assert stats["completed_tasks"] == 2
+        assert stats["today"] == {"created": 2, "completed": 2}
+        assert stats["this_week"] == {"created": 2, "completed": 2}
+        assert stats["this_month"] == {"created": 4, "completed": 2}
+        assert [task["id"] for task in stats["overdue"]["7_days"]] == [1]
+        assert [task["id"] for task in stats["due_dates"]["overdue"]] == [4]
+        assert stats["due_dates"]["total_with_due_dates"] == 1
+        assert [task["id"] for task in stats["recurring"]] == [3]
+        assert stats["by_label"] == {"work": 2, "daily": 1, "home": 1}
+
+    def test_get_task_counts_cached_until_data_changes(self, analytics_manager):
+        """Test that counts are reused until a write on any connection."""
+        first = analytics_manager.get_task_counts()
+        assert analytics_manager.get_task_counts() is first
+        assert analytics_manager.get_task_counts(7) is not first
+
+        analytics_manager.task_manager.add_task("Own connection")
+        second = analytics_manager.get_task_counts()
+        assert second is not first
+        assert second["total_tasks"] == 1
+
+        other_manager = DatabaseManager(str(analytics_manager.db_manager.db_path))
+        with other_manager.get_connection() as conn:
+            conn.execute("INSERT INTO tasks (content) VALUES ('Other connection')")
+            conn.commit()
+        assert analytics_manager.get_task_counts()["total_tasks"] == 2
+
+    def test_get_task_counts_overdue_and_recurring_buckets(self, analytics_manager):
+        """Test that overdue age buckets and recurring tasks are flagged in SQL."""
+        now = datetime.now()
+        created = lambda days: (now - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+        task_manager = analytics_manager.task_manager
+        names = {}
+        for content, days, labels in (("Five days", 5, []), ("Forty days", 40, ["Daily"]), ("Fresh", 0, []), ("Done", 41, ["weekly"])):
+            task_id = task_manager.add_task(content, labels=labels)
+            names[task_id] = content
+            with analytics_manager.db_manager.get_connection() as conn:
+                conn.execute("UPDATE tasks SET created_at = ? WHERE id = ?", (created(days), task_id))
+                conn.commit()
+        task_manager.update_task_completion(task_id, True)
+
+        stats = analytics_manager.get_task_counts(60)
+
+        # Analytics rows don't carry content, so map IDs back to names
+        contents = lambda bucket: [names[task["id"]] for task in bucket]
+        assert contents(stats["overdue"]["3_days"]) == ["Five days", "Forty days"]
+        assert contents(stats["overdue"]["7_days"]) == ["Forty days"]
+        assert contents(stats["overdue"]["30_days"]) == ["Forty days"]
+        assert contents(stats["recurring"]) == ["Forty days", "Done"]
+
+    def test_get_task_counts_by_label_ties_newest_first(self, analytics_manager):
+        """Test that labels with equal counts are ordered by their newest task, as they first appear."""
+        task_manager = analytics_manager.task_manager
+        now = datetime.now()
+        for hours_ago, labels in ((3, ["alpha", "common"]), (2, ["zeta"]), (1, ["mid", "common"])):
+            task_id = task_manager.add_task(f"Task {hours_ago}", labels=labels)
+            with analytics_manager.db_manager.get_connection() as conn:
+                conn.execute("UPDATE tasks SET created_at = ? WHERE id = ?", ((now - timedelta(hours=hours_ago)).strftime("%Y-%m-%d %H:%M:%S"), task_id))
+                conn.commit()
+
+        by_label = analytics_manager.get_task_counts()["by_label"]
+
+        assert list(by_label.items()) == [("common", 2), ("mid", 1), ("zeta", 1), ("alpha", 1)]
+
+    def test_get_task_counts_due_date_buckets(self, analytics_manager):
+        """Test that the due-date buckets only hold open tasks with well-formed due dates."""
+        today = date.today()
+        due = lambda days: (today + timedelta(days=days)).isoformat()
+        task_manager = analytics_manager.task_manager
+        names = {}
+        for content, due_date in (("Past due", due(-1)), ("Due today", due(0)), ("Due in a week", due(7)), ("Due later", due(8)), ("Malformed", "1/2"), ("Done past due", due(-3))):
+            names[task_manager.add_task(content, due_date=due_date)] = content
+        task_manager.update_task_completion(max(names), True)
+
+        due_dates = analytics_manager.get_task_counts()["due_dates"]
+
+        contents = lambda bucket: sorted(names[task["id"]] for task in bucket)
+        assert contents(due_dates["overdue"]) == ["Past due"]
+        assert contents(due_dates["due_soon"]) == ["Due in a week", "Due today"]
+        assert contents(due_dates["due_today"]) == ["Due today"]
+        assert due_dates["total_with_due_dates"] == 6
+
     def test_parse_date_valid(self, analytics_manager):
         """Test date parsing with valid dates."""
         test_date = "2025-01-15T10:30:00"
@@ -100,52 +201,12 @@ class TestAnalyticsManager:
 
     def test_get_recurring_tasks(self, populated_analytics):
         """Test recurring task detection."""
-        with populated_analytics.db_manager.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM tasks")
-            tasks = cursor.fetchall()
-
-        # Convert to the format expected by _get_recurring_tasks
-        task_dicts = []
-        for row in tasks:
-            task_dicts.append(
-                {
-                    "id": row[0],
-                    "content": row[1],
-                    "created_at": row[2],
-                    "modified_at": row[3],
-                    "completed_at": row[4],
-                    "labels": row[5].split(",") if row[5] else [],
-                    "source": row[6],
-                }
-            )
-
-        recurring = populated_analytics._get_recurring_tasks(task_dicts)
+        recurring = populated_analytics.get_task_counts()["recurring"]
         assert len(recurring) >= 1  # Should find at least one recurring task
 
     def test_get_tasks_by_label(self, populated_analytics):
         """Test label grouping functionality."""
-        with populated_analytics.db_manager.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM tasks")
-            tasks = cursor.fetchall()
-
-        # Convert to the format expected by _get_tasks_by_label
-        task_dicts = []
-        for row in tasks:
-            task_dicts.append(
-                {
-                    "id": row[0],
-                    "content": row[1],
-                    "created_at": row[2],
-                    "modified_at": row[3],
-                    "completed_at": row[4],
-                    "labels": row[5].split(",") if row[5] else [],
-                    "source": row[6],
-                }
-            )
-
-        by_label = populated_analytics._get_tasks_by_label(task_dicts)
+        by_label = populated_analytics.get_task_counts()["by_label"]
         assert "work" in by_label
         assert "urgent" in by_label
         assert "recurring" in by_label
@@ -238,6 +299,20 @@ class TestDigestGeneration:
         assert "## Summary" in digest
         assert "## Top Labels" in digest
 
+    def test_generate_digest_csv(self, analytics_with_data):
+        """Test CSV digests are a header line and one data row."""
+        import csv
+
+        for period, header_tail in (("daily", "Overdue Due Dates"), ("weekly", "Overdue 30 Days")):
+            digest = analytics_with_data.generate_digest(period=period, format="csv")
+            header, row = csv.reader(digest.split("\n"))
+
+            assert not digest.endswith("\n")
+            assert header[:3] == ["Date", "Period", "Total Tasks"]
+            assert header_tail in header
+            assert row[1] == period.capitalize()
+            assert row[2] == "3"
+
     def test_generate_digest_invalid_period(self, analytics_with_data):
         """Test digest generation with invalid period."""
         with pytest.raises(ValueError, match="Unknown period"):
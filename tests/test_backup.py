@@ -92,3 +92,126 @@ class TestDatabaseBackup:
         assert len(backup_ids) == 3
         assert max(backup_ids) == 5  # Latest backup ID
         assert min(backup_ids) == 3  # Oldest remaining backup ID
+
+    def test_backup_includes_wal_and_is_single_file(self, temp_db_path):
+        """Test that backups see uncheckpointed WAL data and don't leave WAL files behind."""
+        db_manager = DatabaseManager(temp_db_path)
+        task_manager = TaskManager(db_manager)
+        backup_manager = DatabaseBackup(temp_db_path)
+
+        task_manager.add_task("In the WAL")
+        assert os.path.exists(f"{temp_db_path}-wal")
+
+        backup_id = backup_manager.create_backup("WAL backup")
+        backup_path = backup_manager._get_backup_path(backup_id)
+
+        assert backup_manager._get_task_count(str(backup_path)) == 1
+        assert not os.path.exists(f"{backup_path}-wal")
+        assert not os.path.exists(f"{backup_path}-shm")
+
+    def test_backup_ids_cached_until_directory_changes(self, temp_db_path):
+        """Test that backup IDs are reused across calls but see other processes' backups."""
+        DatabaseManager(temp_db_path)
+        backup_manager = DatabaseBackup(temp_db_path, max_backups=2)
+        for i in range(3):
+            backup_manager.create_backup(f"Backup {i}")
+
+        assert backup_manager._list_backup_ids() == [2, 3]
+        assert backup_manager._list_backup_ids() is backup_manager._list_backup_ids()
+
+        # A backup made by another instance (e.g. another fin process)
+        other_id = DatabaseBackup(temp_db_path, max_backups=5).create_backup("Other")
+        assert other_id == 4
+        assert backup_manager._list_backup_ids() == [2, 3, 4]
+        assert backup_manager.create_backup("Next") == 5
+
+    def test_backup_ids_see_other_instance_between_own_backups(self, temp_db_path):
+        """Test that creating a backup doesn't hide one another instance made since the last listing."""
+        DatabaseManager(temp_db_path)
+        first = DatabaseBackup(temp_db_path)
+        second = DatabaseBackup(temp_db_path)
+
+        assert first.create_backup("First") == 1
+        assert first._list_backup_ids() == [1]
+        assert second.create_backup("Second") == 2
+        assert first.create_backup("Third") == 3
+
+        assert [backup["backup_id"] for backup in first.list_backups()] == [3, 2, 1]
+        assert first._list_backup_ids() == [1, 2, 3]
+
+    def test_backup_ids_never_reused_after_cleanup(self, temp_db_path):
+        """Test that the ID counter keeps issuing new IDs even when every backup is gone."""
+        DatabaseManager(temp_db_path)
+        backup_manager = DatabaseBackup(temp_db_path)
+        assert [backup_manager.create_backup() for _ in range(2)] == [1, 2]
+
+        for backup_id in (1, 2):
+            backup_manager._remove_backup(backup_id)
+
+        assert backup_manager.create_backup() == 3
+
+    def test_stale_id_counter_does_not_overwrite_backups(self, temp_db_path):
+        """Test that a counter behind the backups on disk is moved past them."""
+        DatabaseManager(temp_db_path)
+        backup_manager = DatabaseBackup(temp_db_path)
+        for i in range(1, 4):
+            backup_manager.create_backup(f"Backup {i}")
+
+        # e.g. a backup directory restored along with an older counter
+        (backup_manager.backup_dir / ".next_id").write_text("2")
+
+        assert backup_manager.create_backup("New") == 4
+        assert backup_manager._load_metadata(2)["description"] == "Backup 2"
+        assert [backup["backup_id"] for backup in backup_manager.list_backups()] == [4, 3, 2, 1]
+
+    def test_metadata_read_once_per_backup(self, temp_db_path, monkeypatch):
+        """Test that list_backups reuses metadata already written or read."""
+        DatabaseManager(temp_db_path)
+        DatabaseBackup(temp_db_path).create_backup("Written elsewhere")
+        backup_manager = DatabaseBackup(temp_db_path)
+        backup_manager.create_backup("Written here")
+
+        reads = []
+        read_bytes = Path.read_bytes
+        monkeypatch.setattr(Path, "read_bytes", lambda path: reads.append(path.name) or read_bytes(path))
+
+        for _ in range(2):
+            assert [b["description"] for b in backup_manager.list_backups()] == ["Written here", "Written elsewhere"]
+        assert reads == ["backup_001.meta"]
+
+    def test_metadata_written_atomically(self, temp_db_path):
+        """Test that metadata is renamed into place, leaving no temporary file."""
+        DatabaseManager(temp_db_path)
+        backup_manager = DatabaseBackup(temp_db_path)
+        backup_id = backup_manager.create_backup("Atomic", task_changes={"completed_count": 2})
+
+        assert not list(backup_manager.backup_dir.glob("*.tmp"))
+        assert DatabaseBackup(temp_db_path)._load_metadata(backup_id)["change_summary"]["completed"] == 2
+
+    def test_missing_backup_rollback_and_preview(self, temp_db_path):
+        """Test that a missing backup is reported without side effects."""
+        DatabaseManager(temp_db_path)
+        backup_manager = DatabaseBackup(temp_db_path)
+
+        assert backup_manager.rollback(42) is False
+        assert backup_manager.get_restore_preview(42) is None
+        assert backup_manager._list_backup_ids() == []
+        assert not backup_manager._get_backup_path(42).exists()
+
+    def test_live_database_read_through_one_connection(self, temp_db_path):
+        """Test that reads of the live database share a connection that sees rollbacks."""
+        task_manager = TaskManager(DatabaseManager(temp_db_path))
+        backup_manager = DatabaseBackup(temp_db_path)
+
+        task_manager.add_task("First")
+        backup_id = backup_manager.create_backup("One task")
+        source_conn = backup_manager._source_conn
+        task_manager.add_task("Second")
+
+        assert backup_manager._get_task_count(temp_db_path) == 2
+        assert backup_manager.rollback(backup_id)
+        assert backup_manager._get_task_summary(temp_db_path)["total"] == 1
+        assert backup_manager._source_conn is source_conn
+
+        backup_manager.close()
+        assert backup_manager._source_conn is None
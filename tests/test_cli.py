@@ -2,10 +2,14 @@
 CLI tests for Fin task tracking system
 """
 
+import os
+import sqlite3
 import subprocess
 import sys
 
-from fincli.cli import cli
+import pytest
+
+from fincli.cli import _get_config, _get_db_manager, cli
 
 
 class TestCLI:
@@ -34,6 +38,36 @@ class TestCLI:
         assert result.exit_code == 0
         assert '✅ Task added: "Test task content"' in result.output
 
+    def test_db_manager_reused_per_database(self, temp_db_path, monkeypatch):
+        """Test that commands share one DatabaseManager per database path."""
+        monkeypatch.setenv("FIN_DB_PATH", temp_db_path)
+
+        first = _get_db_manager()
+        assert _get_db_manager() is first
+
+        # A removed database file gets a fresh manager (and schema)
+        os.unlink(temp_db_path)
+        assert _get_db_manager() is not first
+
+        # The replaced manager's connection is closed rather than left to the garbage collector
+        with pytest.raises(sqlite3.ProgrammingError):
+            first._conn.execute("SELECT 1")
+
+    def test_config_reused_until_file_changes(self, tmp_path, monkeypatch):
+        """Test that commands share one Config until its file is changed on disk."""
+        monkeypatch.setenv("FIN_CONFIG_DIR", str(tmp_path))
+
+        first = _get_config()
+        assert _get_config() is first
+
+        # An edit made outside this process is picked up
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"default_days": 5}')
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert _get_config() is not first
+        assert _get_config().get("default_days") == 5
+
     def test_cli_add_task_with_labels(self, cli_runner, temp_db_path, monkeypatch):
         """Test adding a task with labels via CLI."""
         # Mock the database path
@@ -148,6 +182,19 @@ class TestCLI:
         assert result.exit_code == 0
         assert '✅ Task added: "Task with mixed case labels" [test, urgent, work]' in result.output
 
+    def test_cli_labels_display_matches_stored(self, cli_runner, temp_db_path, monkeypatch):
+        """Test that add-task shows labels split and deduplicated as they are stored."""
+        # Mock the database path
+        monkeypatch.setattr(
+            "fincli.db.DatabaseManager.__init__",
+            lambda self, db_path=None: self._init_mock_db(temp_db_path),
+        )
+
+        result = cli_runner.invoke(cli, ["add-task", "Grouped labels", "--label", "Work, urgent", "--label", "work"])
+
+        assert result.exit_code == 0
+        assert '✅ Task added: "Grouped labels" [urgent, work]' in result.output
+
     def test_cli_empty_labels(self, cli_runner, temp_db_path, monkeypatch):
         """Test CLI with empty labels."""
         # Mock the database path
@@ -518,6 +565,123 @@ class TestCLI:
         finally:
             sys.argv = original_argv
 
+    def test_close_toggle_dismiss_batch(self, cli_runner, temp_db_path, monkeypatch):
+        """Test that ID commands report each argument in order and apply changes together."""
+        monkeypatch.setenv("FIN_DB_PATH", temp_db_path)
+        from fincli.tasks import TaskManager
+
+        task_manager = TaskManager(_get_db_manager())
+        first, second = task_manager.add_task("First"), task_manager.add_task("Second")
+
+        result = cli_runner.invoke(cli, ["close", str(first), "x", "999", str(first)])
+        assert result.output.splitlines() == [
+            f"✅ Marked task {first} as completed: First",
+            "❌ Error: 'x' is not a valid task ID (must be a number)",
+            "❌ Task 999 not found",
+            f"⚠️  Task {first} is already completed",
+            "🎉 Completed 1 task(s)",
+        ]
+
+        # Repeated IDs keep toggling from the state the command left them in
+        result = cli_runner.invoke(cli, ["toggle", str(first), str(second), str(second)])
+        assert "🎉 Toggled 3 task(s)" in result.output
+        assert task_manager.get_task(first)["completed_at"] is None
+        assert task_manager.get_task(second)["completed_at"] is None
+
+        result = cli_runner.invoke(cli, ["dismiss", str(second)])
+        assert f"🚫 Dismissed task {second}: Second" in result.output
+        dismissed = task_manager.get_task(second)
+        assert dismissed["completed_at"] is not None
+        assert dismissed["labels"] == ["dismissed"]
+
+    def test_dismiss_commits_once(self, cli_runner, temp_db_path, monkeypatch):
+        """Test that dismissing several tasks completes and labels them in one transaction."""
+        monkeypatch.setenv("FIN_DB_PATH", temp_db_path)
+        from fincli.tasks import TaskManager
+
+        db_manager = _get_db_manager()
+        task_manager = TaskManager(db_manager)
+        task_ids = [task_manager.add_task(f"Task {i}", labels=["work"]) for i in range(3)]
+
+        statements = []
+        db_manager._conn.set_trace_callback(statements.append)
+        try:
+            result = cli_runner.invoke(cli, ["dismiss", *map(str, task_ids)])
+        finally:
+            db_manager._conn.set_trace_callback(None)
+
+        assert "🎉 Dismissed 3 task(s)" in result.output
+        assert sum(statement.strip().upper() == "COMMIT" for statement in statements) == 1
+        for task in task_manager.get_tasks_by_ids(task_ids).values():
+            assert task["completed_at"] is not None
+            assert task["labels"] == ["dismissed", "work"]
+
+    def test_export_streams_all_formats(self, cli_runner, temp_db_path, monkeypatch, tmp_path):
+        """Test that export writes every task in each format."""
+        import csv
+        import json
+
+        monkeypatch.setenv("FIN_DB_PATH", temp_db_path)
+        from fincli.tasks import TaskManager
+
+        result = cli_runner.invoke(cli, ["export", str(tmp_path / "empty.json"), "-f", "json"])
+        assert "📝 No tasks found to export." in result.output
+        assert not (tmp_path / "empty.json").exists()
+
+        task_manager = TaskManager(_get_db_manager())
+        task_manager.add_task("Line\nbreak café", labels=["work"])
+        task_manager.update_task_completion(task_manager.add_task("Done"), True)
+
+        json_path = tmp_path / "tasks.json"
+        result = cli_runner.invoke(cli, ["export", str(json_path), "-f", "json"])
+        assert f"✅ Exported 2 tasks to {json_path}" in result.output
+        text = json_path.read_text(encoding="utf-8")
+        data = json.loads(text)
+        assert text == json.dumps(data, indent=2, ensure_ascii=False)
+        assert sorted((t["content"], t["status"], t["labels"]) for t in data) == [("Done", "completed", []), ("Line\nbreak café", "open", ["work"])]
+
+        csv_path = tmp_path / "tasks.csv"
+        cli_runner.invoke(cli, ["export", str(csv_path)])
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert sorted((row["Content"], row["Status"], row["Labels"]) for row in rows) == [("Done", "completed", ""), ("Line\nbreak café", "open", "work")]
+
+        txt_path = tmp_path / "tasks.txt"
+        cli_runner.invoke(cli, ["export", str(txt_path), "-f", "txt"])
+        assert txt_path.read_text(encoding="utf-8").startswith("# FinCLI Task Export - 2 tasks\n")
+
+    def test_direct_task_options(self, temp_db_path, monkeypatch, capsys):
+        """Test that direct tasks take --label/-l and --source and skip other options."""
+        monkeypatch.setenv("FIN_DB_PATH", temp_db_path)
+
+        from fincli.cli import handle_direct_task
+        from fincli.tasks import TaskManager
+
+        handle_direct_task(["Call", "-l", "phone", "--source", "slack", "--quiet", "back", "--label", "Work"])
+
+        assert '✅ Task added: "Call back" [phone, work]' in capsys.readouterr().out
+        task = TaskManager(_get_db_manager()).list_tasks()[0]
+        assert task["source"] == "slack"
+
+    def test_cli_hashtags_and_task_references_single_pass(self, temp_db_path, monkeypatch, capsys):
+        """Test that labels and special features are stripped while task references survive."""
+        monkeypatch.setattr(
+            "fincli.db.DatabaseManager.__init__",
+            lambda self, db_path=None: self._init_mock_db(temp_db_path),
+        )
+        monkeypatch.setenv("FIN_DB_PATH", temp_db_path)
+
+        from fincli.cli import handle_direct_task
+
+        handle_direct_task(["Review #work#task12 and #ref:task3", "#recur:weekly"])
+
+        output = capsys.readouterr().out
+        assert '✅ Task added: "Review #task12 and #ref:task3" [recur:weekly, work]' in output
+
+        # Non-ASCII hashtags are still taken whole as labels
+        handle_direct_task(["Order croissants #café"])
+        assert '✅ Task added: "Order croissants" [café]' in capsys.readouterr().out
+
     def test_cli_complex_label_combinations_and(self, temp_db_path, monkeypatch):
         """Test AND logic in complex label combinations."""
         # Mock the database path and set environment variable
@@ -2,6 +2,7 @@
 Database manager tests
 """
 
+from datetime import date
 from pathlib import Path
 import sqlite3
 
@@ -81,6 +82,56 @@ class TestDatabaseManager:
             id_column = next(col for col in columns if col[1] == "id")
             assert id_column[5] == 1  # Primary key flag
 
+    def test_schema_version_recorded(self, db_manager):
+        """Test that schema setup records its version and is skipped once current."""
+        with sqlite3.connect(db_manager.db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == DatabaseManager.SCHEMA_VERSION
+
+            # A current database is not re-checked, so a dropped index stays dropped
+            conn.execute("DROP INDEX idx_tasks_created_at")
+            conn.commit()
+
+        DatabaseManager(str(db_manager.db_path))
+        with sqlite3.connect(db_manager.db_path) as conn:
+            indexes = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+        assert "idx_tasks_created_at" not in indexes
+
+    def test_display_at_column_added_to_existing_database(self, temp_db_path):
+        """Test that older databases gain the display_at generated column and its index."""
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, content TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, completed_at TIMESTAMP NULL, labels TEXT, source TEXT DEFAULT 'cli')")
+            conn.execute("INSERT INTO tasks (content, created_at) VALUES ('Open', '2025-01-01 09:00:00')")
+            conn.execute("INSERT INTO tasks (content, created_at, completed_at) VALUES ('Done', '2025-01-01 09:00:00', '2025-01-02 10:00:00')")
+            conn.execute("PRAGMA user_version = 2")
+            conn.commit()
+
+        DatabaseManager(temp_db_path)
+        with sqlite3.connect(temp_db_path) as conn:
+            rows = conn.execute("SELECT content, display_at FROM tasks ORDER BY id").fetchall()
+            indexes = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+        assert rows == [("Open", "2025-01-01 09:00:00"), ("Done", "2025-01-02 10:00:00")]
+        assert "idx_tasks_display_at" in indexes
+
+    def test_connection_reused_and_uncommitted_work_rolled_back(self, db_manager):
+        """Test that get_connection hands out one connection and discards uncommitted writes."""
+        with db_manager.get_connection() as conn:
+            conn.execute("INSERT INTO tasks (content) VALUES ('Never committed')")
+            first_conn = conn
+
+        with db_manager.get_connection() as conn:
+            assert conn is first_conn
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 0
+
+    def test_init_mock_db_closes_previous_connection(self, db_manager, tmp_path):
+        """Test that re-initializing a manager closes the connection it replaces."""
+        old_conn = db_manager._conn
+        db_manager._init_mock_db(tmp_path / "other.db")
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            old_conn.execute("SELECT 1")
+        assert db_manager._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 0
+
     def test_add_task_basic(self, db_manager):
         """Test adding a basic task without labels."""
         from fincli.tasks import TaskManager
@@ -124,6 +175,27 @@ class TestDatabaseManager:
         task = task_manager.get_task(task_id)
         assert set(task["labels"]) == {"work", "urgent", "test"}
 
+    def test_add_tasks_batch(self, db_manager):
+        """Test adding several tasks in one call returns their IDs in order."""
+        task_manager = TaskManager(db_manager)
+        first_id = task_manager.add_task("Existing task")
+
+        task_ids = task_manager.add_tasks(
+            [
+                {"content": "Batch 1", "labels": ["Work, urgent"]},
+                {"content": "Batch 2", "source": "import", "context": "home"},
+            ]
+        )
+
+        assert task_ids == [first_id + 1, first_id + 2]
+        first, second = (task_manager.get_task(task_id) for task_id in task_ids)
+        assert first["content"] == "Batch 1"
+        assert first["labels"] == ["urgent", "work"]
+        assert first["context"] == "default"
+        assert second["source"] == "import"
+        assert second["context"] == "home"
+        assert task_manager.add_tasks([]) == []
+
     def test_add_task_empty_labels(self, db_manager):
         """Test adding task with empty labels."""
         from fincli.tasks import TaskManager
@@ -203,6 +275,110 @@ class TestDatabaseManager:
         completed_task = next(task for task in tasks if task["id"] == 1)
         assert completed_task["completed_at"] is not None
 
+    def test_list_tasks_date_window(self, db_manager):
+        """Test that since/until filter on completion date, else creation date."""
+        with sqlite3.connect(db_manager.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO tasks (content, created_at) VALUES ('Old open', '2025-01-01 09:00:00')")
+            cursor.execute("INSERT INTO tasks (content, created_at) VALUES ('New open', '2025-01-03 23:59:59')")
+            cursor.execute("INSERT INTO tasks (content, created_at, completed_at) VALUES ('Old done late', '2024-12-01 09:00:00', '2025-01-02 10:00:00')")
+            cursor.execute("INSERT INTO tasks (content, created_at, completed_at) VALUES ('New done early', '2025-01-02 09:00:00', '2024-12-31 10:00:00')")
+            conn.commit()
+
+        task_manager = TaskManager(db_manager)
+        tasks = task_manager.list_tasks(include_completed=True, since=date(2025, 1, 2), until=date(2025, 1, 3))
+        assert sorted(task["content"] for task in tasks) == ["New open", "Old done late"]
+
+        tasks = task_manager.list_tasks(include_completed=False, since=date(2025, 1, 1), until=date(2025, 1, 1))
+        assert [task["content"] for task in tasks] == ["Old open"]
+
+    def test_list_tasks_label_filter(self, db_manager):
+        """Test that label filtering matches whole labels only, case-insensitively."""
+        task_manager = TaskManager(db_manager)
+        task_manager.add_task("Bug", labels=["bug", "work"])
+        task_manager.add_task("Bugfix", labels=["bugfix"])
+        task_manager.add_task("Wildcard", labels=["b_g"])
+
+        assert [t["content"] for t in task_manager.list_tasks(labels=["BUG"])] == ["Bug"]
+        assert [t["content"] for t in task_manager.list_tasks(labels=["b_g"])] == ["Wildcard"]
+        assert sorted(t["content"] for t in task_manager.list_tasks(labels=["bugfix", "work"])) == ["Bug", "Bugfix"]
+
+    def test_list_tasks_label_filter_agrees_with_label_manager(self, db_manager):
+        """Test that list_tasks and LabelManager find a label's tasks through the same table."""
+        from fincli.labels import LabelManager
+
+        task_manager = TaskManager(db_manager)
+        task_id = task_manager.add_task("Tagged", labels=["work", "home"])
+        task_manager.update_task_labels(task_id, ["home"])
+
+        assert task_manager.list_tasks(labels=["work"]) == []
+        assert list(LabelManager(db_manager).iter_tasks_by_label("work")) == []
+        assert [t["id"] for t in task_manager.list_tasks(labels=["Home"])] == [task_id]
+
+    def test_list_tasks_completed_only_and_limit(self, db_manager):
+        """Test that completion status and row limits are applied by the query."""
+        task_manager = TaskManager(db_manager)
+        with sqlite3.connect(db_manager.db_path) as conn:
+            conn.execute("INSERT INTO tasks (content, created_at) VALUES ('Open', '2025-01-01 09:00:00')")
+            conn.execute("INSERT INTO tasks (content, created_at, completed_at) VALUES ('Done early', '2025-01-02 09:00:00', '2025-01-03 09:00:00')")
+            conn.execute("INSERT INTO tasks (content, created_at, completed_at) VALUES ('Done late', '2025-01-04 09:00:00', '2025-01-05 09:00:00')")
+            conn.commit()
+
+        tasks = task_manager.list_tasks(completed_only=True)
+        assert [task["content"] for task in tasks] == ["Done late", "Done early"]
+
+        tasks = task_manager.list_tasks(include_completed=True, limit=2)
+        assert [task["content"] for task in tasks] == ["Done late", "Done early"]
+
+    def test_iter_tasks_streams_list_tasks_results(self, populated_db):
+        """Test that iter_tasks is lazy and yields what list_tasks returns."""
+        task_manager = TaskManager(populated_db)
+        tasks = task_manager.iter_tasks(include_completed=True)
+
+        assert not isinstance(tasks, list)
+        assert list(tasks) == task_manager.list_tasks(include_completed=True)
+
+    def test_get_tasks_by_ids_across_batches(self, db_manager, monkeypatch):
+        """Test that batched, padded ID lookups return each existing task once."""
+        task_manager = TaskManager(db_manager)
+        task_ids = [task_manager.add_task(f"Task {i}") for i in range(7)]
+        monkeypatch.setattr(TaskManager, "ID_BATCH_SIZE", 4)
+
+        tasks_by_id = task_manager.get_tasks_by_ids(task_ids + [999, task_ids[0]])
+
+        assert sorted(tasks_by_id) == task_ids
+        assert tasks_by_id[task_ids[-1]]["content"] == "Task 6"
+
+    def test_list_tasks_since_max_id(self, db_manager):
+        """Test that tasks added after a recorded maximum ID are listed newest first."""
+        task_manager = TaskManager(db_manager)
+        assert task_manager.get_max_task_id() == 0
+
+        task_manager.add_task("Before")
+        max_id = task_manager.get_max_task_id()
+        with sqlite3.connect(db_manager.db_path) as conn:
+            conn.execute("INSERT INTO tasks (content, created_at) VALUES ('Added first', '2025-01-01 09:00:00')")
+            conn.execute("INSERT INTO tasks (content, created_at) VALUES ('Added second', '2025-01-02 09:00:00')")
+            conn.commit()
+
+        assert [t["content"] for t in task_manager.list_tasks_since_max_id(max_id)] == ["Added second", "Added first"]
+        assert [t["content"] for t in task_manager.list_tasks_since_max_id(max_id, limit=1)] == ["Added second"]
+
+    def test_bulk_update_completion(self, db_manager):
+        """Test batched completion updates only count real changes."""
+        task_manager = TaskManager(db_manager)
+        first_id = task_manager.add_task("First")
+        second_id = task_manager.add_task("Second")
+        task_manager.update_task_completion(second_id, True)
+
+        changed = task_manager.bulk_update_completion([(first_id, True), (second_id, True)])
+        assert changed == 1
+        assert task_manager.get_task(first_id)["completed_at"] is not None
+
+        changed = task_manager.bulk_update_completion([(first_id, False), (second_id, False)])
+        assert changed == 2
+        assert all(task["completed_at"] is None for task in task_manager.list_tasks(include_completed=True))
+
     def test_database_persistence(self, temp_db_path):
         """Test that database persists data between manager instances."""
         # Create first manager and add task
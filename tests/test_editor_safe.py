@@ -6,6 +6,7 @@ These tests ensure the editor logic works correctly without opening actual edito
 from datetime import date, datetime, timedelta
 import os
 import tempfile
+from unittest.mock import patch
 
 import pytest
 
@@ -423,6 +424,86 @@ class TestEditorSafe:
         updated_task = task_manager.get_task(task_id)
         assert updated_task["content"] == "Original task"
 
+    def test_parse_edited_content_reword_and_complete_without_refetch(self, temp_db_path):
+        """Test that applying edits reuses the prefetched tasks instead of per-line lookups."""
+        db_manager = DatabaseManager(temp_db_path)
+        task_manager = TaskManager(db_manager)
+        editor_manager = EditorManager(db_manager)
+
+        task_id = task_manager.add_task("Original task", labels=["test"])
+        tasks = editor_manager.get_tasks_for_editing(label="test")
+        original_content = editor_manager.create_edit_file_content(tasks)
+        modified_content = original_content.replace("[ ]", "[x]").replace("Original task", "Reworded task")
+
+        with patch.object(task_manager.__class__, "get_task", side_effect=AssertionError("unexpected lookup")):
+            results = editor_manager.parse_edited_content(modified_content, original_tasks=tasks)
+
+        completed_count, reopened_count, new_tasks_count, content_modified_count, deleted_count, dismissed_count = results
+        assert completed_count == 1
+        assert content_modified_count == 1
+
+        updated_task = task_manager.get_task(task_id)
+        assert updated_task["content"] == "Reworded task"
+        assert updated_task["completed_at"] is not None
+
+    def test_parse_edited_content_from_file_lines(self, temp_db_path):
+        """Test that edited content can be streamed from an open file."""
+        db_manager = DatabaseManager(temp_db_path)
+        task_manager = TaskManager(db_manager)
+        editor_manager = EditorManager(db_manager)
+
+        task_id = task_manager.add_task("Streamed task", labels=["test"])
+        tasks = editor_manager.get_tasks_for_editing(label="test")
+        modified_content = editor_manager.create_edit_file_content(tasks).replace("[ ]", "[x]") + "\n[ ] Added from file\n"
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as temp_file:
+            temp_file.write(modified_content)
+        try:
+            with open(temp_file.name, "r") as f:
+                results = editor_manager.parse_edited_content(f, {task_id}, tasks)
+        finally:
+            os.unlink(temp_file.name)
+
+        completed_count, reopened_count, new_tasks_count, content_modified_count, deleted_count, dismissed_count = results
+        assert completed_count == 1
+        assert new_tasks_count == 1
+        assert content_modified_count == 0
+        assert deleted_count == 0
+
+    def test_parse_edited_content_applied_in_chunks(self, temp_db_path, monkeypatch):
+        """Test that edited lines are read and applied a chunk at a time, not all up front."""
+        db_manager = DatabaseManager(temp_db_path)
+        task_manager = TaskManager(db_manager)
+        editor_manager = EditorManager(db_manager)
+
+        task_ids = [task_manager.add_task(f"Chunked {i}", labels=["chunk"]) for i in range(5)]
+        tasks = editor_manager.get_tasks_for_editing(label="chunk")
+        edited_lines = [line.replace("[ ]", "[x]") for line in editor_manager.create_edit_file_content(tasks).splitlines()]
+
+        monkeypatch.setattr(editor_manager.task_manager, "ID_BATCH_SIZE", 2)
+        lines_read = []
+        fetches = []
+        original_get_tasks_by_ids = editor_manager.task_manager.get_tasks_by_ids
+
+        def counting_get_tasks_by_ids(ids):
+            fetches.append(len(lines_read))
+            return original_get_tasks_by_ids(ids)
+
+        monkeypatch.setattr(editor_manager.task_manager, "get_tasks_by_ids", counting_get_tasks_by_ids)
+
+        def read_lines():
+            for line in edited_lines:
+                lines_read.append(line)
+                yield line
+
+        results = editor_manager.parse_edited_content(read_lines(), set(task_ids), tasks)
+
+        assert results[0] == 5  # all completed
+        assert results[4] == 0  # none deleted
+        assert len(fetches) == 3
+        assert fetches[0] < len(edited_lines)
+        assert all(task_manager.get_task(task_id)["completed_at"] is not None for task_id in task_ids)
+
     def test_parse_edited_content_multiple_changes(self, temp_db_path):
         """Test parsing edited content with multiple changes."""
         db_manager = DatabaseManager(temp_db_path)
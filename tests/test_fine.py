@@ -126,6 +126,18 @@ class TestFineCommand:
         found_id = editor_manager.find_matching_task(task_info)
         assert found_id == task_id
 
+    def test_find_matching_task_with_prefetched_index(self, db_manager):
+        """Test finding matching tasks against a prefetched task index."""
+        task_manager = TaskManager(db_manager)
+        task_id = task_manager.add_task("Test task", labels=["work"])
+
+        editor_manager = EditorManager(db_manager)
+        tasks_by_id = task_manager.get_tasks_by_ids([task_id, 999])
+
+        assert list(tasks_by_id) == [task_id]
+        assert editor_manager.find_matching_task({"task_id": task_id}, tasks_by_id) == task_id
+        assert editor_manager.find_matching_task({"task_id": 999}, tasks_by_id) is None
+
     def test_fine_command_with_tasks(self, temp_db_path, monkeypatch):
         """Test fine command with existing tasks."""
         # Set environment variable to use temp database
@@ -176,3 +176,56 @@ class TestFineCommandSimple:
         assert "📝 Found 1 tasks for editing:" in result.output
         assert "Work task" in result.output
         assert "Personal task" not in result.output
+
+    def test_open_editor_reloads_only_for_listed_changes(self, temp_db_path, monkeypatch):
+        """Test that the post-edit reload happens only when the summary lists tasks."""
+        monkeypatch.setattr(
+            "fincli.db.DatabaseManager.__init__",
+            lambda self, db_path=None: self._init_mock_db(temp_db_path),
+        )
+
+        db_manager = DatabaseManager(temp_db_path)
+        task_manager = TaskManager(db_manager)
+        task_manager.add_task("Work task", labels=["work"])
+
+        from click.testing import CliRunner
+
+        from fincli.cli import open_editor
+        from fincli.editor import EditorManager
+
+        calls = []
+        original_get_tasks = EditorManager.get_tasks_for_editing
+
+        def counting_get_tasks(self, *args, **kwargs):
+            calls.append(1)
+            return original_get_tasks(self, *args, **kwargs)
+
+        monkeypatch.setattr(EditorManager, "get_tasks_for_editing", counting_get_tasks)
+
+        def make_editor(complete):
+            def mock_subprocess_run(cmd, **kwargs):
+                if complete:
+                    with open(cmd[-1], "r") as f:
+                        lines = f.readlines()
+                    with open(cmd[-1], "w") as f:
+                        f.writelines(line if line.startswith("#") else line.replace("[ ]", "[x]", 1) for line in lines)
+
+                class MockResult:
+                    returncode = 0
+
+                return MockResult()
+
+            return mock_subprocess_run
+
+        runner = CliRunner()
+
+        monkeypatch.setattr("subprocess.run", make_editor(False))
+        result = runner.invoke(open_editor, [])
+        assert "📝 No changes were made to tasks." in result.output
+        assert len(calls) == 1
+
+        calls.clear()
+        monkeypatch.setattr("subprocess.run", make_editor(True))
+        result = runner.invoke(open_editor, [])
+        assert "✅ Completed (1):" in result.output
+        assert len(calls) == 2
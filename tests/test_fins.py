@@ -234,6 +234,67 @@ class TestFinsCommand:
         assert result.exit_code == 0
         assert "Test task" in result.output
 
+    def test_fins_status_filter(self, temp_db_path, monkeypatch, capsys):
+        """Test that fins shows completed tasks by default and honours --status."""
+        import pytest
+
+        from fincli.cli import fins_command
+
+        monkeypatch.setenv("FIN_DB_PATH", temp_db_path)
+        task_manager = TaskManager(DatabaseManager(temp_db_path))
+        task_manager.add_task("Still open")
+        task_manager.update_task_completion(task_manager.add_task("Finished"), True)
+
+        outputs = []
+        for argv in (["fins"], ["fins", "-s", "open"], ["fins", "-s", "o, d"], ["fins", "-s", "dismissed"]):
+            monkeypatch.setattr(sys, "argv", argv)
+            with pytest.raises(SystemExit):
+                fins_command()
+            outputs.append(capsys.readouterr().out)
+
+        assert "Finished" in outputs[0] and "Still open" not in outputs[0]
+        assert "Still open" in outputs[1] and "Finished" not in outputs[1]
+        assert "Still open" in outputs[2] and "Finished" in outputs[2]
+        assert "No tasks found" in outputs[3]
+
+    def test_fins_label_filter(self, temp_db_path, monkeypatch, capsys):
+        """Test that fins -l keeps tasks carrying any requested label, case-insensitively."""
+        import pytest
+
+        from fincli.cli import fins_command
+
+        monkeypatch.setenv("FIN_DB_PATH", temp_db_path)
+        task_manager = TaskManager(DatabaseManager(temp_db_path))
+        for content, labels in (("Work item", ["work"]), ("Home item", ["home"]), ("Plain item", None)):
+            task_manager.update_task_completion(task_manager.add_task(content, labels=labels), True)
+
+        monkeypatch.setattr(sys, "argv", ["fins", "-l", "WORK", "-l", "urgent"])
+        with pytest.raises(SystemExit):
+            fins_command()
+        output = capsys.readouterr().out
+
+        assert "Work item" in output
+        assert "Home item" not in output and "Plain item" not in output
+
+    def test_fins_max_limit(self, temp_db_path, monkeypatch, capsys):
+        """Test that fins --max-limit caps the output and warns when more tasks exist."""
+        import pytest
+
+        from fincli.cli import fins_command
+
+        monkeypatch.setenv("FIN_DB_PATH", temp_db_path)
+        task_manager = TaskManager(DatabaseManager(temp_db_path))
+        for i in range(3):
+            task_manager.update_task_completion(task_manager.add_task(f"Done {i}"), True)
+
+        monkeypatch.setattr(sys, "argv", ["fins", "-t", "--max-limit", "2", "-v"])
+        with pytest.raises(SystemExit):
+            fins_command()
+        output = capsys.readouterr().out
+
+        assert "Found more than 2 tasks, showing first 2" in output
+        assert sum(f"Done {i}" in output for i in range(3)) == 2
+
 
 class TestFinsIntegration:
     """Integration tests for fins command."""
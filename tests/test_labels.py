@@ -124,6 +124,74 @@ class TestGetAllLabels:
         labels = label_manager.get_all_labels()
         assert labels == []
 
+    def test_get_all_labels_tracks_updates_and_deletes(self, db_manager):
+        """Test that the labels table follows label edits and task deletion."""
+        from fincli.labels import LabelManager
+        from fincli.tasks import TaskManager
+
+        task_manager = TaskManager(db_manager)
+        label_manager = LabelManager(db_manager)
+
+        first_id = task_manager.add_task("Task 1", labels=["work", "urgent"])
+        second_id = task_manager.add_task("Task 2", labels=["work", 'quote"d'])
+
+        task_manager.update_task_labels(first_id, ["work", "later"])
+        assert label_manager.get_all_labels() == ["later", 'quote"d', "work"]
+
+        task_manager.delete_task(second_id)
+        assert label_manager.get_all_labels() == ["later", "work"]
+
+    def test_labels_with_control_characters_kept(self, db_manager):
+        """Test that a label with a control character doesn't drop the task's other labels."""
+        from fincli.labels import LabelManager
+        from fincli.tasks import TaskManager
+
+        task_manager = TaskManager(db_manager)
+        label_manager = LabelManager(db_manager)
+
+        task_id = task_manager.add_task("x", labels=["work", "a\tb"])
+        assert label_manager.get_all_labels() == ["a\tb", "work"]
+        assert [task["id"] for task in label_manager.iter_tasks_by_label("work")] == [task_id]
+        assert [task["id"] for task in task_manager.list_tasks(labels=["work"])] == [task_id]
+
+        task_manager.update_task_labels(task_id, ["home"])
+        assert label_manager.get_all_labels() == ["home"]
+
+    def test_get_all_labels_backfills_existing_database(self, temp_db_path):
+        """Test that labels from a database created before the labels table are picked up."""
+        import sqlite3
+
+        from fincli.labels import LabelManager
+
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, content TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, completed_at TIMESTAMP NULL, labels TEXT, source TEXT DEFAULT 'cli')")
+            conn.execute("INSERT INTO tasks (content, labels) VALUES ('Old task', 'home, work')")
+            conn.execute("INSERT INTO tasks (content, labels) VALUES ('Other task', 'work')")
+            conn.execute("INSERT INTO tasks (content, labels) VALUES ('Tabbed task', 'a\tb,work')")
+            conn.commit()
+
+        label_manager = LabelManager(DatabaseManager(temp_db_path))
+        assert label_manager.get_all_labels() == ["a\tb", "home", "work"]
+        assert len(list(label_manager.iter_tasks_by_label("work"))) == 3
+
+    def test_get_label_counts_by_status(self, db_manager):
+        """Test that label counts are split into open and completed tasks."""
+        from fincli.labels import LabelManager
+        from fincli.tasks import TaskManager
+
+        task_manager = TaskManager(db_manager)
+        label_manager = LabelManager(db_manager)
+
+        done_id = task_manager.add_task("Task 1", labels=["work", "urgent"])
+        task_manager.add_task("Task 2", labels=["work"])
+        task_manager.add_task("Task 3")
+        task_manager.update_task_completion(done_id, True)
+
+        assert label_manager.get_label_counts() == {
+            "urgent": {"open": 0, "completed": 1, "total": 1},
+            "work": {"open": 1, "completed": 1, "total": 2},
+        }
+
 
 class TestFilterTasksByLabel:
     """Test filtering tasks by label."""
@@ -244,6 +312,27 @@ class TestFilterTasksByLabel:
 
         assert len(tasks) == 0
 
+    def test_filter_by_label_follows_label_edits(self, db_manager):
+        """Test that label filtering sees label changes and deletions, and matches wildcards literally."""
+        from fincli.labels import LabelManager
+        from fincli.tasks import TaskManager
+
+        task_manager = TaskManager(db_manager)
+        label_manager = LabelManager(db_manager)
+
+        first_id = task_manager.add_task("Task 1", labels=["work", "work-urgent"])
+        second_id = task_manager.add_task("Task 2", labels=["home"])
+        task_manager.add_task("Task 3", labels=["wo_k"])
+
+        assert [task["id"] for task in label_manager.filter_tasks_by_label("work")] == [first_id]
+        assert [task["content"] for task in label_manager.filter_tasks_by_label("o_k")] == ["Task 3"]
+
+        task_manager.update_task_labels(second_id, ["homework"])
+        assert sorted(task["id"] for task in label_manager.filter_tasks_by_label("work")) == [first_id, second_id]
+
+        task_manager.delete_task(first_id)
+        assert [task["id"] for task in label_manager.filter_tasks_by_label("work")] == [second_id]
+
 
 class TestListLabelsCommand:
     """Test the list-labels command."""
@@ -1,6 +1,7 @@
 """Tests for the list and list-tasks commands to ensure consistency and proper default behavior."""
 
 from datetime import datetime, timedelta
+import os
 import sqlite3
 
 from click.testing import CliRunner
@@ -260,6 +261,11 @@ class TestListCommandsIntegration:
         assert "DatabaseManager using path:" in list_result.output
         assert "DatabaseManager using path:" in list_tasks_result.output
 
+        # The flag is passed along rather than left behind in the environment
+        assert "FIN_VERBOSE" not in os.environ
+        quiet_result = cli_runner.invoke(cli, ["list"], env={"FIN_DB_PATH": populated_db})
+        assert "DatabaseManager using path:" not in quiet_result.output
+
     def test_label_filtering_works_both_commands(self, cli_runner, populated_db):
         """Test that label filtering works with both commands."""
         list_result = cli_runner.invoke(cli, ["list", "--label", "work"], env={"FIN_DB_PATH": populated_db})
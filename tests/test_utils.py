@@ -9,13 +9,17 @@ from unittest.mock import patch
 import pytest
 
 from fincli.utils import (
+    _find_fallback_editor,
     evaluate_boolean_label_expression,
     filter_tasks_by_date_range,
     format_task_for_display,
     get_date_range,
     get_editor,
+    get_task_display_datetime,
     is_important_task,
     is_today_task,
+    match_label_expression,
+    parse_label_expression,
 )
 
 
@@ -57,6 +61,42 @@ class TestFormatTaskForDisplay:
 
         assert result == expected_output
 
+    def test_format_task_caches_display_datetime(self):
+        """Test that the parsed display timestamp is cached on the task."""
+        task = {
+            "id": 1,
+            "content": "Completed task",
+            "created_at": "2025-08-05 10:30:00",
+            "completed_at": "2025-08-05 11:45:00",
+            "labels": [],
+            "source": "cli",
+        }
+
+        assert get_task_display_datetime(task) == datetime(2025, 8, 5, 11, 45)
+        assert task["_display_dt"] == datetime(2025, 8, 5, 11, 45)
+
+        # A cached value is used as-is
+        task["_display_dt"] = datetime(2025, 8, 6, 8, 0)
+        assert get_task_display_datetime(task) == datetime(2025, 8, 6, 8, 0)
+
+    def test_format_task_timestamp_without_parsing(self):
+        """Test that SQLite-style timestamps are sliced and other ISO forms are parsed."""
+        task = {
+            "id": 1,
+            "content": "Open task",
+            "created_at": "2025-08-05 10:30:59.123",
+            "completed_at": None,
+            "labels": [],
+            "source": "cli",
+        }
+        assert format_task_for_display(task) == "1 [ ] 2025-08-05 10:30  Open task"
+
+        task["created_at"] = "2025-08-05T10:30:00Z"
+        assert format_task_for_display(task) == "1 [ ] 2025-08-05 10:30  Open task"
+
+        task["created_at"] = "2025-08-05"
+        assert format_task_for_display(task) == "1 [ ] 2025-08-05 00:00  Open task"
+
     def test_format_task_without_labels(self):
         """Test formatting a task without labels."""
         task = {
@@ -426,14 +466,22 @@ class TestGetEditor:
         assert editor == "custom-editor"
 
     @patch.dict(os.environ, {}, clear=True)
-    @patch("subprocess.run")
-    def test_get_editor_fallback(self, mock_run):
+    @patch("shutil.which")
+    def test_get_editor_fallback(self, mock_which):
         """Test editor fallback behavior."""
-        # Mock that nano is available
-        mock_run.return_value.returncode = 0
+        # Mock that only vim is available
+        mock_which.side_effect = lambda name: "/usr/bin/vim" if name == "vim" else None
+        _find_fallback_editor.cache_clear()
 
-        editor = get_editor()
-        assert editor == "nano"
+        try:
+            editor = get_editor()
+            assert editor == "vim"
+
+            # The PATH probe is cached
+            get_editor()
+            assert mock_which.call_count == 2
+        finally:
+            _find_fallback_editor.cache_clear()
 
 
 class TestBooleanLabelFiltering:
@@ -535,3 +583,15 @@ class TestBooleanLabelFiltering:
         assert evaluate_boolean_label_expression(task_labels, "work  OR  personal") is True
         assert evaluate_boolean_label_expression(task_labels, "  NOT  urgent") is False
         assert evaluate_boolean_label_expression(task_labels, "work  AND  NOT  urgent") is False
+
+    def test_parsed_expression_reused_across_tasks(self):
+        """Test that an expression parsed once matches label sets like evaluation does."""
+        parsed = parse_label_expression("Work AND NOT urgent")
+        assert parsed == (False, frozenset({"work"}), frozenset({"urgent"}))
+
+        assert match_label_expression({"work"}, parsed) is True
+        assert match_label_expression({"work", "urgent"}, parsed) is False
+
+        parsed = parse_label_expression("family OR NOT work")
+        assert match_label_expression({"work"}, parsed) is False
+        assert match_label_expression(set(), parsed) is True